@@ -1,29 +1,37 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-import matplotlib.pyplot as plt
-from scipy.io import wavfile
+from tkinter import filedialog, messagebox
 import os
+import getpass
 import json
-import pandas as pd
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from tkinter import messagebox
-from pydub import AudioSegment
-import simpleaudio as sa
+import socket
+import threading
 import time
+from transcription_tool.autosave import WriteBehindWriter
+from transcription_tool.corpus import BackgroundScan, CorpusScanner, insert_sorted
+from transcription_tool.metrics import Metrics
+from transcription_tool.render_scheduler import RenderScheduler
+from transcription_tool.search import TranscriptionIndex
+from transcription_tool.tags import TAGS
+from transcription_tool.transcription_store import TranscriptionJournal, TranscriptionStore
+from transcription_tool.viewport_renderer import ViewportRenderer
+from transcription_tool.work_client import BackgroundLeases, RemoteTranscriptionStore, WorkClient
 
 # Globals
-current_playback_line = None
 playback_line_id = None
-global AXES1, canvas, start_position
-AXES1 = None
-canvas = None
+SPECTROGRAM_VIEW = None
+OVERVIEW_STRIP = None  # Peak envelope of the whole file above the spectrogram
+CURRENT_PYRAMID = None  # Spectrogram tiles of the displayed file, for zoomed-in or long views
+CURRENT_BASE_SPECTROGRAM = None  # Whole-file image of the displayed file
+CURRENT_SPECTROGRAM_SOURCE = None  # (path, type_spec, max_freq) of the displayed file
+DISPLAYED_PATH = None  # File whose spectrogram is on screen; lags CURRENT_INDEX while navigating
+PLAY_WHEN_SHOWN = False  # Play was pressed while the current file was still loading
+SHOWING_WINDOW = False  # True while the image only covers the range around the viewport
 start_position = 0
 playback_object = None
-transcriptions_df = pd.DataFrame()
 zoom_level = 1.0
 spectrogram_start = 0
 total_audio_length = 0
+current_pcm = None  # (path, PcmBuffer) of the displayed file, when it was prefetched
 
 
 # Define styling constants
@@ -33,29 +41,59 @@ LABEL_FONT = ("Helvetica", 12)
 ENTRY_FONT = ("Helvetica", 12)
 WIDGET_BG_COLOR = "#F0F0F0"
 
+# Initializing constants
+CURRENT_INDEX = 0
+FOLDER_WAV_FILES = []
+FILES_LEFT_TO_ANNOTATE = []
+FOLDER_TO_SAVE_ANNOTATIONS = ""
+CORPUS_SCAN = None  # BackgroundScan of the selected folder
+METADATA = None  # MetadataIndex of the selected folder: durations and corrupt files
+CORRUPT_FILES = []  # Files of the folder whose header could not be read; never displayed
+TOTAL_SECONDS = 0.0  # Duration of FOLDER_WAV_FILES
+LEFT_SECONDS = 0.0  # Duration of FILES_LEFT_TO_ANNOTATE
+PASSED_SECONDS = (0, 0.0)  # (index, duration of FILES_LEFT_TO_ANNOTATE[:index]), see 'seconds_passed'
+SORTED_FROM = 0  # FILES_LEFT_TO_ANNOTATE[SORTED_FROM:] is sorted by 'Corpus.Order' during a scan
+WORK_CLIENT = None  # Connection to the work server when 'Server.Url' is set
+LEASES = None  # BackgroundLeases making the lease calls of WORK_CLIENT off the Tk thread
+ASSIGNMENTS_STARTING = False  # True until the first batch of 'start_assignments' is polled
+SEARCH_INDEX = None  # TranscriptionIndex of the saved transcriptions, None with a work server
+REVIEW_QUERY = None  # Query whose matches are in FILES_LEFT_TO_ANNOTATE, None outside review mode
+current_file_label = None
+metrics_overlay = None
+save_indicator = None
+AUTOSAVE_FAILING = False  # True from a failed background write until everything is written
+# Background import of the numerical and plotting modules, see 'load_core'
+CORE_LOADER = None
+CORE_ERROR = None
+AUDIO_CACHE = None
+SEGMENTER = None  # Splits long files into segments when 'Segments.Mode' is set
+SPECTROGRAM_CACHE = None
+SPECTROGRAM_LOADER = None  # Reads files and computes what the window displays for them
+PEAK_CACHE = None  # Peak summaries drawn in the overview strip, None when 'Overview.Enabled' is off
+PREFETCHER = None
+PLAYBACK_ENGINE = None
+
 
 def load_annotations():
     """
-    Loads annotations from a specified CSV file into a pandas DataFrame. If the file does not exist, initializes an empty DataFrame with predefined columns.
+    Loads annotations from the transcription CSV and its journal of later saves into the transcription store.
 
     Globals:
-    - transcriptions_df (pd.DataFrame): DataFrame used to store and access the transcription data.
+    - TRANSCRIPTIONS (TranscriptionStore): Store used to access the transcription data by filename.
 
     Effects:
-    - Initializes or updates the 'transcriptions_df' global variable with transcription data from a CSV file.
+    - Fills 'TRANSCRIPTIONS' with the transcription data from the CSV file and its journal.
+    - Starts indexing them for 'open_search' in the background.
     """
-    global transcriptions_df
-    if os.path.exists(CURRENT_CSV_FILENAME):
-        transcriptions_df = pd.read_csv(CURRENT_CSV_FILENAME, sep='|')
-        transcriptions_df.sort_values('Filename', inplace=True)  # Sort the DataFrame by the Filename column
-    else:
-        transcriptions_df = pd.DataFrame(columns=["Filename", "Transcription"])
+    TRANSCRIPTIONS.load()
+    if SEARCH_INDEX is not None:
+        SEARCH_INDEX.start_build(TRANSCRIPTIONS.items())
 
 
 # Transcription management#
 def get_transcription(filepath):
     """
-    Retrieves the transcription associated with a specific audio file from the global DataFrame.
+    Retrieves the transcription associated with a specific audio file from the transcription store.
 
     Parameters:
     - filepath (str): The path to the audio file for which the transcription is requested.
@@ -63,10 +101,7 @@ def get_transcription(filepath):
     Returns:
     - str: The transcription text if found, else an empty string.
     """
-    transcription = transcriptions_df[transcriptions_df["Filename"] == filepath][
-        "Transcription"
-    ]
-    return transcription.iloc[0] if not transcription.empty else ""
+    return TRANSCRIPTIONS.get(filepath)
 
 
 def update_transcription_display():
@@ -82,96 +117,232 @@ def update_transcription_display():
         ANNOTATION_ENTRY_VAR.set(current_transcription)
 
 
-# Initaliazing Tkinter  Window#
-root = tk.Tk()
-root.title("Speech Transcription Tool")
+# Spectrogram Function
+def plot_wav_file(path_wavfile, type_spec="psd", max_freq=4000):
+    """
+    Plots the spectrogram of an audio file in a tkinter frame using matplotlib.
 
-# Create the main frame and have it fill the whole root window using grid
-mainframe = tk.Frame(root, bg=WIDGET_BG_COLOR)
-mainframe.grid(row=0, column=0, sticky="nsew")
-root.grid_rowconfigure(0, weight=1)
-root.grid_columnconfigure(0, weight=1)
+    WAV files are memory-mapped; compressed files are decoded once into the shared decoded-audio
+    cache, which playback then reuses. The file is loaded on the Tk thread; navigation goes
+    through 'navigate_to' instead, which loads in the background.
 
-# Reading configurations from JSON file
-with open("config_app.json", "r") as jsonfile_obj:
-    data_json = jsonfile_obj.read()
-datajson_obj = json.loads(data_json)
+    Parameters:
+    - path_wavfile (str): Path to the WAV file to plot.
+    - type_spec (str): Type of spectrogram to display; defaults to 'psd' for power spectral density.
 
-BUTTONS_HEIGHT = datajson_obj["ButtonsParams"]["Height"]
-BUTTONS_WIDTH = datajson_obj["ButtonsParams"]["Width"]
-CURRENT_CSV_FILENAME = datajson_obj["TranscriptionFile"]["TranscriptionFile"]
+    Effects:
+    - Displays the spectrogram of the specified audio file in the GUI.
+    """
+    wait_for_core()
+    RENDER_SCHEDULER.cancel()  # A file navigated to and still loading would replace this one
+    VIEWPORT_RENDERER.cancel()  # Renders of the previous file are no longer wanted
+    stopwatch = METRICS.stopwatch("plot_wav_file")
+    prefetched = PREFETCHER.take(path_wavfile) if type_spec == PREFETCHER.type_spec else None
+    loaded = SPECTROGRAM_LOADER.load(
+        path_wavfile, type_spec, max_freq, prefetched, stopwatch, on_peaks=show_overview_now
+    )
+    show_spectrogram(path_wavfile, type_spec, max_freq, loaded, stopwatch)
 
 
-# Initialize constants
-CURRENT_INDEX = 0
-FOLDER_WAV_FILES = []
-FILES_LEFT_TO_ANNOTATE = []
-FOLDER_TO_SAVE_ANNOTATIONS = ""
-ANNOTATION_ENTRY_VAR = tk.StringVar(mainframe)
+def build_spectrogram_view():
+    """
+    Builds the spectrogram view and the overview strip above it, once; later files only swap
+    the image data.
+    """
+    global SPECTROGRAM_VIEW, OVERVIEW_STRIP
+    if SPECTROGRAM_VIEW is not None:
+        return
+    view_frame = tk.Frame(mainframe, bg=WIDGET_BG_COLOR)
+    view_frame.grid(row=2, column=0, columnspan=6, padx=10, pady=10, sticky="nsew")
+    SPECTROGRAM_VIEW = SpectrogramView(view_frame, on_click, figsize=(12, 6))
+    if PEAK_CACHE is not None:
+        OVERVIEW_STRIP = OverviewStrip(
+            view_frame, on_overview_jump, height=int(OVERVIEW_PARAMS.get("Height", 48))
+        )
+        OVERVIEW_STRIP.widget.pack(side="top", fill="x")
+        # Both renderers lay their plotting area out again on '<Configure>', before this runs
+        SPECTROGRAM_VIEW.widget.bind("<Configure>", align_overview, add="+")
+    SPECTROGRAM_VIEW.widget.pack(side="top", fill="both", expand=True)
 
-# Initializing constants
-CURRENT_INDEX = 0
-FOLDER_WAV_FILES = []
-FILES_LEFT_TO_ANNOTATE = []
-FOLDER_TO_SAVE_ANNOTATIONS = ""
-ANNOTATION_ENTRY_VAR = tk.StringVar(mainframe)
 
+def plotting_area():
+    """Returns the left edge and width in pixels of the spectrogram plotting area."""
+    return int(SPECTROGRAM_VIEW.axes.bbox.x0), SPECTROGRAM_VIEW.pixel_width()
 
-# Spectrogram Function
-def plot_wav_file(path_wavfile, type_spec="psd", max_freq=4000):
+
+def align_overview(event=None):
+    """Lines the overview strip up with the spectrogram plotting area again, e.g. after a resize."""
+    OVERVIEW_STRIP.align(*plotting_area())
+
+
+def show_overview(peaks):
+    """
+    Draws the overview strip of a file whose spectrogram is still being loaded; the strip only
+    needs the peak summary, which is much quicker to get.
     """
-    Plots the spectrogram of a WAV file in a tkinter frame using matplotlib.
+    build_spectrogram_view()
+    if OVERVIEW_STRIP is not None and peaks is not None:
+        OVERVIEW_STRIP.show(peaks, *plotting_area())
+        OVERVIEW_STRIP.set_viewport(0, peaks.duration)
 
-    Parameters:
-    - path_wavfile (str): Path to the WAV file to plot.
-    - type_spec (str): Type of spectrogram to display; defaults to 'psd' for power spectral density.
 
-    Effects:
-    - Displays the spectrogram of the specified audio file in the GUI.
+def show_overview_now(peaks):
+    """Like 'show_overview', and paints it at once, for a spectrogram computed on the Tk thread."""
+    show_overview(peaks)
+    if OVERVIEW_STRIP is not None:
+        OVERVIEW_STRIP.widget.update_idletasks()
+
+
+def show_spectrogram(path_wavfile, type_spec, max_freq, loaded, stopwatch):
     """
-    global AXES1, canvas, total_audio_length, spectrogram_start, spectrogram_end, zoom_level
-    fig = Figure(figsize=(12, 6))
-    sample_rate, samples = wavfile.read(path_wavfile)
-    total_audio_length = len(samples) / sample_rate
+    Displays a file loaded by 'SPECTROGRAM_LOADER' and resets the view to the whole file.
+
+    Parameters:
+    - loaded (LoadedSpectrogram): The result of 'SpectrogramLoader.load'.
+    - stopwatch (Stopwatch): Timer of the whole load and display, stopped here.
+    """
+    global total_audio_length, spectrogram_start, spectrogram_end, zoom_level, current_pcm, start_position
+    global CURRENT_PYRAMID, CURRENT_BASE_SPECTROGRAM, CURRENT_SPECTROGRAM_SOURCE, SHOWING_WINDOW, DISPLAYED_PATH
+    spectrogram, CURRENT_PYRAMID, clim, current_pcm, peaks = loaded
+    if path_wavfile != DISPLAYED_PATH:
+        start_position = 0  # The playback start was a time of the previous file
+    DISPLAYED_PATH = path_wavfile
+    CURRENT_BASE_SPECTROGRAM = spectrogram
+    CURRENT_SPECTROGRAM_SOURCE = (path_wavfile, type_spec, max_freq)
+    SHOWING_WINDOW = False
+    total_audio_length = spectrogram.duration
     zoom_level = 1.0  # Reset zoom level to 1.0
     spectrogram_start = 0  # Start from the beginning of the audio
     spectrogram_end = total_audio_length  # End at the total length of the aud
 
-    if samples.ndim > 1:
-        samples = samples[:, 0]
-    # Define the NFFT and noverlap for higher resolution
-    NFFT = 4096
-    noverlap = int(NFFT * 0.75)
-
-    # Spectrogram plotting
-    AXES1 = fig.add_subplot(111)
-    AXES1.specgram(
-        samples,
-        Fs=sample_rate,
-        NFFT=NFFT,
-        noverlap=noverlap,
-        mode=type_spec,
-        cmap=plt.get_cmap("viridis")
+    build_spectrogram_view()
+    SPECTROGRAM_VIEW.show(spectrogram, max_freq, clim)
+    stopwatch.lap("draw")
+    if OVERVIEW_STRIP is not None:
+        # Usually drawn already by 'show_overview', while the spectrogram was loading
+        if OVERVIEW_STRIP.peaks is not peaks:
+            OVERVIEW_STRIP.show(peaks, *plotting_area())
+        OVERVIEW_STRIP.set_viewport(spectrogram_start, spectrogram_end)
+        stopwatch.lap("overview")
+    stopwatch.stop()
+
+
+def navigate_to(index, play=False):
+    """
+    Moves to a file of 'FILES_LEFT_TO_ANNOTATE' when navigating with Next and Previous.
+
+    The file counter and the transcription change at once; the spectrogram is loaded by
+    'RENDER_SCHEDULER', which coalesces a burst of steps into one load of the file landed on and
+    drops the loads made stale. Playback, when asked for, starts once the user stops on a file.
+
+    Parameters:
+    - index (int): Index of the file to show.
+    - play (bool): Start playing the file once navigation settles.
+    """
+    global CURRENT_INDEX, PLAY_WHEN_SHOWN
+    wait_for_core()
+    CURRENT_INDEX = index
+    PLAY_WHEN_SHOWN = False
+    update_transcription_display()
+    update_current_file_label()
+    RENDER_SCHEDULER.request((FILES_LEFT_TO_ANNOTATE[index], time.perf_counter(), play))
+
+
+def prepare_navigation(target):
+    """Starts the load of a navigation target: takes its prefetched data and prefetches past it."""
+    path_wavfile = target[0]
+    VIEWPORT_RENDERER.cancel()
+    stopwatch = METRICS.stopwatch("plot_wav_file")
+    prefetched = PREFETCHER.take(path_wavfile) if PREFETCHER.type_spec == "psd" else None
+    PREFETCHER.schedule(FILES_LEFT_TO_ANNOTATE, CURRENT_INDEX)
+    return path_wavfile, prefetched, stopwatch
+
+
+def load_navigation(argument, report):
+    path_wavfile, prefetched, stopwatch = argument
+    return stopwatch, SPECTROGRAM_LOADER.load(path_wavfile, "psd", 4000, prefetched, stopwatch, on_peaks=report)
+
+
+def show_navigation_overview(target, peaks):
+    show_overview(peaks)
+
+
+def show_navigation(target, result):
+    """Displays a navigation target and records the time since the key press that asked for it."""
+    path_wavfile, requested, _ = target
+    stopwatch, loaded = result
+    show_spectrogram(path_wavfile, "psd", 4000, loaded, stopwatch)
+    METRICS.observe("navigate", time.perf_counter() - requested)
+    if PLAY_WHEN_SHOWN:
+        play_audio(CURRENT_INDEX)
+
+
+def showing_current_file():
+    """
+    Returns True when the spectrogram on screen is the one of the current file. Navigation
+    changes the current file at once but its spectrogram later: until then, clicks on the old
+    image would seek the new file at the old file's times.
+    """
+    return bool(FILES_LEFT_TO_ANNOTATE) and DISPLAYED_PATH == FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX]
+
+
+def settle_navigation(target):
+    if target[2]:
+        play_audio(CURRENT_INDEX)
+
+
+def navigation_error(target, error):
+    messagebox.showerror("Error", f"Could not load {format_path_display(target[0])}: {error}")
+
+
+def set_viewport(start, end):
+    """
+    Shows the time range [start, end] of the current file.
+
+    The axis limits change immediately. When zoomed in, or scrolled in a long recording, the
+    spectrogram of the visible range is then recomputed in the background at a time resolution
+    matching the zoom level and swapped in by 'on_viewport_ready'. At full view the whole-file
+    image is shown again.
+
+    Parameters:
+    - start (float): Start of the visible range in seconds.
+    - end (float): End of the visible range in seconds.
+    """
+    global CURRENT_PYRAMID, SHOWING_WINDOW
+    if tuple(SPECTROGRAM_VIEW.axes.get_xlim()) == (start, end):
+        return
+    SPECTROGRAM_VIEW.set_xlim(start, end)
+    if OVERVIEW_STRIP is not None:
+        OVERVIEW_STRIP.set_viewport(start, end)
+
+    if end - start >= total_audio_length * 0.999:
+        VIEWPORT_RENDERER.cancel()
+        if SHOWING_WINDOW:
+            SPECTROGRAM_VIEW.set_image(CURRENT_BASE_SPECTROGRAM)
+            SHOWING_WINDOW = False
+        return
+
+    path_wavfile, type_spec, max_freq = CURRENT_SPECTROGRAM_SOURCE
+    if CURRENT_PYRAMID is None:
+        CURRENT_PYRAMID = SPECTROGRAM_LOADER.pyramid(path_wavfile, type_spec, max_freq)
+    VIEWPORT_RENDERER.request(
+        CURRENT_SPECTROGRAM_SOURCE, CURRENT_PYRAMID, start, end, SPECTROGRAM_VIEW.pixel_width()
     )
-    AXES1.set_ylabel("Frequency [Hz]")
-    AXES1.set_xlabel("Time [sec]")
-    AXES1.set_ylim(0, max_freq)  # Adjusted to show full frequency range
-    AXES1.set_xlim(0, spectrogram_end)
 
-    # Embedding in Tkinter
-    if canvas:
-        canvas.get_tk_widget().destroy()  # Remove old canvas to avoid overlay issues
 
-    canvas = FigureCanvasTkAgg(fig, master=mainframe)
-    canvas.draw()
-    canvas_widget = canvas.get_tk_widget()
-    canvas_widget.grid(row=2, column=0, columnspan=6, padx=10, pady=10)
+def on_viewport_ready(spectrogram):
+    """
+    Displays the spectrogram of the range around the viewport once it has been computed.
 
-    # Reconnect the click event handler
-    canvas.mpl_connect("button_press_event", on_click)
+    Parameters:
+    - spectrogram (Spectrogram): The matrix covering the visible range, and its extent.
+    """
+    global SHOWING_WINDOW
+    SPECTROGRAM_VIEW.set_image(spectrogram)
+    SHOWING_WINDOW = True
 
 def shift_view(direction):
-    global spectrogram_start, spectrogram_end, AXES1, canvas, zoom_level
+    global spectrogram_start, spectrogram_end, zoom_level
     shift_increment = (spectrogram_end - spectrogram_start) * 0.25  # Adjust this for a larger/smaller shift
 
     if direction == 'left' and spectrogram_start > 0:
@@ -181,12 +352,11 @@ def shift_view(direction):
         spectrogram_end = min(spectrogram_end + shift_increment, total_audio_length)
         spectrogram_start = min(spectrogram_start + shift_increment, spectrogram_end - (spectrogram_end - spectrogram_start))
 
-    AXES1.set_xlim(spectrogram_start, spectrogram_end)
-    canvas.draw_idle()
+    set_viewport(spectrogram_start, spectrogram_end)
 
 
 def update_spectrogram_view():
-    global AXES1, canvas, spectrogram_start, spectrogram_end
+    global spectrogram_start, spectrogram_end
 
     # First, we need to calculate the visible range based on the zoom level.
     visible_range = spectrogram_end - spectrogram_start
@@ -210,20 +380,35 @@ def update_spectrogram_view():
     spectrogram_start, spectrogram_end = new_start, new_end
 
     # Now update the axes limits to reflect the new view
-    AXES1.set_xlim(spectrogram_start, spectrogram_end)
-    canvas.draw_idle()
+    set_viewport(spectrogram_start, spectrogram_end)
 
 def update_line_position(x_position):
-    global current_playback_line, AXES1, canvas, start_position
-    if current_playback_line:
-        current_playback_line.remove()
-    current_playback_line = AXES1.axvline(
-        x=x_position, color="lime", linewidth=2, linestyle="--"
-    )
-    canvas.draw_idle()
+    global start_position
+    SPECTROGRAM_VIEW.set_cursor(x_position)
+    if OVERVIEW_STRIP is not None:
+        OVERVIEW_STRIP.set_cursor(x_position)
     start_position = x_position
 
 
+def on_overview_jump(seconds):
+    """
+    Handles clicks and drags on the overview strip: centers the spectrogram on the clicked time,
+    keeping the zoom level, and moves the playback start there unless audio is playing.
+
+    Parameters:
+    - seconds (float): Time in seconds under the mouse.
+    """
+    global spectrogram_start, spectrogram_end
+    if not showing_current_file():
+        return
+    visible_range = spectrogram_end - spectrogram_start
+    spectrogram_start = min(max(seconds - visible_range / 2, 0), max(total_audio_length - visible_range, 0))
+    spectrogram_end = spectrogram_start + visible_range
+    set_viewport(spectrogram_start, spectrogram_end)
+    if not (playback_object and playback_object.is_playing()):
+        update_line_position(seconds)
+
+
 def on_click(event):
     """
     Handles click events on the spectrogram plot, allowing the user to start or stop playback or adjust the playback starting point.
@@ -234,13 +419,15 @@ def on_click(event):
     Effects:
     - Adjusts playback behavior or starting position based on the location of the click within the spectrogram.
     """
-    global current_playback_line, start_position, playback_object
-    if event.inaxes == AXES1:
+    global start_position, playback_object
+    if not showing_current_file():
+        return
+    if event.inaxes == SPECTROGRAM_VIEW.axes:
         clicked_x_position = event.xdata  # Time in seconds where the user clicked
         start_position = clicked_x_position  # Update global start position
 
-        if current_playback_line:
-            line_xdata = current_playback_line.get_xdata()[0]
+        line_xdata = SPECTROGRAM_VIEW.cursor_position()
+        if line_xdata is not None:
             if abs(clicked_x_position - line_xdata) < 0.5:  # Close to the line
                 if playback_object and playback_object.is_playing():
                     playback_object.stop()  # Stop playback if playing
@@ -263,10 +450,58 @@ def _quit():
     - Closes the application window and destroys all associated resources.
     """
     stop_playback()
+    if PREFETCHER is not None:
+        PREFETCHER.shutdown()
+    VIEWPORT_RENDERER.shutdown()
+    RENDER_SCHEDULER.shutdown()
+    queue_transcriptions()
+    if not AUTOSAVER.close(timeout=float(AUTOSAVE_PARAMS.get("QuitTimeoutSeconds", 10))):
+        errors = AUTOSAVER.poll_errors()
+        messagebox.showerror(
+            "Error",
+            f"{AUTOSAVER.pending() + TRANSCRIPTIONS.dirty_count()} transcriptions could not be saved"
+            + (f": {errors[-1]}" if errors else ""),
+        )
+    if WORK_CLIENT is not None:
+        release_assignments()
+        LEASES.close(timeout=WORK_CLIENT.timeout)  # the leases expire on their own otherwise
+    else:
+        try:
+            TRANSCRIPTION_JOURNAL.close()  # Fold the journal into the CSV
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not update {CURRENT_CSV_FILENAME}: {str(e)}")
+    export_metrics()
     root.quit()
     root.destroy()
 
 
+def export_metrics():
+    """
+    Writes the latency histograms to the JSONL log and/or Prometheus text file set in the
+    'Metrics' section of the configuration. Export errors are ignored: metrics must never get in
+    the way of annotating.
+    """
+    try:
+        if METRICS_PARAMS.get("JsonlFile"):
+            METRICS.write_jsonl(METRICS_PARAMS["JsonlFile"])
+        if METRICS_PARAMS.get("PrometheusFile"):
+            METRICS.write_prometheus(METRICS_PARAMS["PrometheusFile"])
+    except OSError:
+        pass
+
+
+def schedule_metrics_export():
+    """Exports the metrics every 'Metrics.ExportSeconds' seconds."""
+    export_metrics()
+    root.after(int(float(METRICS_PARAMS.get("ExportSeconds", 60)) * 1000), schedule_metrics_export)
+
+
+def update_metrics_overlay():
+    """Refreshes the p50/p95 line shown under the window every second."""
+    metrics_overlay.config(text=METRICS.summary(METRICS_OPERATIONS))
+    root.after(1000, update_metrics_overlay)
+
+
 # Selects Folder to save
 def browse_folder_to_save_annotations():
     """
@@ -299,24 +534,21 @@ def next_audio_update_index():
     - CURRENT_INDEX (int): The current index in the list of audio files.
 
     Effects:
-    - Increments the 'CURRENT_INDEX'.
-    - Updates the display to show the spectrogram of the next audio file.
-    - Updates the transcription display for the new audio file.
+    - Increments the 'CURRENT_INDEX' and updates the transcription display at once.
+    - Shows the spectrogram of the next audio file through 'navigate_to', and plays it once
+      presses stop: holding Return only loads the file it is released on.
     """
-    global CURRENT_INDEX
     stop_playback()
 
     # Save any changes to the transcription before moving to the next audio file
     save_annotations(CURRENT_INDEX)
+    if WORK_CLIENT is not None:
+        lease_assignments()
 
     if CURRENT_INDEX < len(FILES_LEFT_TO_ANNOTATE) - 1:
-        CURRENT_INDEX += 1
-        plot_wav_file(FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX], "psd")
-        update_transcription_display()
-        display_path = format_path_display(FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX])
-        progress_text = f"{CURRENT_INDEX + 1}/{len(FILES_LEFT_TO_ANNOTATE)} {display_path}"
-        current_file_label.config(text=progress_text)
-        play_audio(CURRENT_INDEX)
+        navigate_to(CURRENT_INDEX + 1, play=True)
+    elif WORK_CLIENT is not None and LEASES.leasing():
+        messagebox.showinfo("End", "More files are on their way from the work server.")
     else:
         messagebox.showinfo("End", "No more files in the folder.")
 
@@ -352,20 +584,13 @@ def previous_audio_update_index():
     - CURRENT_INDEX (int): The current index in the list of audio files.
 
     Effects:
-    - Decrements the 'CURRENT_INDEX'.
-    - Updates the display to show the spectrogram of the previous audio file.
-    - Updates the transcription display for the new audio file.
+    - Decrements the 'CURRENT_INDEX' and updates the transcription display at once.
+    - Shows the spectrogram of the previous audio file through 'navigate_to', once presses stop.
     """
-    global CURRENT_INDEX
     stop_playback()
 
     if CURRENT_INDEX > 0:
-        CURRENT_INDEX -= 1
-        plot_wav_file(FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX], "psd")
-        update_transcription_display()
-        display_path = format_path_display(FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX])
-        progress_text = f"{CURRENT_INDEX + 1}/{len(FILES_LEFT_TO_ANNOTATE)} {display_path}"
-        current_file_label.config(text=progress_text)
+        navigate_to(CURRENT_INDEX - 1)
     else:
         messagebox.showinfo("Start", "This is the first file.")
 
@@ -395,61 +620,326 @@ def insert_tag(tag):
 # Browse Wav file folder
 def browse_wav_files():
     """
-    Opens a dialog to select a folder and loads all WAV files from the selected folder into a global list.
+    Opens a dialog to select a folder and loads all audio files (WAV, and the compressed formats an installed decoder reads) from the selected folder into a global list.
+
+    The folder is scanned in the background: the first file left to annotate is displayed as soon
+    as it is found, and the lists keep growing while 'poll_corpus_scan' collects the rest. Folders
+    that did not change since the last scan are read from the corpus manifest.
 
     Globals:
     - FOLDER_WAV_FILES (list): A list of paths to WAV files.
-    - FILES_LEFT_TO_ANNOTATE (list): A list of files left to annotate, initially the same as FOLDER_WAV_FILES.
+    - FILES_LEFT_TO_ANNOTATE (list): The files of FOLDER_WAV_FILES without a saved transcription.
 
     Effects:
-    - Populates 'FOLDER_WAV_FILES' and 'FILES_LEFT_TO_ANNOTATE' with paths to WAV files from the selected directory.
-    - Updates the GUI to display the spectrogram of the first audio file and its transcription.
+    - Starts populating 'FOLDER_WAV_FILES' and 'FILES_LEFT_TO_ANNOTATE' with paths to WAV files from the selected directory.
     """
+    global FILES_LEFT_TO_ANNOTATE, FOLDER_WAV_FILES, CURRENT_INDEX, CORPUS_SCAN, METADATA
+    global TOTAL_SECONDS, LEFT_SECONDS, PASSED_SECONDS, SORTED_FROM, REVIEW_QUERY
+    if WORK_CLIENT is not None:
+        start_assignments()
+        return
     filename = filedialog.askdirectory()
-    global FILES_LEFT_TO_ANNOTATE, FOLDER_WAV_FILES, current_file_label
+    if not filename:
+        return
+    wait_for_core()
+    if CORPUS_SCAN:
+        CORPUS_SCAN.stop()
+    stop_playback()
     FOLDER_WAV_FILES.clear()  # Clear the list before appending new files
-    list_files = list(os.walk(filename))
-    for root, dirs, files in list_files:
-        for file in files:
-            if file.endswith((".wav", ".WAV")):  # Check for WAV files (case-sensitive)
-                FOLDER_WAV_FILES.append(os.path.join(root, file))
+    CORRUPT_FILES.clear()
+    TOTAL_SECONDS = LEFT_SECONDS = 0.0
+    PASSED_SECONDS = (0, 0.0)
+    SORTED_FROM = 0
+    FILES_LEFT_TO_ANNOTATE = []
+    CURRENT_INDEX = 0
+    REVIEW_QUERY = None
+    METADATA = MetadataIndex(
+        filename, CORPUS_MANIFEST_DIRECTORY, workers=int(CORPUS_PARAMS.get("MetadataWorkers", 16))
+    )
+    CORPUS_SCAN = BackgroundScan(
+        CorpusScanner(filename, CORPUS_MANIFEST_DIRECTORY),
+        expand=SEGMENTER.split if SEGMENTER is not None else None,
+        metadata=METADATA,
+    )
+    poll_corpus_scan(CORPUS_SCAN)
+
 
-    FOLDER_WAV_FILES.sort()  # Sort the list of files alphabetically
+def poll_corpus_scan(scan):
+    """
+    Collects the files found by a background corpus scan and shows the first one to annotate.
+
+    Files whose full path already has a saved transcription are left out of
+    'FILES_LEFT_TO_ANNOTATE' (a set lookup per file), and so are files whose header the metadata
+    index could not read. With 'Corpus.Order' set to 'shortest' or 'longest', the files not
+    shown yet are kept sorted by duration, each batch being merged in place. Reschedules itself
+    until the scan finishes, then reports the totals.
 
-    if len(FOLDER_WAV_FILES) == 0:
-        messagebox.showerror("Error", "No WAV files found in the selected path")
+    Parameters:
+    - scan (BackgroundScan): The running scan; ignored once another folder has been selected.
+    """
+    global TOTAL_SECONDS, LEFT_SECONDS, PASSED_SECONDS, SORTED_FROM
+    if scan is not CORPUS_SCAN:
+        return
+    new_files, finished = scan.poll()
+    was_empty = not FILES_LEFT_TO_ANNOTATE
+    annotated_files = TRANSCRIPTIONS.filenames()
+    FOLDER_WAV_FILES.extend(new_files)  # Found in alphabetical order
+    new_left = []
+    for f in new_files:
+        duration = METADATA.duration(f)
+        TOTAL_SECONDS += duration
+        if METADATA.is_corrupt(f):
+            CORRUPT_FILES.append(f)
+        elif f not in annotated_files:
+            new_left.append(f)
+            LEFT_SECONDS += duration
+    order = CORPUS_PARAMS.get("Order", "name")
+    if order in ("shortest", "longest") and new_left:
+        # The new files are merged into the sorted files after the furthest one shown: the
+        # queue is never re-sorted and the files already in it keep their order
+        sign = -1 if order == "longest" else 1
+        if not was_empty:
+            SORTED_FROM = max(SORTED_FROM, CURRENT_INDEX + 1)
+        if PASSED_SECONDS[0] > SORTED_FROM:
+            PASSED_SECONDS = (0, 0.0)  # files are inserted before its index
+        insert_sorted(
+            FILES_LEFT_TO_ANNOTATE, new_left, key=lambda f: (sign * METADATA.duration(f), f), lo=SORTED_FROM
+        )
     else:
-        FILES_LEFT_TO_ANNOTATE = FOLDER_WAV_FILES[:]
-        display_path = format_path_display(FOLDER_WAV_FILES[0])
-        progress_text = f"1/{len(FILES_LEFT_TO_ANNOTATE)} {display_path}"
-        if 'current_file_label' not in globals() or current_file_label is None:
-            current_file_label = tk.Label(mainframe, text=progress_text)
-            current_file_label.grid(row=1, column=3)
-        else:
-            current_file_label.config(text=progress_text)
-        plot_wav_file(FOLDER_WAV_FILES[0], "psd")
-        update_transcription_display()  # Update transcription display for the first file
-
-        if os.path.exists(CURRENT_CSV_FILENAME):
-            annotated_files = pd.read_csv(CURRENT_CSV_FILENAME, error_bad_lines=False)
-            annotated_files = annotated_files["Filename"].tolist()
-            FILES_LEFT_TO_ANNOTATE = [
-                f for f in FOLDER_WAV_FILES if os.path.basename(f) not in annotated_files
-            ]
-            track_annotated = len(FOLDER_WAV_FILES) - len(FILES_LEFT_TO_ANNOTATE)
-            messagebox.showinfo(
-                "Files Found:",
-                "Number of audio files found: "
-                + str(len(FOLDER_WAV_FILES))
-                + "\n"
-                + "Files already annotated: "
-                + str(track_annotated),
-            )
-        else:
-            messagebox.showinfo(
-                "Files Found:",
-                "Number of audio files found: " + str(len(FOLDER_WAV_FILES)),
-            )
+        FILES_LEFT_TO_ANNOTATE.extend(new_left)
+
+    if FILES_LEFT_TO_ANNOTATE:
+        if was_empty:
+            plot_wav_file(FILES_LEFT_TO_ANNOTATE[0], "psd")
+            update_transcription_display()  # Update transcription display for the first file
+        if new_files:
+            PREFETCHER.schedule(FILES_LEFT_TO_ANNOTATE, CURRENT_INDEX)
+        update_current_file_label()
+
+    if not finished:
+        root.after(50, poll_corpus_scan, scan)
+    elif scan.error is not None:
+        messagebox.showerror("Error", f"Could not scan the selected path: {scan.error}")
+    elif len(FOLDER_WAV_FILES) == 0:
+        messagebox.showerror("Error", "No audio files found in the selected path")
+    else:
+        unit = "segments" if SEGMENTER is not None else "audio files"
+        track_annotated = len(FOLDER_WAV_FILES) - len(FILES_LEFT_TO_ANNOTATE) - len(CORRUPT_FILES)
+        messagebox.showinfo(
+            "Files Found:",
+            f"Number of {unit} found: "
+            + str(len(FOLDER_WAV_FILES))
+            + "\n"
+            + ("Segments" if SEGMENTER is not None else "Files") + " already annotated: "
+            + str(track_annotated)
+            + (f"\nCorrupt files skipped: {len(CORRUPT_FILES)}" if CORRUPT_FILES else ""),
+        )
+
+
+def open_search():
+    """
+    Opens the search window: runs queries over the saved transcriptions and their tags (see
+    'transcription_tool.search' for the syntax), lists the matching files, and loads them as a
+    review queue with 'start_review'.
+    """
+    window = tk.Toplevel(root)
+    window.title("Search Transcriptions")
+    query_var = tk.StringVar(window)
+    query_entry = tk.Entry(window, textvariable=query_var, font=ENTRY_FONT, width=50)
+    query_entry.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+    status = tk.Label(window, text="", font=("Helvetica", 9), fg="gray30")
+    status.grid(row=1, column=0, columnspan=2, padx=5, sticky="w")
+    results = tk.Listbox(window, width=80, height=20)
+    results.grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky="nsew")
+    window.grid_columnconfigure(0, weight=1)
+    window.grid_rowconfigure(2, weight=1)
+    matches = []
+    max_listed = 1000  # the review queue gets every match; the list only shows the first ones
+
+    def run_search(event=None):
+        query = query_var.get().strip()
+        results.delete(0, tk.END)
+        matches.clear()
+        try:
+            start = time.perf_counter()
+            matches.extend(SEARCH_INDEX.search(query))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except ValueError as e:
+            status.config(text=str(e), fg="red")
+            return
+        for filename in matches[:max_listed]:
+            results.insert(tk.END, format_path_display(filename))
+        text = f"{len(matches)} of {len(SEARCH_INDEX)} transcriptions match ({elapsed_ms:.0f} ms)"
+        if not SEARCH_INDEX.ready():
+            text += "; still indexing, results are partial"
+        status.config(text=text, fg="gray30")
+
+    def review(event=None):
+        if matches:
+            selection = results.curselection()
+            start_review(matches, query_var.get().strip(), selection[0] if selection else 0)
+            window.destroy()
+
+    tk.Button(window, text="Search", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT, command=run_search).grid(
+        row=0, column=1, padx=5, pady=5
+    )
+    tk.Button(window, text="Review Matches", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT, command=review).grid(
+        row=3, column=0, columnspan=2, padx=5, pady=5
+    )
+    query_entry.bind("<Return>", run_search)
+    results.bind("<Double-Button-1>", review)
+    query_entry.focus_set()
+
+
+def start_review(files, query, index=0):
+    """
+    Replaces the files to annotate by the matches of a search, for reviewing them with the usual
+    navigation. Selecting a folder again leaves the review queue.
+
+    Parameters:
+    - files (list): Paths of the matching files.
+    - query (str): The query, shown next to the file counter.
+    - index (int): Index of the file to show first.
+    """
+    global FILES_LEFT_TO_ANNOTATE, CURRENT_INDEX, CORPUS_SCAN, REVIEW_QUERY
+    global TOTAL_SECONDS, LEFT_SECONDS, PASSED_SECONDS
+    wait_for_core()
+    stop_playback()
+    if FILES_LEFT_TO_ANNOTATE:
+        save_annotations(CURRENT_INDEX)
+    if CORPUS_SCAN:
+        CORPUS_SCAN.stop()
+        CORPUS_SCAN = None  # its remaining files would be added to the review queue
+    FILES_LEFT_TO_ANNOTATE = list(files)
+    CURRENT_INDEX = index
+    REVIEW_QUERY = query
+    TOTAL_SECONDS = LEFT_SECONDS = sum(METADATA.duration(f) for f in files) if METADATA is not None else 0.0
+    PASSED_SECONDS = (0, 0.0)
+    plot_wav_file(FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX], "psd")
+    PREFETCHER.schedule(FILES_LEFT_TO_ANNOTATE, CURRENT_INDEX)
+    update_transcription_display()
+    update_current_file_label()
+
+
+def start_assignments():
+    """
+    Replaces the folder selection when working against a work server: gives back the files
+    leased so far and not saved, then leases a first batch, whose first file 'poll_leases' shows.
+    """
+    global FILES_LEFT_TO_ANNOTATE, CURRENT_INDEX, METADATA, ASSIGNMENTS_STARTING
+    wait_for_core()
+    stop_playback()
+    release_assignments()
+    METADATA = None  # durations are not known for leased files
+    FOLDER_WAV_FILES.clear()
+    FILES_LEFT_TO_ANNOTATE = []
+    CURRENT_INDEX = 0
+    ASSIGNMENTS_STARTING = True
+    lease_assignments()
+
+
+def lease_assignments():
+    """
+    Leases files from the work server until 'Server.LeaseBatch' files are waiting after the
+    current one, so the prefetcher always has files ahead. The request runs in the background;
+    'poll_leases' adds the files.
+    """
+    ahead = len(FILES_LEFT_TO_ANNOTATE) - CURRENT_INDEX - 1
+    wanted = int(SERVER_PARAMS.get("LeaseBatch", 5)) - ahead
+    if wanted > 0:
+        LEASES.lease(wanted)
+
+
+def poll_leases():
+    """
+    Collects the outcome of the background calls to the work server every 250 ms: adds the
+    leased files to the files to annotate, and shows the first one after 'start_assignments'.
+    Failed leases are reported; failed renewals and releases are not, since the next renewal
+    retries them and unreleased leases expire on their own.
+    """
+    global ASSIGNMENTS_STARTING
+    for kind, assignments, error in LEASES.poll():
+        if kind != "lease":
+            continue
+        if error is not None:
+            ASSIGNMENTS_STARTING = False
+            messagebox.showerror("Error", str(error))
+            continue
+        for path, transcription in assignments:
+            TRANSCRIPTIONS.remember(path, transcription)
+            FOLDER_WAV_FILES.append(path)
+            FILES_LEFT_TO_ANNOTATE.append(path)
+        if ASSIGNMENTS_STARTING:
+            ASSIGNMENTS_STARTING = False
+            if not FILES_LEFT_TO_ANNOTATE:
+                messagebox.showinfo("Files Found:", "No files left to annotate on the server")
+                continue
+            plot_wav_file(FILES_LEFT_TO_ANNOTATE[0], "psd")
+            update_transcription_display()
+        if FILES_LEFT_TO_ANNOTATE:
+            PREFETCHER.schedule(FILES_LEFT_TO_ANNOTATE, CURRENT_INDEX)
+            update_current_file_label()
+    root.after(250, poll_leases)
+
+
+def renew_assignments():
+    """
+    Extends the leases of the current file and of those after it, every third of the lease
+    duration, so files are not handed to someone else while they are being annotated.
+    """
+    if FILES_LEFT_TO_ANNOTATE:
+        LEASES.renew(FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX:])
+    lease_seconds = WORK_CLIENT.lease_seconds or float(SERVER_PARAMS.get("LeaseSeconds", 900))
+    root.after(int(lease_seconds * 1000 / 3), renew_assignments)
+
+
+def release_assignments():
+    """Gives the leased files not annotated yet back to the work server, in the background."""
+    unsaved = [path for path in FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX:] if path not in TRANSCRIPTIONS]
+    if unsaved:
+        LEASES.release(unsaved)
+
+
+def update_current_file_label():
+    """
+    Shows the position of the current file in the list of files left to annotate, and the hours
+    of audio done and left according to the metadata index.
+
+    While the folder is still being scanned the total is followed by '+', as it may grow.
+    """
+    global current_file_label
+    display_path = format_path_display(FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX])
+    total = str(len(FILES_LEFT_TO_ANNOTATE))
+    if CORPUS_SCAN is not None and CORPUS_SCAN.running():
+        total += "+"
+    progress_text = f"{CURRENT_INDEX + 1}/{total} {display_path}"
+    if REVIEW_QUERY is not None:
+        progress_text = f"Review '{REVIEW_QUERY}': {progress_text}"
+    if METADATA is not None and TOTAL_SECONDS:
+        left = LEFT_SECONDS - seconds_passed()
+        progress_text += f" | {(TOTAL_SECONDS - left) / 3600:.1f} h done, {left / 3600:.1f} h left"
+    if current_file_label is None:
+        current_file_label = tk.Label(mainframe, text=progress_text)
+        current_file_label.grid(row=1, column=3)
+    else:
+        current_file_label.config(text=progress_text)
+
+
+def seconds_passed():
+    """
+    Returns the duration of the files before the current one in 'FILES_LEFT_TO_ANNOTATE'.
+
+    The last result is kept in 'PASSED_SECONDS' and adjusted by the files between its index and
+    the current one, so stepping through the list costs one lookup per step.
+    """
+    global PASSED_SECONDS
+    index, seconds = PASSED_SECONDS
+    if CURRENT_INDEX >= index:
+        seconds += sum(METADATA.duration(f) for f in FILES_LEFT_TO_ANNOTATE[index:CURRENT_INDEX])
+    else:
+        seconds -= sum(METADATA.duration(f) for f in FILES_LEFT_TO_ANNOTATE[CURRENT_INDEX:index])
+    PASSED_SECONDS = (CURRENT_INDEX, seconds)
+    return seconds
 
 
 # Play Audio
@@ -457,26 +947,29 @@ def play_audio_from_position(path, start_ms):
     """
     Begins playback of an audio file from a specified start point in milliseconds.
 
+    Playback seeks straight to the requested frame: the PCM decoded alongside the spectrogram is
+    reused when available, otherwise the sample data of the file is memory-mapped, so the time to
+    start is the same wherever the position is and however long the file is.
+
     Parameters:
     - path (str): Path to the audio file.
     - start_ms (int): Start point of playback in milliseconds.
 
     Globals:
-    - playback_object (simpleaudio.PlayObject): Handles the audio playback.
+    - playback_object: Handle of the running playback ('is_playing()' / 'stop()').
     - playback_start_time (float): Timestamp when the playback was started.
 
     Effects:
     - Initiates audio playback from the specified position and records the start time.
     """
     global playback_object, playback_start_time
-    sound = AudioSegment.from_file(path, format="wav")
-    play_sound = sound[start_ms:]
-    playback_object = sa.play_buffer(
-        play_sound.raw_data,
-        num_channels=play_sound.channels,
-        bytes_per_sample=play_sound.sample_width,
-        sample_rate=play_sound.frame_rate,
-    )
+    wait_for_core()
+    stopwatch = METRICS.stopwatch("play_audio_from_position")
+    pcm = current_pcm[1] if current_pcm and current_pcm[0] == path else PLAYBACK_ENGINE.pcm_for(path)
+    stopwatch.lap("decode")
+    playback_object = PLAYBACK_ENGINE.play(path, start_ms, pcm)
+    stopwatch.lap("device_start")
+    stopwatch.stop()
     playback_start_time = time.time()  # Record the start time of playback
 
 
@@ -484,29 +977,24 @@ def update_line():
     """
     Updates the playback position line on the spectrogram based on the elapsed playback time.
 
+    Runs every 'CURSOR_INTERVAL_MS' while audio is playing. Only the cursor is redrawn on each tick;
+    the spectrogram itself is redrawn only when the viewport has to scroll to follow playback.
+
     Globals:
-    - current_playback_line (matplotlib line object): Line indicating current playback position.
-    - AXES1 (matplotlib axes object): The axes object of the plot.
-    - canvas (FigureCanvasTkAgg): Tkinter canvas used for the matplotlib plot.
+    - SPECTROGRAM_VIEW (SpectrogramView): The view owning the playback cursor.
     - playback_start_time (float): Time when the playback started.
     - start_position (float): Starting position of the playback in seconds.
 
     Effects:
     - Moves the playback position line on the plot to reflect the current playback time.
     """
-    global current_playback_line, AXES1, canvas, playback_start_time, start_position, spectrogram_start, spectrogram_end, zoom_level
+    global playback_start_time, start_position, spectrogram_start, spectrogram_end, zoom_level
 
     if playback_object and playback_object.is_playing():
+        stopwatch = METRICS.stopwatch("update_line")
         elapsed_time = time.time() - playback_start_time
         current_time = start_position + elapsed_time
 
-        if current_playback_line:
-            current_playback_line.set_xdata([current_time, current_time])
-        else:
-            current_playback_line = AXES1.axvline(x=current_time, color="lime", linewidth=2, linestyle="--")
-
-        canvas.draw_idle()
-
         middle_of_viewport = (spectrogram_start + spectrogram_end) / 2
         visible_range = spectrogram_end - spectrogram_start
 
@@ -520,15 +1008,18 @@ def update_line():
                 new_start = total_audio_length - visible_range
 
             spectrogram_start, spectrogram_end = new_start, new_end
-            AXES1.set_xlim(spectrogram_start, spectrogram_end)
-            canvas.draw_idle()
+            set_viewport(spectrogram_start, spectrogram_end)
 
-        root.after(50, update_line)
+        SPECTROGRAM_VIEW.set_cursor(current_time)
+        if OVERVIEW_STRIP is not None:
+            OVERVIEW_STRIP.set_cursor(current_time)
+        stopwatch.stop()
+        root.after(CURSOR_INTERVAL_MS, update_line)
 
-    elif current_playback_line:
-        current_playback_line.remove()
-        current_playback_line = None
-        canvas.draw_idle()
+    else:
+        SPECTROGRAM_VIEW.hide_cursor()
+        if OVERVIEW_STRIP is not None:
+            OVERVIEW_STRIP.hide_cursor()
 
 
 def play_audio(index_value):
@@ -539,16 +1030,20 @@ def play_audio(index_value):
     - index_value (int): Index in the global list 'FILES_LEFT_TO_ANNOTATE' to identify which audio file to play.
 
     Globals:
-    - playback_object (simpleaudio.PlayObject): The current playback object used for playing audio.
-    - current_playback_line (matplotlib line object): Visual indicator on the spectrogram showing current playback position.
+    - playback_object: Handle of the running playback ('is_playing()' / 'stop()').
     - start_position (float): The start position in seconds where the audio playback should begin.
 
     Effects:
     - Starts or resumes audio playback from the specified or last known position.
     - Manages the visualization of the playback progress on the spectrogram.
+    - While navigation is still loading the current file, playback starts once it is shown.
     """
-    global playback_object, current_playback_line, start_position
+    global playback_object, start_position, PLAY_WHEN_SHOWN
 
+    if index_value == CURRENT_INDEX and not showing_current_file():
+        PLAY_WHEN_SHOWN = True  # 'show_navigation' plays it once its spectrogram is shown
+        return
+    PLAY_WHEN_SHOWN = False
     path_wavfile = FILES_LEFT_TO_ANNOTATE[index_value]
     start_milliseconds = int(start_position * 1000)  # Convert seconds to milliseconds
 
@@ -556,11 +1051,6 @@ def play_audio(index_value):
     if playback_object and playback_object.is_playing():
         playback_object.stop()
 
-    # Remove existing line if exists
-    if current_playback_line:
-        current_playback_line.remove()
-        current_playback_line = None
-
     # Start playback and visual update
     play_audio_from_position(path_wavfile, start_milliseconds)
     update_line()
@@ -571,24 +1061,23 @@ def stop_playback():
     Stops the current audio playback and removes the playback position line from the spectrogram.
 
     Globals:
-    - playback_object (simpleaudio.PlayObject): Handles the audio playback.
-    - current_playback_line (matplotlib line object): Line indicating current playback position.
-    - canvas (FigureCanvasTkAgg): Tkinter canvas used for the matplotlib plot.
+    - playback_object: Handle of the running playback ('is_playing()' / 'stop()').
+    - SPECTROGRAM_VIEW (SpectrogramView): The view owning the playback cursor.
 
     Effects:
     - Stops the audio playback and removes the line from the plot.
     """
-    global playback_object, current_playback_line
+    global playback_object
     if (
         "playback_object" in globals()
         and playback_object
         and playback_object.is_playing()
     ):
         playback_object.stop()
-    if "current_playback_line" in globals() and current_playback_line:
-        current_playback_line.remove()
-        canvas.draw_idle()
-        current_playback_line = None
+    if SPECTROGRAM_VIEW:
+        SPECTROGRAM_VIEW.hide_cursor()
+    if OVERVIEW_STRIP is not None:
+        OVERVIEW_STRIP.hide_cursor()
 
 
 def stop_audio():
@@ -596,7 +1085,7 @@ def stop_audio():
     Stops the current audio playback.
 
     Globals:
-    - playback_object (simpleaudio.PlayObject): Handles the audio playback.
+    - playback_object: Handle of the running playback ('is_playing()' / 'stop()').
 
     Effects:
     - Stops the audio playback without affecting other GUI elements.
@@ -609,39 +1098,27 @@ def stop_audio():
 # Saves Annotations
 def save_annotations(index_value):
     """
-    Saves the currently entered transcription into a CSV file and updates the DataFrame storing transcriptions.
+    Saves the currently entered transcription into the transcription store and persists it.
+
+    The store is updated at once; the transcription is then written in the background by
+    'AUTOSAVER', which appends it to the journal of the CSV file (or sends it to the work
+    server), so a slow disk never holds up the window. Transcriptions that did not change are
+    not written again.
 
     Parameters:
     - index_value (int): Index of the current audio file in the global list of files.
 
     Effects:
-    - Updates the CSV file and the global DataFrame with the new transcription.
+    - Updates 'TRANSCRIPTIONS' and the search index, and queues the new transcription for writing.
     """
     try:
         filepath = FILES_LEFT_TO_ANNOTATE[index_value]
         transcription = ANNOTATION_ENTRY_VAR.get().strip()
 
-        # Check if the CSV file exists and read existing data if it does
-        if os.path.exists(CURRENT_CSV_FILENAME):
-            existing_data = pd.read_csv(CURRENT_CSV_FILENAME, sep='|')
-            # Check if transcription for the current file already exists
-            if filepath in existing_data["Filename"].values:
-                # Update the existing transcription
-                existing_data.loc[existing_data["Filename"] == filepath, "Transcription"] = transcription
-            else:
-                # Append new transcription
-                new_data = pd.DataFrame({"Filename": [filepath], "Transcription": [transcription]})
-                existing_data = pd.concat([existing_data, new_data], ignore_index=True)
-            # Sort DataFrame before saving
-            existing_data.sort_values('Filename', inplace=True)
-        else:
-            # Create new file with transcription
-            existing_data = pd.DataFrame({"Filename": [filepath], "Transcription": [transcription]})
-
-        # Save the DataFrame back to CSV using the pipe delimiter
-        existing_data.to_csv(CURRENT_CSV_FILENAME, sep='|', index=False)
-        global transcriptions_df
-        transcriptions_df = existing_data.copy()
+        with METRICS.timer("save_annotations"):
+            if TRANSCRIPTIONS.put(filepath, transcription) and SEARCH_INDEX is not None:
+                SEARCH_INDEX.update(filepath, transcription)
+            queue_transcriptions()
         ANNOTATION_ENTRY_VAR.set(transcription)
 
     except Exception as e:
@@ -657,133 +1134,51 @@ def save_and_next_audio(event):
     - event (Event): The key event that triggers this function.
 
     Effects:
-    - Calls the save_annotations function and, upon successful save, updates to the next audio file and starts its playback.
+    - Saves the transcription, moves to the next audio file and starts its playback, all through 'next_audio_update_index'.
     """
-    save_annotations(CURRENT_INDEX)
     next_audio_update_index()
-    play_audio(CURRENT_INDEX)
-
-
-# Header and Title#
-header_name = tk.Label(
-    mainframe,
-    text="Speech Transcription Tool",
-    font=("Arial", 16, "bold"),
-    bg=WIDGET_BG_COLOR,
-)
-header_name.grid(row=0, column=1, columnspan=4, pady=(10, 5))
-
-
-# Rows
-
-audio_files_folder = tk.Button(
-    mainframe,
-    text="Audio Files Folder",
-    bg=BUTTON_COLOR,
-    fg="white",
-    font=BUTTON_FONT,
-    command=browse_wav_files,
-)
-audio_files_folder.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
-quit_option = tk.Button(
-    mainframe, text="Quit", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT, command=_quit
-)
-quit_option.grid(row=1, column=5, padx=5, pady=5, sticky="e")
-
-next_button = tk.Button(
-    mainframe,
-    text=" Next >> ",
-    fg="green",
-    bd=3,
-    relief="raised",
-    command=next_audio_update_index,
-    height=BUTTONS_HEIGHT,
-    width=BUTTONS_WIDTH,
-)
-next_button.grid(row=4, column=6, padx=5, pady=5)
-prev_button = tk.Button(
-    mainframe,
-    text=" << Previous ",
-    fg="green",
-    bd=3,
-    relief="raised",
-    command=previous_audio_update_index,
-    height=BUTTONS_HEIGHT,
-    width=BUTTONS_WIDTH,
-)
-prev_button.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky="w")
-
-# Text
-###############################################################
-tk.Label(mainframe, text="Transcription:", font=LABEL_FONT, bg=WIDGET_BG_COLOR).grid(
-    row=6, column=0, sticky="w"
-)
-annotation_text = tk.Entry(
-    mainframe, textvariable=ANNOTATION_ENTRY_VAR, font=ENTRY_FONT, relief="sunken"
-)
-annotation_text.grid(row=7, column=0, columnspan=6, padx=5, pady=5, sticky="ew")
-
-
-# Play, Stop, & Submit buttons
-
-play_button = tk.Button(
-    mainframe,
-    text="Play Audio",
-    bg=BUTTON_COLOR,
-    fg="white",
-    font=BUTTON_FONT,
-    command=lambda: play_audio(CURRENT_INDEX),
-)
-play_button.grid(row=8, column=2, padx=5, pady=5, sticky="ew")
-
-stop_button = tk.Button(
-    mainframe,
-    text="Stop Audio",
-    bg=BUTTON_COLOR,
-    fg="white",
-    font=BUTTON_FONT,
-    command=stop_audio,
-)
-stop_button.grid(row=8, column=3, padx=5, pady=5, sticky="ew")
-
-submit_button = tk.Button(
-    mainframe,
-    text="Submit to Save",
-    bg=BUTTON_COLOR,
-    fg="white",
-    font=BUTTON_FONT,
-    command=lambda: save_annotations(CURRENT_INDEX),
-)
-submit_button.grid(row=8, column=4, padx=5, pady=5, sticky="ew")
-
-# Tags to be included with Start and End
-tags = ["Foreign_Language", "Cutoff", "UNK_SPK", "HESITATION"]
-
-# Vertical offset to start placing buttons
-row_offset = 2
-
-# Tags to be included with Start and End
-tags = ["Foreign_Language", "Cutoff", "UNK_SPK", "HESITATION"]
-
-# Placement variables
-column_for_start_tags = 7
-column_for_end_tags = 8
-starting_row = 3
-
-# Creating the Start and End tag buttons in two columns
-for idx, tag in enumerate(tags):
-    # Start Tag Button in one column
-    tk.Button(mainframe, text=f"[{tag}_Start]", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT,
-              command=lambda t=f"[{tag}_Start] ": insert_tag(t)).grid(row=starting_row + idx, column=column_for_start_tags, padx=5, pady=5, sticky="ew")
-
-    # End Tag Button in the next column
-    tk.Button(mainframe, text=f"[{tag}_End]", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT,
-              command=lambda t=f"[{tag}_End] ": insert_tag(t)).grid(row=starting_row + idx, column=column_for_end_tags, padx=5, pady=5, sticky="ew")
+
+
+def queue_transcriptions():
+    """
+    Hands the transcriptions changed in the store to the background writer. While the writer is
+    full they stay dirty in the store, and 'poll_autosave' hands them over later.
+    """
+    dirty = TRANSCRIPTIONS.dirty_count()
+    if dirty and AUTOSAVER.room() >= dirty:
+        AUTOSAVER.submit(TRANSCRIPTIONS.take_dirty())
+
+
+def poll_autosave():
+    """
+    Reports the background writes every 250 ms: the number of transcriptions not written yet in
+    the pending-writes indicator, and errors in a message box (once per failure, not per retry).
+    """
+    global AUTOSAVE_FAILING
+    queue_transcriptions()
+    errors = AUTOSAVER.poll_errors()
+    pending = AUTOSAVER.pending() + TRANSCRIPTIONS.dirty_count()
+    for error in errors:
+        if not isinstance(error, OSError):
+            messagebox.showerror("Error", f"An error occurred while saving: {error}")
+        elif not AUTOSAVE_FAILING:
+            AUTOSAVE_FAILING = True
+            messagebox.showerror("Error", f"Could not save, retrying in the background: {error}")
+    if not pending:
+        AUTOSAVE_FAILING = False
+    if AUTOSAVE_FAILING:
+        save_indicator.config(text=f"{pending} unsaved, retrying", fg="red")
+    elif pending:
+        save_indicator.config(text=f"Saving {pending}...", fg="gray30")
+    else:
+        save_indicator.config(text="All saved", fg="gray30")
+    root.after(250, poll_autosave)
 
 
 def zoom_in():
-    global zoom_level, spectrogram_start, spectrogram_end, AXES1, canvas
-    if zoom_level > 0.1:  # Prevent zooming in too much
+    global zoom_level, spectrogram_start, spectrogram_end
+    # Prevent zooming in too much; long files can be zoomed down to a few seconds
+    if zoom_level > 0.1 or spectrogram_end - spectrogram_start > 4:
         zoom_level /= 2  # Decrease the window size by half
 
         # Center the zoom on the middle of the current view
@@ -793,11 +1188,10 @@ def zoom_in():
         spectrogram_start = mid_point - (range_view / 2)
         spectrogram_end = mid_point + (range_view / 2)
 
-        AXES1.set_xlim(spectrogram_start, spectrogram_end)
-        canvas.draw_idle()
+        set_viewport(spectrogram_start, spectrogram_end)
 
 def zoom_out():
-    global zoom_level, spectrogram_start, spectrogram_end, AXES1, canvas, total_audio_length
+    global zoom_level, spectrogram_start, spectrogram_end, total_audio_length
     if zoom_level < 1:  # Prevent zooming out beyond the original size
         zoom_level = min(zoom_level * 2, 1.0)  # Double the zoom level but do not exceed 1.0
         window_size = total_audio_length * zoom_level  # Calculate the size of the window based on zoom level
@@ -808,24 +1202,372 @@ def zoom_out():
         spectrogram_end = min(middle_of_viewport + window_size / 2, total_audio_length)
 
         # Update the view
-        AXES1.set_xlim(spectrogram_start, spectrogram_end)
-        canvas.draw_idle()
+        set_viewport(spectrogram_start, spectrogram_end)
 
 
-zoom_in_button = tk.Button(mainframe, text="Zoom In", command=zoom_in)
-zoom_out_button = tk.Button(mainframe, text="Zoom Out", command=zoom_out)
-zoom_in_button.grid(row=9, column=0, padx=5, pady=5)
-zoom_out_button.grid(row=9, column=1, padx=5, pady=5)
+def load_config(path="config_app.json"):
+    """
+    Reads the configuration file and creates the objects that only need the standard library.
 
-# Buttons for shifting the view
-shift_left_button = tk.Button(mainframe, text="<< Shift Left", command=lambda: shift_view('left'))
-shift_right_button = tk.Button(mainframe, text="Shift Right >>", command=lambda: shift_view('right'))
-shift_left_button.grid(row=3, column=0, padx=5, pady=5)
-shift_right_button.grid(row=3, column=5, padx=5, pady=5)
+    Parameters:
+    - path (str): Path to the JSON configuration file.
+    """
+    global datajson_obj, BUTTONS_HEIGHT, BUTTONS_WIDTH, CURRENT_CSV_FILENAME, TRANSCRIPTION_JOURNAL
+    global TRANSCRIPTIONS, CORPUS_PARAMS, CORPUS_MANIFEST_DIRECTORY, CACHE_PARAMS, LONG_RECORDING_PARAMS
+    global LONG_RECORDING_SECONDS, VIEWPORT_PARAMS, NAVIGATION_PARAMS, PREFETCH_PARAMS, PLAYBACK_PARAMS
+    global DISPLAY_PARAMS
+    global CURSOR_INTERVAL_MS, OVERVIEW_PARAMS, METRICS_PARAMS, METRICS, METRICS_OPERATIONS
+    global SERVER_PARAMS, WORK_CLIENT, LEASES, AUTOSAVE_PARAMS, AUTOSAVER, SEARCH_INDEX
+    with open(path, "r") as jsonfile_obj:
+        data_json = jsonfile_obj.read()
+    datajson_obj = json.loads(data_json)
+
+    BUTTONS_HEIGHT = datajson_obj["ButtonsParams"]["Height"]
+    BUTTONS_WIDTH = datajson_obj["ButtonsParams"]["Width"]
+    CURRENT_CSV_FILENAME = datajson_obj["TranscriptionFile"]["TranscriptionFile"]
+    TRANSCRIPTION_JOURNAL = TranscriptionJournal(
+        CURRENT_CSV_FILENAME,
+        compact_every=int(datajson_obj["TranscriptionFile"].get("JournalCompactEvery", 1000)),
+    )
+    TRANSCRIPTIONS = TranscriptionStore(TRANSCRIPTION_JOURNAL)
+    # With a work server, files are leased from it and the transcriptions are saved there
+    SERVER_PARAMS = datajson_obj.get("Server", {})
+    annotator = SERVER_PARAMS.get("Annotator") or f"{getpass.getuser()}@{socket.gethostname()}"
+    if SERVER_PARAMS.get("Url"):
+        WORK_CLIENT = WorkClient(SERVER_PARAMS["Url"], annotator, SERVER_PARAMS.get("CorpusRoot", ""))
+        TRANSCRIPTIONS = RemoteTranscriptionStore(WORK_CLIENT)
+        LEASES = BackgroundLeases(WORK_CLIENT)
+    else:
+        # Searching needs every transcription, which only the work server has in server mode
+        SEARCH_INDEX = TranscriptionIndex()
+    CORPUS_PARAMS = datajson_obj.get("Corpus", {})
+    CORPUS_MANIFEST_DIRECTORY = CORPUS_PARAMS.get("ManifestDirectory", ".corpus_manifests")
+    CACHE_PARAMS = datajson_obj.get("SpectrogramCache", {})
+    # Recordings at least this long are displayed from spectrogram tiles of the visible range
+    LONG_RECORDING_PARAMS = datajson_obj.get("LongRecordings", {})
+    LONG_RECORDING_SECONDS = float(LONG_RECORDING_PARAMS.get("MinSeconds", 600))
+    VIEWPORT_PARAMS = datajson_obj.get("Viewport", {})
+    NAVIGATION_PARAMS = datajson_obj.get("Navigation", {})
+    DISPLAY_PARAMS = datajson_obj.get("Display", {})
+    PREFETCH_PARAMS = datajson_obj.get("Prefetch", {})
+    PLAYBACK_PARAMS = datajson_obj.get("Playback", {})
+    # Refresh rate of the playback cursor; lower it on slow machines
+    CURSOR_INTERVAL_MS = int(1000 / datajson_obj.get("PlaybackCursor", {}).get("FramesPerSecond", 20))
+    OVERVIEW_PARAMS = datajson_obj.get("Overview", {})
+    # Latency histograms of the hot paths, exported periodically and optionally shown in the window
+    METRICS_PARAMS = datajson_obj.get("Metrics", {})
+    METRICS = Metrics(
+        enabled=bool(METRICS_PARAMS.get("Enabled", True)),
+        window=int(METRICS_PARAMS.get("Window", 1024)),
+    )
+    METRICS_OPERATIONS = [
+        "plot_wav_file", "navigate", "save_annotations", "autosave_write", "play_audio_from_position",
+        "update_line",
+    ]
+
+    # Saves are written by a background thread; the work client gets its own connection there
+    AUTOSAVE_PARAMS = datajson_obj.get("Autosave", {})
+    if WORK_CLIENT is not None:
+        write = WorkClient(SERVER_PARAMS["Url"], annotator, SERVER_PARAMS.get("CorpusRoot", "")).write
+    else:
+        write = TRANSCRIPTION_JOURNAL.append_many
+
+    def write_transcriptions(entries):
+        with METRICS.timer("autosave_write"):
+            write(entries)
+
+    AUTOSAVER = WriteBehindWriter(
+        write_transcriptions,
+        flush_seconds=float(AUTOSAVE_PARAMS.get("FlushSeconds", 1)),
+        max_pending=int(AUTOSAVE_PARAMS.get("MaxPending", 1000)),
+    )
+
+
+def load_core():
+    """
+    Imports numpy, scipy, matplotlib (unless 'Display.Renderer' is 'photo') and the audio
+    backends, and creates the objects using them.
+
+    Runs in a background thread started right after the window is shown, so these imports
+    overlap with the user picking a folder instead of delaying the window.
+    """
+    global AUDIO_CACHE, SpectrogramView, OverviewStrip, MetadataIndex, SPECTROGRAM_LOADER
+    global SPECTROGRAM_CACHE, PEAK_CACHE, PREFETCHER, PLAYBACK_ENGINE, SEGMENTER, CORE_ERROR
+    try:
+        from transcription_tool.audio_cache import DecodedAudioCache
+        from transcription_tool.metadata_index import MetadataIndex
+        from transcription_tool.overview_strip import OverviewStrip
+        from transcription_tool.peaks import PeakCache
+        from transcription_tool.playback import PlaybackEngine
+        from transcription_tool.prefetch import Prefetcher
+        from transcription_tool.segments import Segmenter
+        from transcription_tool.spectrogram_cache import SpectrogramCache
+        from transcription_tool.spectrogram_loader import SpectrogramLoader
+        if DISPLAY_PARAMS.get("Renderer", "matplotlib") == "photo":
+            # Draws the matrix straight into a Tk image; matplotlib is never imported
+            from transcription_tool.photo_view import PhotoSpectrogramView as SpectrogramView
+        else:
+            from transcription_tool.spectrogram_view import SpectrogramView
+
+        AUDIO_CACHE = DecodedAudioCache(
+            int(datajson_obj.get("Audio", {}).get("DecodedCacheMegabytes", 512)) * 1024 * 1024
+        )
+        segment_params = datajson_obj.get("Segments", {})
+        if segment_params.get("Mode", "off") != "off":
+            seconds = float(segment_params.get("Seconds", 30))
+            SEGMENTER = Segmenter(
+                segment_params["Mode"],
+                seconds,
+                min_seconds=float(segment_params.get("MinSeconds", seconds / 2)),
+                max_seconds=float(segment_params.get("MaxSeconds", seconds * 1.5)),
+                cache_directory=segment_params.get("CacheDirectory", ".segment_cache"),
+                audio_cache=AUDIO_CACHE,
+            )
+        SPECTROGRAM_CACHE = SpectrogramCache(
+            CACHE_PARAMS.get("Directory", ".spectrogram_cache"),
+            int(CACHE_PARAMS.get("MaxMegabytes", 2048)) * 1024 * 1024,
+        )
+        if OVERVIEW_PARAMS.get("Enabled", True):
+            PEAK_CACHE = PeakCache(OVERVIEW_PARAMS.get("Directory", ".peak_cache"))
+        SPECTROGRAM_LOADER = SpectrogramLoader(
+            SPECTROGRAM_CACHE,
+            AUDIO_CACHE,
+            LONG_RECORDING_SECONDS,
+            peak_cache=PEAK_CACHE,
+            tile_columns=int(LONG_RECORDING_PARAMS.get("TileColumns", 512)),
+            max_tiles=int(LONG_RECORDING_PARAMS.get("MaxTiles", 64)),
+            min_hop=int(VIEWPORT_PARAMS.get("MinHop", 64)),
+            max_pool=int(LONG_RECORDING_PARAMS.get("MaxPool", 32)),
+        )
+        PREFETCHER = Prefetcher(
+            SPECTROGRAM_CACHE,
+            depth=int(PREFETCH_PARAMS.get("Depth", 3)),
+            workers=int(PREFETCH_PARAMS.get("Workers", 2)),
+            max_seconds=LONG_RECORDING_SECONDS,
+            audio_cache=AUDIO_CACHE,
+            peak_cache=PEAK_CACHE,
+        )
+        PLAYBACK_ENGINE = PlaybackEngine(
+            block_frames=int(PLAYBACK_PARAMS.get("BlockFrames", 2048)),
+            backend=PLAYBACK_PARAMS.get("Backend", "auto"),
+            audio_cache=AUDIO_CACHE,
+        )
+    except Exception as e:
+        CORE_ERROR = e
+
+
+def wait_for_core():
+    """
+    Waits until 'load_core' has finished; instant once it has.
+
+    Raises:
+    - Exception: The error that prevented the modules from loading, if any.
+    """
+    CORE_LOADER.join()
+    if CORE_ERROR is not None:
+        raise CORE_ERROR
+
+
+def build_gui():
+    """
+    Creates the main window and all its widgets.
+    """
+    global root, mainframe, ANNOTATION_ENTRY_VAR, annotation_text, metrics_overlay, save_indicator
+    global VIEWPORT_RENDERER, RENDER_SCHEDULER
+    # Initaliazing Tkinter  Window#
+    root = tk.Tk()
+    root.title("Speech Transcription Tool")
+
+    # Create the main frame and have it fill the whole root window using grid
+    mainframe = tk.Frame(root, bg=WIDGET_BG_COLOR)
+    mainframe.grid(row=0, column=0, sticky="nsew")
+    mainframe.grid_rowconfigure(2, weight=1)  # the spectrogram takes the room the window gains
+    mainframe.grid_columnconfigure(tuple(range(6)), weight=1)
+    root.grid_rowconfigure(0, weight=1)
+    root.grid_columnconfigure(0, weight=1)
+    ANNOTATION_ENTRY_VAR = tk.StringVar(mainframe)
+
+    VIEWPORT_RENDERER = ViewportRenderer(
+        root,
+        lambda spectrogram: on_viewport_ready(spectrogram),
+        debounce_ms=int(VIEWPORT_PARAMS.get("DebounceMs", 120)),
+        max_windows=int(VIEWPORT_PARAMS.get("CachedWindows", 16)),
+    )
+    # Next and Previous load files in the background; bursts of presses load only the last file
+    RENDER_SCHEDULER = RenderScheduler(
+        root,
+        prepare_navigation,
+        load_navigation,
+        show_navigation,
+        on_settled=settle_navigation,
+        on_error=navigation_error,
+        settle_ms=int(NAVIGATION_PARAMS.get("SettleMs", 150)),
+        on_progress=show_navigation_overview,
+    )
+
+    # Header and Title#
+    header_name = tk.Label(
+        mainframe,
+        text="Speech Transcription Tool",
+        font=("Arial", 16, "bold"),
+        bg=WIDGET_BG_COLOR,
+    )
+    header_name.grid(row=0, column=1, columnspan=4, pady=(10, 5))
+
+
+    # Rows
+
+    audio_files_folder = tk.Button(
+        mainframe,
+        text="Audio Files Folder" if WORK_CLIENT is None else "Get Assignments",
+        bg=BUTTON_COLOR,
+        fg="white",
+        font=BUTTON_FONT,
+        command=browse_wav_files,
+    )
+    audio_files_folder.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+    if SEARCH_INDEX is not None:
+        search_button = tk.Button(
+            mainframe, text="Search", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT, command=open_search
+        )
+        search_button.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+    quit_option = tk.Button(
+        mainframe, text="Quit", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT, command=_quit
+    )
+    quit_option.grid(row=1, column=5, padx=5, pady=5, sticky="e")
+    # Number of transcriptions not written to disk (or the work server) yet
+    save_indicator = tk.Label(mainframe, text="All saved", font=("Helvetica", 9), fg="gray30", bg=WIDGET_BG_COLOR)
+    save_indicator.grid(row=1, column=4, padx=5, pady=5)
+
+    next_button = tk.Button(
+        mainframe,
+        text=" Next >> ",
+        fg="green",
+        bd=3,
+        relief="raised",
+        command=next_audio_update_index,
+        height=BUTTONS_HEIGHT,
+        width=BUTTONS_WIDTH,
+    )
+    next_button.grid(row=4, column=6, padx=5, pady=5)
+    prev_button = tk.Button(
+        mainframe,
+        text=" << Previous ",
+        fg="green",
+        bd=3,
+        relief="raised",
+        command=previous_audio_update_index,
+        height=BUTTONS_HEIGHT,
+        width=BUTTONS_WIDTH,
+    )
+    prev_button.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
+    # Text
+    ###############################################################
+    tk.Label(mainframe, text="Transcription:", font=LABEL_FONT, bg=WIDGET_BG_COLOR).grid(
+        row=6, column=0, sticky="w"
+    )
+    annotation_text = tk.Entry(
+        mainframe, textvariable=ANNOTATION_ENTRY_VAR, font=ENTRY_FONT, relief="sunken"
+    )
+    annotation_text.grid(row=7, column=0, columnspan=6, padx=5, pady=5, sticky="ew")
+
+
+    # Play, Stop, & Submit buttons
 
-# Bind key action for submit
-root.bind("<Return>", save_and_next_audio)
-load_annotations()
+    play_button = tk.Button(
+        mainframe,
+        text="Play Audio",
+        bg=BUTTON_COLOR,
+        fg="white",
+        font=BUTTON_FONT,
+        command=lambda: play_audio(CURRENT_INDEX),
+    )
+    play_button.grid(row=8, column=2, padx=5, pady=5, sticky="ew")
+
+    stop_button = tk.Button(
+        mainframe,
+        text="Stop Audio",
+        bg=BUTTON_COLOR,
+        fg="white",
+        font=BUTTON_FONT,
+        command=stop_audio,
+    )
+    stop_button.grid(row=8, column=3, padx=5, pady=5, sticky="ew")
+
+    submit_button = tk.Button(
+        mainframe,
+        text="Submit to Save",
+        bg=BUTTON_COLOR,
+        fg="white",
+        font=BUTTON_FONT,
+        command=lambda: save_annotations(CURRENT_INDEX),
+    )
+    submit_button.grid(row=8, column=4, padx=5, pady=5, sticky="ew")
+
+    # Tags to be included with Start and End
+    tags = TAGS
+
+    # Placement variables
+    column_for_start_tags = 7
+    column_for_end_tags = 8
+    starting_row = 3
+
+    # Creating the Start and End tag buttons in two columns
+    for idx, tag in enumerate(tags):
+        # Start Tag Button in one column
+        tk.Button(mainframe, text=f"[{tag}_Start]", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT,
+                  command=lambda t=f"[{tag}_Start] ": insert_tag(t)).grid(row=starting_row + idx, column=column_for_start_tags, padx=5, pady=5, sticky="ew")
+
+        # End Tag Button in the next column
+        tk.Button(mainframe, text=f"[{tag}_End]", bg=BUTTON_COLOR, fg="white", font=BUTTON_FONT,
+                  command=lambda t=f"[{tag}_End] ": insert_tag(t)).grid(row=starting_row + idx, column=column_for_end_tags, padx=5, pady=5, sticky="ew")
+
+    zoom_in_button = tk.Button(mainframe, text="Zoom In", command=zoom_in)
+    zoom_out_button = tk.Button(mainframe, text="Zoom Out", command=zoom_out)
+    zoom_in_button.grid(row=9, column=0, padx=5, pady=5)
+    zoom_out_button.grid(row=9, column=1, padx=5, pady=5)
 
-# Main Loop
-root.mainloop()
+    # Buttons for shifting the view
+    shift_left_button = tk.Button(mainframe, text="<< Shift Left", command=lambda: shift_view('left'))
+    shift_right_button = tk.Button(mainframe, text="Shift Right >>", command=lambda: shift_view('right'))
+    shift_left_button.grid(row=3, column=0, padx=5, pady=5)
+    shift_right_button.grid(row=3, column=5, padx=5, pady=5)
+
+    # Optional latency overlay
+    if METRICS.enabled and METRICS_PARAMS.get("Overlay", False):
+        metrics_overlay = tk.Label(mainframe, text="", font=("Helvetica", 9), fg="gray30", bg=WIDGET_BG_COLOR)
+        metrics_overlay.grid(row=10, column=0, columnspan=9, padx=5, pady=(0, 5), sticky="w")
+
+    # Bind key action for submit
+    root.bind("<Return>", save_and_next_audio)
+
+
+def main():
+    """
+    Starts the Speech Transcription Tool.
+
+    The window is shown first; the numerical and plotting modules are imported in the background
+    meanwhile, and the transcriptions are loaded once the window is up.
+    """
+    global CORE_LOADER
+    load_config()
+    build_gui()
+    CORE_LOADER = threading.Thread(target=load_core, name="load-core", daemon=True)
+    CORE_LOADER.start()
+    root.after_idle(load_annotations)
+    root.after(250, poll_autosave)
+    if WORK_CLIENT is not None:
+        root.after(250, poll_leases)
+        root.after(int(float(SERVER_PARAMS.get("LeaseSeconds", 900)) * 1000 / 3), renew_assignments)
+    if metrics_overlay is not None:
+        update_metrics_overlay()
+    if METRICS.enabled and (METRICS_PARAMS.get("JsonlFile") or METRICS_PARAMS.get("PrometheusFile")):
+        root.after(int(float(METRICS_PARAMS.get("ExportSeconds", 60)) * 1000), schedule_metrics_export)
+
+    # Main Loop
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from transcription_tool import audio_cache
+from transcription_tool.audio_cache import DecodedAudioCache
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Replaces the decoder by a slow fake and records the paths it decodes."""
+    calls = []
+
+    def read_audio(path, mmap=False):
+        calls.append(path)
+        time.sleep(0.05)
+        if path.startswith("corrupt"):
+            raise ValueError("not an audio file")
+        return 16000, np.zeros(1000, dtype=np.int16)
+
+    monkeypatch.setattr(audio_cache, "read_audio", read_audio)
+    monkeypatch.setattr(DecodedAudioCache, "_key", staticmethod(lambda path: (path, 0, 0)))
+    return calls
+
+
+@pytest.mark.parametrize("max_bytes", [10 ** 6, 10])  # kept, and too large to be kept
+def test_concurrent_reads_decode_once(decodes, max_bytes):
+    cache = DecodedAudioCache(max_bytes)
+    threads = [threading.Thread(target=cache.read, args=("a.flac",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert decodes == ["a.flac"]
+    assert (cache.hits, cache.misses) == (7, 1)
+    cache.read("a.flac")
+    assert len(decodes) == (1 if max_bytes > 2000 else 2)
+
+
+def test_failed_decodes_are_tried_again(decodes):
+    cache = DecodedAudioCache(10 ** 6)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.read("corrupt.flac")
+    assert decodes == ["corrupt.flac"] * 2
@@ -0,0 +1,91 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from transcription_tool.autosave import WriteBehindWriter
+
+
+class Recorder:
+    """Stands in for 'TranscriptionJournal.append_many', failing on demand."""
+
+    def __init__(self, failures=()):
+        self.batches = []
+        self.failures = list(failures)
+        self.lock = threading.Lock()
+
+    def __call__(self, entries):
+        with self.lock:
+            if self.failures:
+                raise self.failures.pop(0)
+            self.batches.append(entries)
+
+
+def test_saves_of_the_same_file_are_written_once_with_the_latest_text():
+    write = Recorder()
+    writer = WriteBehindWriter(write, flush_seconds=60)
+    writer.submit([("/a.wav", "first")])
+    writer.submit([("/b.wav", "other"), ("/a.wav", "second")])
+    assert writer.pending() == 2
+    assert writer.flush(timeout=5)
+    assert write.batches == [[("/a.wav", "second"), ("/b.wav", "other")]]
+    assert writer.pending() == 0
+    assert writer.close(timeout=5)
+
+
+def test_batches_are_written_after_flush_seconds_without_flush():
+    write = Recorder()
+    writer = WriteBehindWriter(write, flush_seconds=0.05)
+    writer.submit([("/a.wav", "text")])
+    writer.close(timeout=5)
+    assert write.batches == [[("/a.wav", "text")]]
+
+
+def test_failed_writes_are_reported_and_retried_with_newer_saves_winning():
+    write = Recorder([OSError("disk full")])
+    writer = WriteBehindWriter(write, flush_seconds=0.05)
+    writer.submit([("/a.wav", "old"), ("/b.wav", "kept")])
+    assert not writer.flush(timeout=0.01)  # the first attempt fails, then backs off
+    deadline = time.monotonic() + 5
+    errors = []
+    while not errors and time.monotonic() < deadline:
+        errors = writer.poll_errors()
+    assert [str(error) for error in errors] == ["disk full"]
+    writer.submit([("/a.wav", "new")])
+    assert writer.flush(timeout=5)
+    assert len(write.batches) == 1
+    assert sorted(write.batches[0]) == [("/a.wav", "new"), ("/b.wav", "kept")]
+    assert writer.poll_errors() == []
+    writer.close(timeout=5)
+
+
+def test_other_errors_drop_the_batch():
+    write = Recorder([ValueError("bad row")])
+    writer = WriteBehindWriter(write, flush_seconds=0.01)
+    writer.submit([("/a.wav", "text")])
+    assert writer.flush(timeout=5)
+    assert write.batches == []
+    assert [type(error) for error in writer.poll_errors()] == [ValueError]
+    writer.close(timeout=5)
+
+
+def test_submit_refuses_more_than_max_pending_files():
+    writer = WriteBehindWriter(Recorder(), flush_seconds=60, max_pending=2)
+    writer.submit([("/a.wav", "1"), ("/b.wav", "2")])
+    assert writer.room() == 0
+    writer.submit([("/a.wav", "again")])  # coalesced: takes no room
+    with pytest.raises(queue.Full):
+        writer.submit([("/c.wav", "3")])
+    assert writer.pending() == 2
+    writer.close(timeout=5)
+
+
+def test_close_waits_at_most_timeout_in_all_on_a_stuck_write():
+    stuck = threading.Event()
+    writer = WriteBehindWriter(lambda entries: stuck.wait(10), flush_seconds=0)
+    writer.submit([("/a.wav", "text")])
+    started = time.monotonic()
+    assert not writer.close(timeout=0.3)
+    assert time.monotonic() - started < 0.5
+    stuck.set()
@@ -0,0 +1,84 @@
+import os
+
+from transcription_tool.corpus import CorpusScanner, insert_sorted
+
+EXTENSIONS = (".wav",)
+
+
+def make_corpus(root):
+    for relative in ["b/2.wav", "b/1.WAV", "a.wav", "a/c/3.wav", "a/notes.txt", "a-b/4.wav", "empty/"]:
+        path = os.path.join(root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not relative.endswith("/"):
+            with open(path, "wb") as audio_file:
+                audio_file.write(b"RIFF")
+
+
+def scan(root, manifests, extensions=EXTENSIONS):
+    scanner = CorpusScanner(root, manifests, extensions)
+    return scanner, [corpus_file.path for corpus_file in scanner.scan()]
+
+
+def test_files_come_in_the_order_of_a_sort_of_their_paths(tmp_path):
+    root = str(tmp_path / "corpus")
+    make_corpus(root)
+    _, paths = scan(root, None)
+    assert paths == sorted(paths)
+    assert [os.path.relpath(path, root) for path in paths] == [
+        os.path.normpath(relative) for relative in ["a-b/4.wav", "a.wav", "a/c/3.wav", "b/1.WAV", "b/2.wav"]
+    ]
+
+
+def test_unchanged_folders_are_taken_from_the_manifest(tmp_path):
+    root, manifests = str(tmp_path / "corpus"), str(tmp_path / "manifests")
+    make_corpus(root)
+    scanner, first = scan(root, manifests)
+    assert os.path.exists(scanner.manifest_path())
+    assert (scanner.listed_folders, scanner.reused_folders) == (6, 0)
+
+    scanner, second = scan(root, manifests)
+    assert second == first
+    assert (scanner.listed_folders, scanner.reused_folders) == (0, 6)
+
+
+def test_changed_folders_are_listed_again(tmp_path):
+    root, manifests = str(tmp_path / "corpus"), str(tmp_path / "manifests")
+    make_corpus(root)
+    scan(root, manifests)
+    folder = os.path.join(root, "b")
+    with open(os.path.join(folder, "3.wav"), "wb") as audio_file:
+        audio_file.write(b"RIFF")
+    mtime_ns = os.stat(folder).st_mtime_ns + 1_000_000_000  # coarse clocks: make the change visible
+    os.utime(folder, ns=(mtime_ns, mtime_ns))
+
+    scanner, paths = scan(root, manifests)
+    assert os.path.join(folder, "3.wav") in paths
+    assert (scanner.listed_folders, scanner.reused_folders) == (1, 5)
+
+
+def test_manifest_of_other_extensions_is_ignored(tmp_path):
+    root, manifests = str(tmp_path / "corpus"), str(tmp_path / "manifests")
+    make_corpus(root)
+    scan(root, manifests)
+    scanner, paths = scan(root, manifests, (".wav", ".txt"))
+    assert os.path.join(root, "a", "notes.txt") in paths
+    assert scanner.reused_folders == 0
+
+
+def test_stopped_scan_leaves_the_manifest_alone(tmp_path):
+    root, manifests = str(tmp_path / "corpus"), str(tmp_path / "manifests")
+    make_corpus(root)
+    scanner = CorpusScanner(root, manifests, EXTENSIONS)
+    files = scanner.scan()
+    next(files)
+    scanner.stop()
+    assert list(files) == []
+    assert not os.path.exists(scanner.manifest_path())
+
+
+def test_insert_sorted_merges_after_lo_and_keeps_existing_order():
+    files = ["shown", "b2", "c3", "e5"]
+    insert_sorted(files, ["d4", "a1", "f6", "c3x"], key=lambda f: (int(f[1]), f), lo=1)
+    assert files == ["shown", "a1", "b2", "c3", "c3x", "d4", "e5", "f6"]
+    insert_sorted(files, [], key=lambda f: f, lo=1)
+    assert len(files) == 8
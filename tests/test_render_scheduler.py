@@ -0,0 +1,55 @@
+import threading
+import time
+
+from transcription_tool.render_scheduler import RenderScheduler
+
+
+class FakeRoot:
+    """Runs the 'after' callbacks when 'run' is called instead of from a Tk event loop."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after(self, ms, callback, *args):
+        self.next_id += 1
+        self.jobs[self.next_id] = (callback, args)
+        return self.next_id
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run(self, seconds=5):
+        deadline = time.monotonic() + seconds
+        while self.jobs and time.monotonic() < deadline:
+            job = min(self.jobs)
+            callback, args = self.jobs.pop(job)
+            callback(*args)
+            time.sleep(0.001)
+
+
+def test_progress_is_shown_before_the_result_and_dropped_when_stale():
+    root = FakeRoot()
+    release = threading.Event()
+    events = []
+
+    def load(target, report):
+        report(f"{target} peaks")
+        if target == "a":
+            release.wait(5)
+        return f"{target} spectrogram"
+
+    scheduler = RenderScheduler(
+        root, lambda target: target, load, lambda target, result: events.append(("show", result)),
+        on_progress=lambda target, value: events.append(("progress", value)), settle_ms=0,
+    )
+    scheduler.request("a")
+    deadline = time.monotonic() + 5
+    while not events and time.monotonic() < deadline:
+        root.run(0.01)
+    assert events == [("progress", "a peaks")]
+    scheduler.request("b")  # 'a' is still loading: its result is stale
+    release.set()
+    root.run()
+    assert events == [("progress", "a peaks"), ("progress", "b peaks"), ("show", "b spectrogram")]
+    scheduler.shutdown()
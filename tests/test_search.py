@@ -0,0 +1,63 @@
+import pytest
+
+from transcription_tool.search import TranscriptionIndex, parse_query, query_words, tokenize
+
+
+def test_tokenize_keeps_tags_whole():
+    assert tokenize("Hello [HESITATION_Start] um [HESITATION_End] don't") == [
+        "hello", "[hesitation_start]", "um", "[hesitation_end]", "don't",
+    ]
+
+
+def test_parse_query_precedence():
+    assert parse_query("a b OR c") == ("or", [("and", [("terms", ["a"]), ("terms", ["b"])]), ("terms", ["c"])])
+    assert parse_query("a AND (b OR c)") == (
+        "and", [("terms", ["a"]), ("or", [("terms", ["b"]), ("terms", ["c"])])]
+    )
+
+
+def test_parse_query_negation_phrases_and_tags():
+    assert parse_query("-noise") == ("not", ("terms", ["noise"]))
+    assert parse_query("NOT NOT a") == ("not", ("not", ("terms", ["a"])))
+    assert parse_query('"Thank  you"') == ("terms", ["thank", "you"])
+    assert parse_query("tag:UNK_SPK") == ("terms", ["[unk_spk_start]"])
+
+
+@pytest.mark.parametrize("query", ["", "a OR", "(a b", "a )", "AND", '"!!"'])
+def test_parse_query_rejects_malformed_queries(query):
+    with pytest.raises(ValueError):
+        parse_query(query)
+
+
+def test_query_words_skip_the_options_and_keep_the_order():
+    assert query_words(["--config", "c.json", "-noise", "OR", "hello"]) == ["-noise", "OR", "hello"]
+    assert query_words(["-noise", "--config=c.json", "world"]) == ["-noise", "world"]
+    assert query_words(["--", "-hello", "--config", "x"]) == ["-hello", "--config", "x"]
+
+
+def test_search_answers_words_phrases_tags_and_negations():
+    index = TranscriptionIndex()
+    index.build([
+        ("/a.wav", "thank you very much"),
+        ("/b.wav", "you thank [UNK_SPK_Start] him [UNK_SPK_End]"),
+        ("/c.wav", "noise"),
+        ("/d.wav", ""),
+    ])
+    assert index.ready()
+    assert len(index) == 3
+    assert index.search("thank") == ["/a.wav", "/b.wav"]
+    assert index.search('"thank you"') == ["/a.wav"]
+    assert index.search("tag:unk_spk") == ["/b.wav"]
+    assert index.search("-noise") == ["/a.wav", "/b.wav"]
+    assert index.search("noise OR much") == ["/a.wav", "/c.wav"]
+
+
+def test_update_replaces_the_previous_transcription():
+    index = TranscriptionIndex()
+    index.update("/a.wav", "hello")
+    index.build([("/a.wav", "stale"), ("/b.wav", "hello")])
+    assert index.search("hello") == ["/a.wav", "/b.wav"]
+    assert index.search("stale") == []
+    index.update("/a.wav", "")
+    assert index.search("hello") == ["/b.wav"]
+    assert len(index) == 1
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from transcription_tool.segments import (
+    Segmenter,
+    fixed_boundaries,
+    parse_segment_key,
+    segment_key,
+    silence_boundaries,
+    slice_segment,
+)
+
+SAMPLE_RATE = 8000
+
+
+def test_segment_keys_round_trip():
+    key = segment_key("/corpus/talk.wav", 30.5104, 61.7)
+    assert key == "/corpus/talk.wav#t=30.510,61.700"
+    assert parse_segment_key(key) == ("/corpus/talk.wav", 30.51, 61.7)
+
+
+@pytest.mark.parametrize("path", ["/corpus/talk.wav", "/corpus/odd#t=name.wav", "/corpus/a#t=1,x.wav"])
+def test_plain_paths_are_not_segments(path):
+    assert parse_segment_key(path) == (path, None, None)
+
+
+def test_slice_segment_is_a_view():
+    samples = np.arange(10 * SAMPLE_RATE)
+    part = slice_segment(SAMPLE_RATE, samples, 1.0, 2.5)
+    assert len(part) == int(1.5 * SAMPLE_RATE) and part[0] == SAMPLE_RATE
+    assert np.shares_memory(part, samples)
+
+
+def test_fixed_boundaries_merge_a_short_last_piece():
+    assert fixed_boundaries(70, 30, 15) == [(0.0, 30.0), (30.0, 70.0)]
+    assert fixed_boundaries(80, 30, 15) == [(0.0, 30.0), (30.0, 60.0), (60.0, 80.0)]
+    assert fixed_boundaries(10, 30, 15) == [(0.0, 10.0)]
+
+
+def test_silence_boundaries_cut_in_the_pauses():
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 3000, 60 * SAMPLE_RATE)
+    for pause in (22, 47):  # quiet half seconds
+        samples[int(pause * SAMPLE_RATE):int((pause + 0.5) * SAMPLE_RATE)] *= 0.001
+    boundaries = silence_boundaries(samples, SAMPLE_RATE, seconds=25, min_seconds=15, max_seconds=30)
+    cuts = [end for _, end in boundaries[:-1]]
+    assert len(cuts) == 2
+    assert 22 <= cuts[0] <= 22.5 and 47 <= cuts[1] <= 47.5
+    assert boundaries[-1][1] == pytest.approx(60)
+
+
+def write_wav(path, seconds):
+    wavfile.write(str(path), SAMPLE_RATE, np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16))
+    return str(path)
+
+
+def test_segmenter_splits_long_files_only(tmp_path):
+    segmenter = Segmenter("fixed", 30, min_seconds=15, max_seconds=45)
+    short = write_wav(tmp_path / "short.wav", 40)
+    long = write_wav(tmp_path / "long.wav", 100)
+    assert segmenter.split(short) == [short]
+    keys = segmenter.split(long)
+    assert keys == [segment_key(long, 0, 30), segment_key(long, 30, 60), segment_key(long, 60, 100)]
+    assert all(parse_segment_key(key)[0] == long for key in keys)
+
+
+def test_segmenter_keeps_unreadable_files_whole(tmp_path):
+    broken = tmp_path / "broken.wav"
+    broken.write_bytes(b"not a wav file")
+    assert Segmenter("fixed", 30).split(str(broken)) == [str(broken)]
+    with pytest.raises(ValueError):
+        Segmenter("chunks", 30)
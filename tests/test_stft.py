@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from matplotlib import mlab
+
+from transcription_tool.spectrogram import compute_spectrogram, spectrogram_columns
+from transcription_tool import stft as stft_module
+from transcription_tool.stft import stft
+
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture(scope="module")
+def signal():
+    rng = np.random.default_rng(0)
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 440 * t) * 8000 + rng.normal(0, 500, len(t))).astype(np.int16)
+
+
+@pytest.mark.parametrize("NFFT, noverlap", [(256, 128), (1024, 768), (4096, 3072)])
+def test_psd_matches_mlab_specgram(signal, NFFT, noverlap):
+    expected, freqs, times = mlab.specgram(signal, NFFT=NFFT, Fs=SAMPLE_RATE, noverlap=noverlap, mode="psd")
+    data, our_freqs, our_times = stft(signal, SAMPLE_RATE, NFFT, noverlap, "psd")
+    assert data.dtype == np.float32
+    np.testing.assert_allclose(our_freqs, freqs)
+    np.testing.assert_allclose(our_times, times)
+    # Axes.specgram displays 10 * log10 of the PSD; float32 rounding shows in the deepest bins only
+    np.testing.assert_allclose(data, 10 * np.log10(expected), atol=1e-2)
+
+
+def test_magnitude_matches_mlab_specgram(signal):
+    expected, _, _ = mlab.specgram(signal, NFFT=512, Fs=SAMPLE_RATE, noverlap=256, mode="magnitude")
+    data, _, _ = stft(signal, SAMPLE_RATE, 512, 256, "magnitude")
+    np.testing.assert_allclose(data, 20 * np.log10(expected), atol=1e-2)
+
+
+def test_batches_and_sparse_columns_match_the_whole_signal(signal):
+    whole, _, _ = stft(signal, SAMPLE_RATE, 512, 256)
+    batch, _, _ = stft(np.stack([signal, signal[::-1]]), SAMPLE_RATE, 512, 256)
+    np.testing.assert_array_equal(batch[0], whole)
+    np.testing.assert_array_equal(batch[1], stft(signal[::-1], SAMPLE_RATE, 512, 256)[0])
+    columns = spectrogram_columns(signal, SAMPLE_RATE, np.array([0, 2560, 256]), 512, num_rows=40)
+    np.testing.assert_array_equal(columns, whole[:40, [0, 10, 1]])
+
+
+def test_compute_spectrogram_extent_matches_axes_specgram(signal):
+    spectrogram = compute_spectrogram(signal, SAMPLE_RATE, 1024, 768)
+    _, freqs, times = mlab.specgram(signal, NFFT=1024, Fs=SAMPLE_RATE, noverlap=768)
+    pad = (1024 - 768) / SAMPLE_RATE / 2
+    assert spectrogram.extent == pytest.approx((times[0] - pad, times[-1] + pad, freqs[0], freqs[-1]))
+    assert spectrogram.duration == pytest.approx(1.0)
+
+
+def test_signals_shorter_than_a_frame_give_one_column():
+    data, _, times = stft(np.ones(100, dtype=np.int16), SAMPLE_RATE, 256, 128)
+    assert data.shape == (129, 1)
+    assert len(times) == 1
+
+
+def test_batches_are_split_into_blocks_of_frames(signal, monkeypatch):
+    whole, _, _ = stft(signal, SAMPLE_RATE, 512, 256, "magnitude")
+    monkeypatch.setattr(stft_module, "BLOCK_FRAMES", 16)  # 8 frames of each of the 2 signals per rfft
+    batch, _, _ = stft(np.stack([signal, signal]), SAMPLE_RATE, 512, 256, "magnitude")
+    assert batch.shape == (2,) + whole.shape
+    np.testing.assert_array_equal(batch[1], whole)
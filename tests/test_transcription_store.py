@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from transcription_tool.transcription_store import (
+    TranscriptionJournal,
+    TranscriptionStore,
+    read_transcription_csv,
+    write_transcription_csv,
+)
+
+
+def test_csv_round_trip_keeps_pipes_quotes_and_unicode(tmp_path):
+    path = str(tmp_path / "transcriptions.csv")
+    rows = {"/b.wav": 'say "a|b"', "/a.wav": "café", "/c.wav": ""}
+    write_transcription_csv(path, rows)
+    assert read_transcription_csv(path) == rows
+    assert open(path, encoding="utf-8").readline().strip() == "Filename|Transcription"
+
+
+def test_journal_replays_appends_over_the_csv(tmp_path):
+    path = str(tmp_path / "transcriptions.csv")
+    write_transcription_csv(path, {"/a.wav": "old", "/b.wav": "kept"})
+    journal = TranscriptionJournal(path, compact_every=100)
+    journal.append("/a.wav", "new")
+    journal.append_many([("/c.wav", "added"), ("/a.wav", "newest")])
+    assert read_transcription_csv(path) == {"/a.wav": "old", "/b.wav": "kept"}  # CSV not rewritten
+    assert TranscriptionJournal(path).load() == {"/a.wav": "newest", "/b.wav": "kept", "/c.wav": "added"}
+
+
+def test_torn_write_is_discarded_and_truncated(tmp_path):
+    path = str(tmp_path / "transcriptions.csv")
+    journal = TranscriptionJournal(path, compact_every=100)
+    journal.append_many([("/a.wav", "one"), ("/b.wav", "two")])
+    valid_size = (tmp_path / "transcriptions.csv.journal").stat().st_size
+    assert valid_size > 0
+    with open(path + ".journal", "a", encoding="utf-8") as journal_file:
+        journal_file.write(json.dumps({"Filename": "/c.wav", "Transcription": "torn"})[:20])
+
+    assert TranscriptionJournal(path).load() == {"/a.wav": "one", "/b.wav": "two"}
+    assert (tmp_path / "transcriptions.csv.journal").stat().st_size == valid_size
+    # Records appended after the truncation replay normally
+    journal = TranscriptionJournal(path)
+    journal.append("/c.wav", "three")
+    assert TranscriptionJournal(path).load()["/c.wav"] == "three"
+
+
+def test_garbage_line_stops_the_replay(tmp_path):
+    path = str(tmp_path / "transcriptions.csv")
+    with open(path + ".journal", "w", encoding="utf-8") as journal_file:
+        journal_file.write(json.dumps({"Filename": "/a.wav", "Transcription": "one"}) + "\n")
+        journal_file.write("not json\n")
+        journal_file.write(json.dumps({"Filename": "/b.wav", "Transcription": "two"}) + "\n")
+    assert TranscriptionJournal(path).load() == {"/a.wav": "one"}
+
+
+def test_compaction_folds_the_journal_into_the_csv(tmp_path):
+    path = str(tmp_path / "transcriptions.csv")
+    journal = TranscriptionJournal(path, compact_every=3)
+    journal.append_many([("/a.wav", "one"), ("/b.wav", "two")])
+    assert not read_transcription_csv(path)
+    journal.append("/c.wav", "three")  # third record: compacts
+    assert read_transcription_csv(path) == {"/a.wav": "one", "/b.wav": "two", "/c.wav": "three"}
+    assert (tmp_path / "transcriptions.csv.journal").stat().st_size == 0
+    journal.append("/a.wav", "edited")
+    journal.close()
+    assert read_transcription_csv(path)["/a.wav"] == "edited"
+
+
+def test_store_round_trip_through_the_journal(tmp_path):
+    path = str(tmp_path / "transcriptions.csv")
+    write_transcription_csv(path, {"/a.wav": "old"})
+    store = TranscriptionStore(TranscriptionJournal(path))
+    store.load()
+    assert store.get("/a.wav") == "old"
+    assert store.get("/missing.wav") == ""
+    assert store.put("/a.wav", "new")
+    assert store.put("/b.wav", "added")
+    assert not store.put("/b.wav", "added")  # unchanged: nothing to write
+    assert store.dirty_count() == 2
+    store.flush()
+    assert store.dirty_count() == 0
+
+    reloaded = TranscriptionStore(TranscriptionJournal(path))
+    reloaded.load()
+    assert dict(reloaded.items()) == {"/a.wav": "new", "/b.wav": "added"}
+    assert "/b.wav" in reloaded and len(reloaded) == 2
+
+
+def test_failed_flush_keeps_the_entries_dirty(tmp_path):
+    class FailingJournal:
+        def append_many(self, entries):
+            raise OSError("disk full")
+
+    store = TranscriptionStore(FailingJournal())
+    store.put("/a.wav", "text")
+    with pytest.raises(OSError):
+        store.flush()
+    assert store.dirty_count() == 1
+    assert store.take_dirty() == [("/a.wav", "text")]
+    assert store.dirty_count() == 0
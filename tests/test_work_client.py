@@ -0,0 +1,71 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from transcription_tool.autosave import WriteBehindWriter
+from transcription_tool.work_client import WorkClient
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next (status, body) of the server's script."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(request)
+        status, body = self.server.replies.pop(0) if self.server.replies else (200, {"rejected": []})
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    httpd.requests = []
+    httpd.replies = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def client_of(server, tmp_path):
+    host, port = server.server_address
+    return WorkClient(f"http://{host}:{port}", "ann", str(tmp_path))
+
+
+@pytest.mark.parametrize("reply", [(500, {"error": "Could not save: disk full"}), (502, b"<html>Bad Gateway</html>")])
+def test_server_failures_are_connection_errors(server, tmp_path, reply):
+    server.replies.append(reply)
+    with pytest.raises(ConnectionError):
+        client_of(server, tmp_path).write([(str(tmp_path / "a.wav"), "text")])
+
+
+def test_refused_requests_are_runtime_errors(server, tmp_path):
+    client = client_of(server, tmp_path)
+    server.replies.append((409, {"error": "Lease held by another annotator"}))
+    with pytest.raises(RuntimeError):
+        client.write([(str(tmp_path / "a.wav"), "text")])
+    server.replies.append((200, {"rejected": ["a.wav"]}))
+    with pytest.raises(RuntimeError):
+        client.write([(str(tmp_path / "a.wav"), "text")])
+
+
+def test_saves_are_retried_after_a_server_error(server, tmp_path):
+    server.replies.append((500, {"error": "Could not save: disk full"}))
+    writer = WriteBehindWriter(client_of(server, tmp_path).write, flush_seconds=0.05)
+    writer.submit([(str(tmp_path / "a.wav"), "text")])
+    assert writer.flush(timeout=5)
+    assert [str(error) for error in writer.poll_errors()] == ["Work server error 500: Could not save: disk full"]
+    assert [request["items"] for request in server.requests] == [[{"key": "a.wav", "transcription": "text"}]] * 2
+    writer.close(timeout=5)
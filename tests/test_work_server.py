@@ -0,0 +1,77 @@
+from transcription_tool.work_server import LeaseQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue(keys=("a", "b", "c", "d")):
+    clock = FakeClock()
+    return LeaseQueue(keys, lease_seconds=10, clock=clock), clock
+
+
+def test_lease_hands_out_files_once_in_order():
+    queue, _ = make_queue()
+    assert queue.lease("ann", 2) == ["a", "b"]
+    assert queue.lease("bob", 5) == ["c", "d"]
+    assert queue.lease("bob", 1) == []
+    assert queue.status() == {"pending": 0, "leased": 4, "done": 0, "annotators": 2}
+
+
+def test_expired_leases_go_back_to_the_front_in_order():
+    queue, clock = make_queue()
+    queue.lease("ann", 2)
+    clock.now = 10
+    assert queue.status()["leased"] == 0
+    assert queue.lease("bob", 3) == ["a", "b", "c"]
+
+
+def test_renew_extends_only_the_leases_held():
+    queue, clock = make_queue()
+    queue.lease("ann", 2)
+    clock.now = 8
+    assert queue.renew("ann", ["a", "c"]) == ["a"]
+    assert queue.renew("bob", ["b"]) == []
+    clock.now = 12
+    # 'a' was renewed until 18, 'b' expired at 10
+    assert queue.lease("bob", 1) == ["b"]
+    assert queue.renew("ann", ["a", "b"]) == ["a"]
+
+
+def test_release_puts_files_back_first():
+    queue, _ = make_queue()
+    queue.lease("ann", 3)
+    assert queue.release("ann", ["b", "c", "d"]) == ["b", "c"]
+    assert queue.lease("bob", 2) == ["b", "c"]
+
+
+def test_complete_accepts_the_lease_holder_and_later_fixes():
+    queue, _ = make_queue()
+    queue.lease("ann", 1)
+    assert queue.complete("ann", "a")
+    assert queue.status() == {"pending": 3, "leased": 0, "done": 1, "annotators": 0}
+    assert queue.complete("ann", "a")  # fixing a typo
+    assert not queue.complete("bob", "a")
+
+
+def test_complete_rejects_files_not_leased_to_the_annotator():
+    queue, clock = make_queue()
+    queue.lease("ann", 1)
+    assert not queue.complete("bob", "a")  # leased to someone else
+    assert not queue.complete("ann", "b")  # never leased
+    clock.now = 10
+    assert not queue.complete("ann", "a")  # expired
+    assert queue.lease("bob", 1) == ["a"]
+    assert queue.complete("bob", "a")
+
+
+def test_done_files_are_not_handed_out_again():
+    queue, _ = make_queue(["a", "b"])
+    queue.lease("ann", 2)
+    queue.complete("ann", "a")
+    queue.release("ann", ["b"])
+    assert queue.lease("bob", 2) == ["b"]
@@ -0,0 +1,3 @@
+"""
+Core, GUI-independent building blocks of the Speech Transcription Tool.
+"""
@@ -0,0 +1,135 @@
+"""
+Shared in-memory cache of decoded audio.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from .audio_io import map_wav_pcm, pcm_from_samples, pcm_slice
+from .decoders import is_wav, read_audio
+from .segments import parse_segment_key, slice_segment
+
+
+class DecodedAudioCache:
+    """
+    Byte-budgeted, least-recently-used cache of decoded samples, shared by the display, the
+    prefetcher and playback so a compressed file is decoded once however often it is shown or
+    played.
+
+    Segment keys ('<path>#t=<start>,<end>') are accepted wherever a path is, and return views of
+    the segment in the samples of the whole file.
+
+    WAV files are not cached: they are memory-mapped, which costs nothing to repeat. Entries are
+    keyed by path, mtime and size, so a rewritten file is decoded again. When two threads ask for
+    the same file at once, the second waits for the first decode instead of repeating it.
+
+    Parameters:
+    - max_bytes (int): Upper bound for the size of the decoded samples kept; the least recently
+      used files are dropped first. A file larger than the budget is decoded but not kept.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (path, mtime_ns, size) -> (sample_rate, samples)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._decoding = {}  # key -> [Lock held while the file is decoded, decoded entry]
+
+    @staticmethod
+    def _key(path):
+        st = os.stat(path)
+        return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+    def read(self, path, mmap=True):
+        """
+        Returns the samples of a file or segment, decoding the file only if it is neither a WAV
+        file nor cached.
+
+        Returns:
+        - tuple: (sample_rate, samples) where samples is (frames,) or (frames, channels).
+        """
+        path, start, end = parse_segment_key(path)
+        sample_rate, samples = self._read_file(path, mmap)
+        if start is not None:
+            samples = slice_segment(sample_rate, samples, start, end)
+        return sample_rate, samples
+
+    def _read_file(self, path, mmap):
+        if is_wav(path):
+            return read_audio(path, mmap=mmap)
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            # [lock held while decoding, result]: threads waiting on the lock take the result
+            # even when the file is too large to be kept in the cache
+            decoding = self._decoding.setdefault(key, [threading.Lock(), None])
+        with decoding[0]:
+            with self._lock:
+                entry = self._entries.get(key, decoding[1])  # decoded by another thread meanwhile
+                if entry is not None:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                self.misses += 1
+            try:
+                entry = read_audio(path)
+            except BaseException:
+                # Forget the lock, so a corrupt file is tried again rather than left locked
+                with self._lock:
+                    if self._decoding.get(key) is decoding:
+                        del self._decoding[key]
+                raise
+            with self._lock:
+                # Cached and unregistered at once, while the lock is still held: a thread
+                # arriving now finds the entry, one already waiting finds the result
+                self._store(key, entry)
+                decoding[1] = entry
+                if self._decoding.get(key) is decoding:
+                    del self._decoding[key]
+        return entry
+
+    def _store(self, key, entry):
+        """Adds an entry, evicting the least recently used ones; call with '_lock' held."""
+        size = entry[1].nbytes
+        if size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, samples) = self._entries.popitem(last=False)
+            self._bytes -= samples.nbytes
+
+    def pcm(self, path):
+        """
+        Returns a playable buffer for a file or segment: a mapping of the data of integer PCM WAV
+        files, otherwise a view of the cached decoded samples.
+
+        Returns:
+        - PcmBuffer: The playable buffer.
+        """
+        source, start, end = parse_segment_key(path)
+        if is_wav(source):
+            try:
+                pcm = map_wav_pcm(source)
+            except ValueError:
+                pcm = None  # not a RIFF file despite its name: let the decoders try
+            if pcm is not None:
+                return pcm if start is None else pcm_slice(pcm, start, end)
+        return pcm_from_samples(*self.read(path))
+
+    def size_bytes(self):
+        """Returns the size of the decoded samples currently kept, in bytes."""
+        with self._lock:
+            return self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
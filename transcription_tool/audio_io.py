@@ -0,0 +1,164 @@
+"""
+Audio loading helpers shared by the display, playback and background workers.
+"""
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+# Interleaved PCM ready to be handed to simpleaudio.play_buffer.
+PcmBuffer = namedtuple("PcmBuffer", ["data", "num_channels", "bytes_per_sample", "sample_rate"])
+
+# Layout of a WAV file as described by its RIFF header.
+WavInfo = namedtuple(
+    "WavInfo",
+    ["sample_rate", "num_channels", "bits_per_sample", "format_tag", "data_offset", "data_size"],
+)
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def read_wav(path, mmap=False):
+    """
+    Reads a WAV file.
+
+    Parameters:
+    - path (str): Path to the WAV file.
+    - mmap (bool): Map the sample data instead of reading it into memory, so only the parts
+      actually used are loaded. Falls back to a regular read for encodings scipy cannot map.
+
+    Returns:
+    - tuple: (sample_rate, samples) where samples is (frames,) or (frames, channels).
+    """
+    from scipy.io import wavfile  # imported on first use: scipy takes long to import
+
+    if mmap:
+        try:
+            return wavfile.read(path, mmap=True)
+        except ValueError:
+            pass  # e.g. 24-bit files cannot be memory-mapped
+    return wavfile.read(path)
+
+
+def first_channel(samples):
+    """Returns the first channel of a signal as a view, without copying it."""
+    return samples[:, 0] if samples.ndim > 1 else samples
+
+
+def pcm_from_samples(sample_rate, samples):
+    """
+    Wraps decoded samples as an interleaved PCM buffer playable by simpleaudio.
+
+    Integer samples are wrapped without copying them (memory-mapped samples stay on disk until
+    played). Float WAV files are converted to 16-bit integers, since simpleaudio only plays
+    integer PCM.
+
+    Returns:
+    - PcmBuffer: The playable buffer.
+    """
+    import numpy as np  # imported on first use, so opening the window does not wait for numpy
+
+    if samples.dtype.kind == "f":
+        samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    num_channels = samples.shape[1] if samples.ndim > 1 else 1
+    return PcmBuffer(
+        memoryview(np.ascontiguousarray(samples)).cast("B"),
+        num_channels,
+        samples.dtype.itemsize,
+        sample_rate,
+    )
+
+
+def pcm_tail(pcm, start_ms):
+    """
+    Returns the part of a PCM buffer starting at 'start_ms', without copying it.
+
+    Returns:
+    - memoryview: Interleaved frames from the requested position to the end.
+    """
+    frame_bytes = pcm.num_channels * pcm.bytes_per_sample
+    start_frame = int(pcm.sample_rate * max(start_ms, 0) / 1000)
+    return memoryview(pcm.data)[start_frame * frame_bytes:]
+
+
+def pcm_slice(pcm, start_seconds, end_seconds):
+    """
+    Returns the part of a PCM buffer between two times, without copying it.
+
+    Returns:
+    - PcmBuffer: A buffer over the same memory.
+    """
+    frame_bytes = pcm.num_channels * pcm.bytes_per_sample
+    first = int(round(start_seconds * pcm.sample_rate)) * frame_bytes
+    last = int(round(end_seconds * pcm.sample_rate)) * frame_bytes
+    return pcm._replace(data=memoryview(pcm.data)[first:last])
+
+
+def read_wav_header(path):
+    """
+    Parses the RIFF header of a WAV file without reading its samples.
+
+    Parameters:
+    - path (str): Path to the WAV file.
+
+    Returns:
+    - WavInfo: Format of the file and position of its 'data' chunk.
+
+    Raises:
+    - ValueError: If the file is not a WAV file or has no 'fmt ' or 'data' chunk.
+    """
+    file_size = os.path.getsize(path)
+    fmt = None
+    with open(path, "rb") as wav_file:
+        riff = wav_file.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+        while True:
+            chunk_header = wav_file.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                chunk = wav_file.read(chunk_size)
+                if len(chunk) < 16:
+                    raise ValueError(f"{path} has a truncated fmt chunk")
+                format_tag, num_channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", chunk[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(chunk) >= 26:
+                    format_tag = struct.unpack("<H", chunk[24:26])[0]  # first bytes of the sub-format GUID
+                fmt = (sample_rate, num_channels, bits, format_tag)
+                if chunk_size % 2:
+                    wav_file.seek(1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"{path} has a data chunk before its fmt chunk")
+                data_offset = wav_file.tell()
+                # Streamed recordings may leave a placeholder size: trust the file size instead
+                data_size = min(chunk_size, file_size - data_offset)
+                return WavInfo(fmt[0], fmt[1], fmt[2], fmt[3], data_offset, data_size)
+            else:
+                wav_file.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+
+def map_wav_pcm(path):
+    """
+    Memory-maps the sample data of an integer PCM WAV file as a playable buffer.
+
+    Nothing is decoded or copied: the buffer is a view of the file's 'data' chunk, so seeking
+    anywhere in it costs the same whatever the length of the file.
+
+    Returns:
+    - PcmBuffer or None: The mapped buffer, or None if the file is not integer PCM.
+    """
+    info = read_wav_header(path)
+    bytes_per_sample = info.bits_per_sample // 8
+    if (info.format_tag != WAVE_FORMAT_PCM or info.bits_per_sample % 8
+            or not 1 <= bytes_per_sample <= 4 or info.data_size <= 0):
+        return None
+    frame_bytes = bytes_per_sample * info.num_channels
+    with open(path, "rb") as wav_file:
+        mapped = mmap.mmap(wav_file.fileno(), 0, access=mmap.ACCESS_READ)
+    data_size = info.data_size - info.data_size % frame_bytes
+    data = memoryview(mapped)[info.data_offset:info.data_offset + data_size]
+    return PcmBuffer(data, info.num_channels, bytes_per_sample, info.sample_rate)
@@ -0,0 +1,148 @@
+"""
+Write-behind saving of transcriptions, so the Tk thread never waits for the disk or the network.
+"""
+import queue
+import threading
+import time
+
+
+class WriteBehindWriter:
+    """
+    Writes transcriptions from a background thread.
+
+    Saves are coalesced per file: a file saved again before it was written is written once, with
+    its latest transcription. A batch is written 'flush_seconds' after the first save waiting in
+    it, or at once on 'flush'. Failures are never raised to the caller:
+    - An 'OSError' (full disk, network share or work server gone) keeps the batch, which is
+      retried at the next interval. Newer saves of the same files take precedence.
+    - Any other error drops the batch.
+    Either way the error is queued for 'poll_errors', which the Tk thread calls.
+
+    Parameters:
+    - write (callable): Persists a list of (filename, transcription) pairs, e.g.
+      'TranscriptionJournal.append_many'; runs in the writer thread.
+    - flush_seconds (float): Longest time a save waits before being written.
+    - max_pending (int): Largest number of files waiting; see 'room'.
+    """
+
+    def __init__(self, write, flush_seconds=1.0, max_pending=1000):
+        self.write = write
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending = {}  # filename -> transcription, in order of first save
+        self._writing = 0  # size of the batch being written
+        self._flush_requested = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._errors = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def room(self):
+        """Returns how many more files can be queued before the writer is full."""
+        with self._condition:
+            return self.max_pending - len(self._pending) - self._writing
+
+    def submit(self, entries):
+        """
+        Queues (filename, transcription) pairs for writing; returns immediately.
+
+        Raises:
+        - queue.Full: If 'room' is too small; nothing is queued. This only happens after the
+          writer has been failing for a while.
+        """
+        entries = list(entries)
+        with self._condition:
+            new = sum(1 for filename, _ in entries if filename not in self._pending)
+            if new > self.max_pending - len(self._pending) - self._writing:
+                raise queue.Full(f"{len(self._pending) + self._writing} transcriptions waiting to be written")
+            for filename, transcription in entries:
+                self._pending[filename] = transcription
+            self._condition.notify()
+
+    def pending(self):
+        """Returns the number of transcriptions queued or being written."""
+        with self._condition:
+            return len(self._pending) + self._writing
+
+    def poll_errors(self):
+        """Returns the errors raised by 'write' since the last call."""
+        errors = []
+        while True:
+            try:
+                errors.append(self._errors.get_nowait())
+            except queue.Empty:
+                return errors
+
+    def flush(self, timeout=None):
+        """
+        Writes what is queued now and waits until nothing is pending, or 'timeout' seconds.
+
+        Returns:
+        - bool: True if everything was written.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def close(self, timeout=None):
+        """
+        Flushes and stops the writer thread, waiting at most 'timeout' seconds in all.
+
+        Returns:
+        - bool: True if everything was written.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        written = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        return written
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._flush_requested = False
+                    self._condition.wait()
+                if self._closed and not self._pending:
+                    return
+                # Let saves of the same files coalesce, unless a flush is waiting
+                deadline = time.monotonic() + self.flush_seconds
+                while not (self._flush_requested or self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._pending
+                self._pending = {}
+                self._writing = len(batch)
+            failed = False
+            try:
+                self.write(list(batch.items()))
+            except OSError as e:
+                failed = True
+                self._errors.put(e)
+                with self._condition:
+                    batch.update(self._pending)  # newer saves of the same files win
+                    self._pending = batch
+            except Exception as e:
+                self._errors.put(e)
+            with self._condition:
+                self._writing = 0
+                if failed:
+                    self._flush_requested = False
+                    if self._closed:
+                        self._condition.notify_all()
+                        return  # closing: the caller reports what is left
+                self._condition.notify_all()
+            if failed:
+                time.sleep(self.flush_seconds)  # back off before retrying
@@ -0,0 +1,354 @@
+"""
+Benchmarks of the annotation hot paths on synthetic corpora.
+
+Usage:
+    python -m transcription_tool.benchmark [--files 100,1000] [--durations 5,60,600]
+        [--rows 1000,100000] [--output results.json] [--compare baseline.json]
+
+Generates WAV corpora and transcription CSVs of the requested sizes, then times what the GUI does
+when opening a folder, displaying a file, playing it, looking up and saving a transcription. Runs
+without a display or an audio device: figures are drawn with Agg and playback goes to a null sink.
+Results are written as JSON; '--compare' prints the change of the median against an earlier run.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import matplotlib
+import numpy as np
+from scipy.io import wavfile
+
+from .audio_cache import DecodedAudioCache
+from .corpus import CorpusScanner
+from .metrics import Metrics
+from .photo_view import render_rgb
+from .playback import PlaybackEngine
+from .spectrogram import data_range
+from .spectrogram_cache import SpectrogramCache
+from .spectrogram_loader import SpectrogramLoader
+from .spectrogram_view import SpectrogramView
+from .transcription_store import TranscriptionJournal, TranscriptionStore, write_transcription_csv
+
+# Lookups per timed sample of 'get_transcription', which is too fast to time one call at a time
+LOOKUPS_PER_SAMPLE = 1000
+
+# The loads are timed as a whole, not phase by phase
+_NO_STOPWATCH = Metrics(enabled=False).stopwatch("plot_wav_file")
+
+WORDS = ["the", "a", "speech", "file", "one", "two", "yes", "no", "hello", "world", "again", "stop"]
+
+
+def generate_corpus(directory, count, duration, sample_rate=16000, channels=1, files_per_folder=100, seed=0):
+    """
+    Writes 'count' 16-bit WAV files of noise and tones, grouped in sub-folders like a real corpus.
+
+    Files already present with the expected size are kept, so a corpus can be reused between runs.
+
+    Returns:
+    - list: Paths of the files, sorted.
+    """
+    rng = np.random.default_rng(seed)
+    num_frames = int(duration * sample_rate)
+    expected_size = 44 + num_frames * channels * 2
+    t = np.arange(num_frames) / sample_rate
+    paths = []
+    for index in range(count):
+        folder = os.path.join(directory, f"speaker{index // files_per_folder:04d}")
+        path = os.path.join(folder, f"utterance{index:06d}.wav")
+        paths.append(path)
+        if os.path.exists(path) and os.path.getsize(path) == expected_size:
+            continue
+        os.makedirs(folder, exist_ok=True)
+        tone = np.sin(2 * np.pi * (200 + 50 * (index % 20)) * t) * 8000
+        samples = np.empty((num_frames, channels), dtype=np.int16)
+        for channel in range(channels):
+            samples[:, channel] = tone + rng.normal(0, 1000, num_frames)
+        wavfile.write(path, sample_rate, samples if channels > 1 else samples[:, 0])
+    return sorted(paths)
+
+
+def generate_transcriptions(csv_path, count, filenames=(), seed=0):
+    """
+    Writes a transcription CSV of 'count' rows, using 'filenames' first and made-up paths after.
+
+    Returns:
+    - dict: The rows written, by file name.
+    """
+    rng = random.Random(seed)
+    filenames = list(filenames)[:count]
+    filenames += [f"/corpus/missing/utterance{index:07d}.wav" for index in range(count - len(filenames))]
+    rows = {name: " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 15))) for name in filenames}
+    write_transcription_csv(csv_path, rows)
+    return rows
+
+
+def measure(function, repeat, setup=None):
+    """
+    Times 'function' 'repeat' times, running 'setup' (untimed) before each call.
+
+    Returns:
+    - list: Wall-clock durations in seconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    """Returns the min, median, 95th percentile and mean of durations in seconds."""
+    ordered = sorted(samples)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def _result(benchmark, scale, samples):
+    return {"benchmark": benchmark, "scale": scale, "repeat": len(samples), "seconds": summarize(samples)}
+
+
+def plot_file(view, loader, path, max_freq=4000, type_spec="psd"):
+    """Displays a file the way 'plot_wav_file' does, without prefetching."""
+    loaded = loader.load(path, type_spec, max_freq, None, _NO_STOPWATCH)
+    view.show(loaded.spectrogram, max_freq, loaded.clim)
+
+
+def _clear_cache(cache):
+    """Returns a function emptying a spectrogram cache, to time displays of unseen files."""
+    def clear():
+        shutil.rmtree(cache.directory, ignore_errors=True)
+        os.makedirs(cache.directory, exist_ok=True)
+        cache.trim()  # forgets the removed entries
+    return clear
+
+
+def bench_plot(paths, duration, workdir, repeat, long_seconds):
+    """
+    Times displaying files never seen before, then files found in the spectrogram cache, and the
+    same display through the lookup-table renderer. Recordings of at least 'long_seconds' are
+    displayed from a pyramid that is never cached, so they are timed once, as
+    'plot_wav_file.pyramid'.
+    """
+    view = SpectrogramView(None, lambda event: None)
+    cache = SpectrogramCache(os.path.join(workdir, "cache"), float("inf"))
+    loader = SpectrogramLoader(cache, DecodedAudioCache(0), long_seconds)
+    scale = {"duration": duration}
+    long_recordings = duration >= long_seconds
+    files = iter(paths * repeat)
+    cold = measure(lambda: plot_file(view, loader, next(files)), repeat, setup=_clear_cache(cache))
+    results = [_result("plot_wav_file.pyramid" if long_recordings else "plot_wav_file.cold", scale, cold)]
+    if not long_recordings:
+        for path in paths:
+            plot_file(view, loader, path)
+        files = iter(paths * repeat)
+        cached = measure(lambda: plot_file(view, loader, next(files)), repeat)
+        results.append(_result("plot_wav_file.cached", scale, cached))
+
+    # The same files, loaded the same way, through the lookup-table renderer of
+    # 'Display.Renderer' = 'photo'
+    width, height = view.pixel_width(), max(int(view.axes.bbox.height), 1)
+
+    def render_photo():
+        spectrogram, _, clim, _, _ = loader.load(next(files), "psd", 4000, None, _NO_STOPWATCH)
+        render_rgb(spectrogram.data, spectrogram.extent, (0, spectrogram.duration), (0, 4000),
+                   clim if clim is not None else data_range(spectrogram.data), width, height)
+
+    files = iter(paths * repeat)
+    results.append(_result("plot_wav_file.photo", scale, measure(render_photo, repeat)))
+    return results
+
+
+def bench_playback(paths, duration, repeat):
+    """Times starting playback of a new file, then seeking within the same file."""
+    rng = random.Random(0)
+    scale = {"duration": duration}
+    files = iter(paths * repeat)
+    first = measure(lambda: PlaybackEngine(backend="null").play(next(files), 0), repeat)
+    engine = PlaybackEngine(backend="null")
+    engine.play(paths[0], 0)
+    seek = measure(lambda: engine.play(paths[0], rng.uniform(0, duration * 1000)), repeat)
+    return [
+        _result("play_audio_from_position.first", scale, first),
+        _result("play_audio_from_position.seek", scale, seek),
+    ]
+
+
+def bench_transcriptions(rows, workdir, repeat):
+    """Times loading, looking up, saving and compacting transcriptions with 'rows' entries."""
+    csv_path = os.path.join(workdir, f"transcriptions_{rows}.csv")
+    filenames = list(generate_transcriptions(csv_path, rows))
+    scale = {"rows": rows}
+    journal = TranscriptionJournal(csv_path, compact_every=float("inf"))
+    store = TranscriptionStore(journal)
+    load = measure(store.load, repeat)
+
+    rng = random.Random(0)
+    def lookups():
+        for _ in range(LOOKUPS_PER_SAMPLE):
+            store.get(rng.choice(filenames))
+    get = [seconds / LOOKUPS_PER_SAMPLE for seconds in measure(lookups, repeat)]
+
+    counter = iter(range(sys.maxsize))
+    def save():
+        store.put(rng.choice(filenames), f"edited transcription {next(counter)}")
+        store.flush()
+    save_samples = measure(save, repeat)
+    compact = measure(journal.compact, repeat, setup=save)
+    journal.close()
+    return [
+        _result("load_annotations", scale, load),
+        _result("get_transcription", scale, get),
+        _result("save_annotations", scale, save_samples),
+        _result("save_annotations.compact", scale, compact),
+    ]
+
+
+def bench_browse(root, paths, workdir, repeat):
+    """
+    Times listing a corpus and selecting the files left to annotate (half of them), without and
+    with a manifest.
+    """
+    csv_path = os.path.join(workdir, f"browse_{len(paths)}.csv")
+    generate_transcriptions(csv_path, len(paths) // 2, paths[::2])
+    store = TranscriptionStore()
+    store.load_csv(csv_path)
+    manifests = os.path.join(workdir, "manifests")
+    scale = {"files": len(paths)}
+
+    def browse():
+        done = store.filenames()
+        paths = [corpus_file.path for corpus_file in CorpusScanner(root, manifests).scan()]
+        return [path for path in paths if path not in done]
+
+    cold = measure(browse, repeat, setup=lambda: shutil.rmtree(manifests, ignore_errors=True))
+    browse()
+    warm = measure(browse, repeat)
+    return [_result("browse_wav_files.cold", scale, cold), _result("browse_wav_files.warm", scale, warm)]
+
+
+def environment():
+    """Describes the machine and library versions, to tell runs apart."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results, baseline):
+    """
+    Pairs each result with the same benchmark and scale of a baseline run.
+
+    Returns:
+    - list: (benchmark, scale, baseline median, median, ratio) tuples.
+    """
+    def key(result):
+        return result["benchmark"], json.dumps(result["scale"], sort_keys=True)
+
+    old = {key(result): result["seconds"]["median"] for result in baseline["results"]}
+    rows = []
+    for result in results:
+        if key(result) in old:
+            before, after = old[key(result)], result["seconds"]["median"]
+            rows.append((result["benchmark"], result["scale"], before, after, after / before if before else float("inf")))
+    return rows
+
+
+def _format_scale(scale):
+    return ", ".join(f"{name}={value}" for name, value in scale.items())
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(",") if value]
+
+
+def _float_list(text):
+    return [float(value) for value in text.split(",") if value]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=_int_list, default=[100, 1000], help="Corpus sizes for browsing")
+    parser.add_argument("--durations", type=_float_list, default=[5, 60, 600], help="File durations in seconds")
+    parser.add_argument("--rows", type=_int_list, default=[1000, 100000], help="Transcription CSV sizes")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="Sample rate of the generated files")
+    parser.add_argument("--channels", type=int, default=1, help="Channels of the generated files")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed samples per benchmark and scale")
+    parser.add_argument("--long-seconds", type=float, default=600, help="LongRecordings.MinSeconds")
+    parser.add_argument("--workdir", help="Keep the generated corpora here instead of a temporary folder")
+    parser.add_argument("--output", help="Write the results to this JSON file instead of stdout")
+    parser.add_argument("--compare", help="Results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    matplotlib.use("Agg")
+    workdir = args.workdir or tempfile.mkdtemp(prefix="transcription-benchmark-")
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+
+    def report(new_results):
+        for result in new_results:
+            seconds = result["seconds"]
+            print(
+                f"{result['benchmark']:<34} {_format_scale(result['scale']):<16}"
+                f" median {seconds['median'] * 1000:9.3f} ms  p95 {seconds['p95'] * 1000:9.3f} ms",
+                file=sys.stderr,
+            )
+        results.extend(new_results)
+
+    try:
+        for count in args.files:
+            root = os.path.join(workdir, f"corpus_{count}_files")
+            paths = generate_corpus(root, count, 0.5, args.sample_rate, args.channels)
+            report(bench_browse(root, paths, workdir, args.repeat))
+        for duration in args.durations:
+            root = os.path.join(workdir, f"corpus_{duration:g}s")
+            paths = generate_corpus(root, args.repeat, duration, args.sample_rate, args.channels)
+            report(bench_plot(paths, duration, workdir, args.repeat, args.long_seconds))
+            report(bench_playback(paths, duration, args.repeat))
+        for rows in args.rows:
+            report(bench_transcriptions(rows, workdir, args.repeat))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    document = {"environment": environment(), "parameters": vars(args), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(document, output_file, indent=4)
+    else:
+        json.dump(document, sys.stdout, indent=4)
+        print()
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        print("\nMedian against the baseline:", file=sys.stderr)
+        for benchmark, scale, before, after, ratio in compare(results, baseline):
+            print(
+                f"{benchmark:<34} {_format_scale(scale):<16} {before * 1000:9.3f} ms -> {after * 1000:9.3f} ms"
+                f"  x{ratio:.2f}",
+                file=sys.stderr,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Discovery of the audio files of a corpus.
+
+Folders are walked with 'os.scandir' and the result is kept in a manifest per corpus root
+(path, size and mtime of each file, grouped by folder). On the next scan, a folder whose mtime
+did not change is taken from the manifest instead of being listed again, which on network
+shares turns reopening a large corpus into one 'stat' per folder.
+"""
+import bisect
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from .decoders import supported_extensions
+
+CorpusFile = namedtuple("CorpusFile", ["path", "size", "mtime_ns"])
+
+
+class CorpusScanner:
+    """
+    Streaming, manifest-backed scan of the audio files below a folder.
+
+    Files are yielded as soon as their folder is read, in the same order as sorting all the
+    paths alphabetically. Adding or removing a file changes the mtime of its folder, so such
+    folders are always listed again; the size and mtime of a file rewritten in place are only
+    refreshed when its folder is.
+
+    Parameters:
+    - root (str): Root folder of the corpus.
+    - manifest_directory (str or None): Where manifests are kept; None disables them.
+    - extensions (tuple or None): Accepted lower-case extensions, compared case-insensitively;
+      defaults to every format an installed decoder can read.
+    """
+
+    def __init__(self, root, manifest_directory=None, extensions=None):
+        self.root = root
+        self.manifest_directory = manifest_directory
+        self.extensions = tuple(extensions or supported_extensions())
+        self.listed_folders = 0  # folders actually listed during the last scan
+        self.reused_folders = 0  # folders taken from the manifest during the last scan
+        self._stop = threading.Event()
+
+    def manifest_path(self):
+        """Returns the manifest file of this corpus root, or None without a manifest directory."""
+        if self.manifest_directory is None:
+            return None
+        digest = hashlib.sha1(os.path.abspath(self.root).encode("utf-8")).hexdigest()
+        return os.path.join(self.manifest_directory, digest + ".json")
+
+    def _load_manifest(self):
+        manifest_path = self.manifest_path()
+        if manifest_path is None or not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("root") != os.path.abspath(self.root):
+            return {}
+        if manifest.get("extensions") != sorted(self.extensions):
+            return {}  # listed with other formats, e.g. before a decoder was installed
+        return manifest["folders"]
+
+    def _save_manifest(self, folders):
+        manifest_path = self.manifest_path()
+        if manifest_path is None:
+            return
+        os.makedirs(self.manifest_directory, exist_ok=True)
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(
+                {"root": os.path.abspath(self.root), "extensions": sorted(self.extensions), "folders": folders},
+                manifest_file,
+            )
+        os.replace(tmp_path, manifest_path)
+
+    def _list_folder(self, folder, mtime_ns):
+        files = []
+        subfolders = []
+        with os.scandir(folder) as scan:
+            for entry in scan:
+                try:
+                    if entry.is_dir() and not entry.is_symlink():
+                        subfolders.append(entry.name)
+                    elif entry.name.lower().endswith(self.extensions) and entry.is_file():
+                        st = entry.stat()
+                        files.append([entry.name, st.st_size, st.st_mtime_ns])
+                except OSError:
+                    continue  # vanished or unreadable entry
+        return {"mtime_ns": mtime_ns, "files": files, "subfolders": subfolders}
+
+    def _scan_folder(self, relative, old, new):
+        folder = os.path.join(self.root, relative) if relative else self.root
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return
+        listing = old.get(relative)
+        if listing is None or listing["mtime_ns"] != mtime_ns:
+            try:
+                listing = self._list_folder(folder, mtime_ns)
+            except OSError:
+                return
+            self.listed_folders += 1
+        else:
+            self.reused_folders += 1
+        new[relative] = listing
+
+        # Sorting folders as 'name/' interleaves them with files exactly like a sort of full paths
+        children = [(name, True, size, mtime) for name, size, mtime in listing["files"]]
+        children += [(name + os.sep, False, None, None) for name in listing["subfolders"]]
+        children.sort()
+        for name, is_file, size, mtime in children:
+            if self._stop.is_set():
+                return
+            if is_file:
+                yield CorpusFile(os.path.join(folder, name), size, mtime)
+            else:
+                child = name[:-1]
+                yield from self._scan_folder(os.path.join(relative, child) if relative else child, old, new)
+
+    def scan(self):
+        """
+        Yields the audio files of the corpus and updates the manifest once the scan completes.
+
+        Yields:
+        - CorpusFile: Path, size and mtime of each file.
+        """
+        self.listed_folders = self.reused_folders = 0
+        old = self._load_manifest()
+        new = {}
+        yield from self._scan_folder("", old, new)
+        if not self._stop.is_set():
+            self._save_manifest(new)
+
+    def stop(self):
+        """Makes a running 'scan' return early, without updating the manifest."""
+        self._stop.set()
+
+
+class BackgroundScan:
+    """
+    Runs a 'CorpusScanner' in a thread and hands the paths to the Tk thread in batches.
+
+    The first batch is sent as soon as the first file is found, so it can be displayed while the
+    rest of the corpus is still being scanned.
+
+    Parameters:
+    - scanner (CorpusScanner): The scan to run.
+    - batch_seconds (float): Longest time a found file waits before being handed over.
+    - expand (callable or None): Maps each path to the list of items handed over instead, e.g.
+      'Segmenter.split'; runs in the scan thread.
+    - metadata (MetadataIndex or None): Updated with each batch before it is handed over, and
+      saved when the scan ends, so the metadata of every path handed over is available.
+    """
+
+    def __init__(self, scanner, batch_seconds=0.1, expand=None, metadata=None):
+        self.scanner = scanner
+        self.batch_seconds = batch_seconds
+        self.expand = expand
+        self.metadata = metadata
+        self.error = None
+        self._batches = queue.Queue()
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, name="corpus-scan", daemon=True)
+        self._thread.start()
+
+    def _hand_over(self, corpus_files):
+        if self.metadata is not None:
+            self.metadata.update(corpus_files)
+        if self.expand is None:
+            self._batches.put([corpus_file.path for corpus_file in corpus_files])
+        else:
+            self._batches.put([item for corpus_file in corpus_files for item in self.expand(corpus_file.path)])
+
+    def _run(self):
+        batch = []
+        last_flush = None
+        try:
+            for corpus_file in self.scanner.scan():
+                batch.append(corpus_file)
+                now = time.monotonic()
+                if last_flush is None or now - last_flush >= self.batch_seconds:
+                    self._hand_over(batch)
+                    batch = []
+                    last_flush = now
+        except OSError as e:
+            self.error = e
+        try:
+            if batch:
+                self._hand_over(batch)
+            if self.metadata is not None:
+                self.metadata.save()
+        except OSError:
+            pass  # the index is only a cache: it is rebuilt next time
+        finally:
+            self._batches.put(None)  # end of the scan
+
+    def poll(self):
+        """
+        Collects the paths found since the last call.
+
+        Returns:
+        - tuple: (list of new paths, True once the scan has finished).
+        """
+        paths = []
+        while not self._finished:
+            try:
+                batch = self._batches.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                self._finished = True
+            else:
+                paths.extend(batch)
+        return paths, self._finished
+
+    def running(self):
+        """Returns True until 'poll' has reported the end of the scan."""
+        return not self._finished
+
+    def stop(self):
+        """Abandons the scan; 'poll' will not report further files."""
+        self.scanner.stop()
+        self._finished = True
+
+
+def list_audio_files(folder, manifest_directory=None):
+    """
+    Lists the audio files below a folder, recursively.
+
+    Parameters:
+    - folder (str): Root folder of the corpus.
+    - manifest_directory (str or None): Manifest location, to skip unchanged folders.
+
+    Returns:
+    - list: Paths of the audio files, sorted alphabetically.
+    """
+    return [corpus_file.path for corpus_file in CorpusScanner(folder, manifest_directory).scan()]
+
+
+def insert_sorted(files, new_files, key, lo=0):
+    """
+    Inserts files in place into a list whose part from 'lo' is sorted by 'key', keeping it sorted.
+
+    The new files are sorted and their positions found by bisection, then the list is rebuilt
+    in one pass: a batch costs one copy of the list however many files it holds, and the files
+    already there keep their order. Equal keys are inserted after the existing files.
+
+    Parameters:
+    - files (list): Updated in place.
+    - new_files (iterable): Files to insert.
+    - key (callable): Sort key of a file.
+    - lo (int): Start of the sorted part; files are only inserted after it.
+    """
+    new_files = sorted(new_files, key=key)
+    if not new_files:
+        return
+    merged = files[:lo]
+    for f in new_files:
+        position = bisect.bisect_right(files, key(f), lo=lo, key=key)
+        merged.extend(files[lo:position])
+        merged.append(f)
+        lo = position
+    merged.extend(files[lo:])
+    files[:] = merged
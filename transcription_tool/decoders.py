@@ -0,0 +1,188 @@
+"""
+Pluggable decoding of audio files into numpy arrays.
+
+WAV files are read by scipy (memory-mapped when possible); other formats go through the first
+registered decoder that handles their extension and whose library is installed. soundfile
+(FLAC, OGG/Vorbis, Opus) and pydub (MP3 and anything else ffmpeg reads) are registered by default,
+both optional.
+"""
+import functools
+import importlib.util
+import os
+import shutil
+from collections import namedtuple
+
+from .audio_io import read_wav, read_wav_header
+
+# decode(path) -> (sample_rate, samples) with samples (frames,) or (frames, channels)
+# available() -> True when the libraries the decoder needs are installed
+# probe(path) -> AudioInfo read from the header only, or None when the decoder cannot
+Decoder = namedtuple("Decoder", ["name", "extensions", "decode", "available", "probe"])
+
+# bits_per_sample is 0 when the format has no fixed sample size (e.g. MP3)
+AudioInfo = namedtuple("AudioInfo", ["sample_rate", "num_channels", "num_frames", "bits_per_sample"])
+
+_DECODERS = []
+
+WAV_EXTENSIONS = (".wav",)
+
+
+def register_decoder(name, extensions, decode, available=lambda: True, first=False, probe=None):
+    """
+    Adds a decoder for the given file extensions.
+
+    Parameters:
+    - name (str): Name used in error messages.
+    - extensions (tuple): Lower-case extensions including the dot, e.g. ('.flac',).
+    - decode (callable): Takes a path and returns (sample_rate, samples).
+    - available (callable): Returns False when the decoder cannot run on this machine.
+    - first (bool): Try this decoder before the ones already registered.
+    - probe (callable or None): Takes a path and returns its 'AudioInfo' without decoding it.
+    """
+    decoder = Decoder(name, tuple(extensions), decode, functools.lru_cache(maxsize=None)(available), probe)
+    if first:
+        _DECODERS.insert(0, decoder)
+    else:
+        _DECODERS.append(decoder)
+
+
+def extension_of(path):
+    """Returns the lower-case extension of a path, including the dot."""
+    return os.path.splitext(path)[1].lower()
+
+
+def is_wav(path):
+    """Returns True if the path has a WAV extension, whatever its case."""
+    return extension_of(path) in WAV_EXTENSIONS
+
+
+def supported_extensions():
+    """
+    Returns:
+    - tuple: Lower-case extensions that can be decoded with the libraries installed.
+    """
+    extensions = list(WAV_EXTENSIONS)
+    for decoder in _DECODERS:
+        if decoder.available():
+            extensions += [ext for ext in decoder.extensions if ext not in extensions]
+    return tuple(extensions)
+
+
+def decode_audio(path):
+    """
+    Decodes a compressed audio file with the first suitable decoder.
+
+    Returns:
+    - tuple: (sample_rate, samples) where samples is int16, (frames,) or (frames, channels).
+
+    Raises:
+    - ValueError: If no installed decoder handles the file.
+    """
+    extension = extension_of(path)
+    errors = []
+    for decoder in _DECODERS:
+        if extension in decoder.extensions and decoder.available():
+            try:
+                return decoder.decode(path)
+            except Exception as e:  # e.g. a libsndfile build without MP3 support
+                errors.append(f"{decoder.name}: {e}")
+    if errors:
+        raise ValueError(f"Could not decode {path} ({'; '.join(errors)})")
+    raise ValueError(f"No decoder installed for {extension or 'extensionless'} files: {path}")
+
+
+def read_audio(path, mmap=False):
+    """
+    Reads any supported audio file.
+
+    Parameters:
+    - path (str): Path to the audio file.
+    - mmap (bool): Memory-map WAV files instead of reading them; ignored for other formats.
+
+    Returns:
+    - tuple: (sample_rate, samples) where samples is (frames,) or (frames, channels).
+    """
+    if is_wav(path):
+        return read_wav(path, mmap=mmap)
+    return decode_audio(path)
+
+
+def probe_audio(path, decode=True):
+    """
+    Reads the format and length of an audio file, from its header when possible: WAV headers are
+    parsed directly, other formats use the 'probe' of their decoder, and are decoded only when
+    no installed decoder has one.
+
+    Parameters:
+    - path (str): Path to the audio file.
+    - decode (bool): Allow decoding the whole file when its header cannot be probed.
+
+    Returns:
+    - AudioInfo or None: Sample rate, channels, frames and bit depth; None if 'decode' is False
+      and the file would have to be decoded.
+
+    Raises:
+    - ValueError: If the file is corrupt or no installed decoder handles it.
+    - OSError: If the file cannot be read.
+    """
+    if is_wav(path):
+        info = read_wav_header(path)
+        frame_bytes = info.num_channels * info.bits_per_sample // 8
+        if not frame_bytes or not info.sample_rate:
+            raise ValueError(f"{path} has an invalid fmt chunk")
+        return AudioInfo(info.sample_rate, info.num_channels, info.data_size // frame_bytes, info.bits_per_sample)
+    extension = extension_of(path)
+    for decoder in _DECODERS:
+        if extension in decoder.extensions and decoder.probe is not None and decoder.available():
+            try:
+                return decoder.probe(path)
+            except Exception:
+                continue  # let the next decoder, or a full decode, have a go
+    if not decode:
+        return None
+    sample_rate, samples = decode_audio(path)
+    channels = samples.shape[1] if samples.ndim > 1 else 1
+    return AudioInfo(sample_rate, channels, len(samples), samples.dtype.itemsize * 8)
+
+
+def _decode_soundfile(path):
+    import soundfile
+
+    samples, sample_rate = soundfile.read(path, dtype="int16", always_2d=False)
+    return sample_rate, samples
+
+
+def _probe_soundfile(path):
+    import soundfile
+
+    info = soundfile.info(path)
+    bits = {"PCM_S8": 8, "PCM_U8": 8, "PCM_16": 16, "PCM_24": 24, "PCM_32": 32, "FLOAT": 32, "DOUBLE": 64}
+    return AudioInfo(info.samplerate, info.channels, info.frames, bits.get(info.subtype, 0))
+
+
+def _decode_pydub(path):
+    import numpy as np  # imported on first use, so opening the window does not wait for numpy
+    from pydub import AudioSegment
+
+    segment = AudioSegment.from_file(path)
+    samples = np.array(segment.get_array_of_samples())
+    if segment.sample_width != 2:
+        samples = (samples.astype(np.float64) * (2 ** 15 / 2 ** (8 * segment.sample_width - 1))).astype(np.int16)
+    if segment.channels > 1:
+        samples = samples.reshape(-1, segment.channels)
+    return segment.frame_rate, samples.astype(np.int16, copy=False)
+
+
+register_decoder(
+    "soundfile",
+    (".flac", ".ogg", ".oga", ".opus"),
+    _decode_soundfile,
+    lambda: importlib.util.find_spec("soundfile") is not None,
+    probe=_probe_soundfile,
+)
+register_decoder(
+    "pydub",
+    (".mp3", ".m4a", ".flac", ".ogg"),
+    _decode_pydub,
+    lambda: importlib.util.find_spec("pydub") is not None and shutil.which("ffmpeg") is not None,
+)
@@ -0,0 +1,323 @@
+"""
+Export of the transcribed corpus as training manifests.
+
+Usage:
+    python -m transcription_tool.export /path/to/corpus --output manifests/ [--format jsonl,kaldi,parquet]
+
+Joins the transcriptions of the store configured in config_app.json (CSV and journal) with the
+files of the corpus, as the GUI lists them (segments included), and writes one entry per
+transcribed file with its duration, sample rate and channel count. The scan is streamed into a
+process pool, where files are split into segments and only their audio headers are read; files
+whose length cannot be read without decoding them are reported in '--errors' and left out.
+Entries are written in shards of '--shard-size' as they arrive, so memory stays bounded whatever
+the size of the corpus.
+
+Formats:
+- jsonl: 'manifest-00000.jsonl', one object per line (audio_filepath, offset, duration,
+  sample_rate, channels, text), as read by NeMo and most ASR toolkits.
+- kaldi: one data directory per shard, 'kaldi/00000/' with wav.scp, text, utt2spk, utt2dur and,
+  for segments, a segments file.
+- parquet: 'manifest-00000.parquet' with the JSONL columns; needs pyarrow.
+"""
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import re
+import shlex
+import sys
+import threading
+import time
+
+from .corpus import CorpusScanner
+from .decoders import extension_of, is_wav, probe_audio
+from .segments import parse_segment_key
+from .tags import tag_errors
+from .transcription_store import TranscriptionJournal
+
+FORMATS = ("jsonl", "kaldi", "parquet")
+
+
+# State of a worker process, set by '_init_worker'
+_WORKER = {}
+
+
+def _init_worker(transcriptions, recordings, segment_params, include_empty, validate_tags):
+    """Hands the transcriptions and options to a worker process, and builds its segmenter."""
+    segmenter = None
+    if segment_params.get("Mode", "off") != "off":
+        from .segments import Segmenter  # same segments as the GUI, so their keys match
+
+        seconds = float(segment_params.get("Seconds", 30))
+        segmenter = Segmenter(
+            segment_params["Mode"],
+            seconds,
+            min_seconds=float(segment_params.get("MinSeconds", seconds / 2)),
+            max_seconds=float(segment_params.get("MaxSeconds", seconds * 1.5)),
+            cache_directory=segment_params.get("CacheDirectory", ".segment_cache"),
+        )
+    _WORKER.update(
+        transcriptions=transcriptions,
+        recordings=recordings,
+        segmenter=segmenter,
+        include_empty=include_empty,
+        validate_tags=validate_tags,
+    )
+
+
+def _export_file(path):
+    """
+    Splits one file of the corpus into segments when configured, and reads its header once for
+    the entries of its transcribed keys; runs in the worker processes.
+
+    Returns:
+    - tuple: (list of entry dicts, list of error lines, number of keys of the file).
+    """
+    if path not in _WORKER["recordings"]:
+        return [], [], 1  # nothing of this file is transcribed: not split, not read
+    segmenter = _WORKER["segmenter"]
+    keys = segmenter.split(path) if segmenter is not None else [path]
+    items = []
+    errors = []
+    for key in keys:
+        text = _WORKER["transcriptions"].get(key)
+        if text is None or (not text and not _WORKER["include_empty"]):
+            continue
+        problems = tag_errors(text) if _WORKER["validate_tags"] else []
+        if problems:
+            errors.append(f"{key}\t{'; '.join(problems)}")
+        else:
+            items.append((key, text))
+    if not items:
+        return [], errors, len(keys)
+    try:
+        # Headers only: a file no installed decoder can probe is reported rather than decoded
+        info = probe_audio(path, decode=False)
+        if info is None:
+            raise ValueError(f"the length of {extension_of(path)} files cannot be read without decoding them")
+    except (OSError, ValueError) as e:
+        return [], errors + [f"{key}\t{e}" for key, _ in items], len(keys)
+    return [_entry(key, text, info) for key, text in items], errors, len(keys)
+
+
+def _entry(key, text, info):
+    """Returns the manifest entry of a file or segment of a recording with header 'info'."""
+    path, start, end = parse_segment_key(key)
+    duration = info.num_frames / info.sample_rate
+    offset = 0.0
+    if start is not None:
+        offset, duration = start, min(end, duration) - start
+    return {
+        "audio_filepath": path,
+        "offset": offset,
+        "duration": round(duration, 3),
+        "sample_rate": info.sample_rate,
+        "channels": info.num_channels,
+        "text": text,
+        "key": key,
+    }
+
+
+def utterance_id(root, key):
+    """
+    Returns a Kaldi utterance id for a file or segment key: its path relative to the corpus with
+    separators and spaces replaced, plus the segment times in milliseconds.
+    """
+    path, start, end = parse_segment_key(key)
+    recording = recording_id(root, path)
+    if start is None:
+        return recording
+    return f"{recording}-{int(round(start * 1000)):08d}-{int(round(end * 1000)):08d}"
+
+
+def recording_id(root, path):
+    """Returns the Kaldi recording id of an audio file."""
+    relative = os.path.splitext(os.path.relpath(path, root))[0]
+    return re.sub(r"[\s/\\]+", "-", relative)
+
+
+class ShardWriter:
+    """
+    Writes entries to numbered shards of 'shard_size' entries in the requested formats.
+
+    JSONL lines are written as entries arrive; Kaldi and Parquet shards are buffered (one shard at
+    most) because Kaldi files must be sorted and Parquet is written a row group at a time.
+
+    Parameters:
+    - output (str): Output folder, created if missing.
+    - formats (list): Any of 'FORMATS'.
+    - root (str): Corpus root, for Kaldi ids.
+    - shard_size (int): Entries per shard.
+    """
+
+    def __init__(self, output, formats, root, shard_size=100000):
+        self.output = output
+        self.formats = formats
+        self.root = root
+        self.shard_size = shard_size
+        self.shards = 0
+        self._entries = []
+        self._jsonl = None
+        os.makedirs(output, exist_ok=True)
+
+    def _name(self, extension):
+        return os.path.join(self.output, f"manifest-{self.shards:05d}.{extension}")
+
+    def add(self, entry):
+        if "jsonl" in self.formats:
+            if self._jsonl is None:
+                self._jsonl = open(self._name("jsonl") + ".tmp", "w", encoding="utf-8")
+            record = {name: value for name, value in entry.items() if name != "key"}
+            self._jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._entries.append(entry)
+        if len(self._entries) >= self.shard_size:
+            self.finish_shard()
+
+    def finish_shard(self):
+        """Writes the buffered formats of the current shard and starts the next one."""
+        if not self._entries:
+            return
+        if self._jsonl is not None:
+            self._jsonl.close()
+            os.replace(self._name("jsonl") + ".tmp", self._name("jsonl"))
+            self._jsonl = None
+        if "kaldi" in self.formats:
+            self._write_kaldi()
+        if "parquet" in self.formats:
+            self._write_parquet()
+        self._entries = []
+        self.shards += 1
+
+    def _write_kaldi(self):
+        directory = os.path.join(self.output, "kaldi", f"{self.shards:05d}")
+        os.makedirs(directory, exist_ok=True)
+        utterances = sorted(
+            ((utterance_id(self.root, entry["key"]), entry) for entry in self._entries), key=lambda item: item[0]
+        )
+        recordings = {}
+        for _, entry in utterances:
+            path = entry["audio_filepath"]
+            if is_wav(path) and not re.search(r"\s", path):
+                recordings[recording_id(self.root, path)] = path
+            elif is_wav(path):
+                recordings[recording_id(self.root, path)] = f"cat {shlex.quote(path)} |"  # wav.scp splits on spaces
+            else:
+                recordings[recording_id(self.root, path)] = (
+                    f"ffmpeg -nostdin -loglevel error -i {shlex.quote(path)} -f wav - |"
+                )
+        with open(os.path.join(directory, "wav.scp"), "w", encoding="utf-8") as scp:
+            for recording in sorted(recordings):
+                scp.write(f"{recording} {recordings[recording]}\n")
+        has_segments = any(parse_segment_key(entry["key"])[1] is not None for _, entry in utterances)
+        files = ["text", "utt2spk", "utt2dur"] + (["segments"] if has_segments else [])
+        handles = {name: open(os.path.join(directory, name), "w", encoding="utf-8") for name in files}
+        try:
+            for utterance, entry in utterances:
+                handles["text"].write(f"{utterance} {' '.join(entry['text'].split())}\n")
+                handles["utt2spk"].write(f"{utterance} {utterance}\n")  # no speaker information
+                handles["utt2dur"].write(f"{utterance} {entry['duration']}\n")
+                if has_segments:
+                    start = entry["offset"]
+                    handles["segments"].write(
+                        f"{utterance} {recording_id(self.root, entry['audio_filepath'])}"
+                        f" {start:.3f} {start + entry['duration']:.3f}\n"
+                    )
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def _write_parquet(self):
+        import pyarrow
+        import pyarrow.parquet
+
+        columns = ["audio_filepath", "offset", "duration", "sample_rate", "channels", "text"]
+        table = pyarrow.table({name: [entry[name] for entry in self._entries] for name in columns})
+        pyarrow.parquet.write_table(table, self._name("parquet") + ".tmp")
+        os.replace(self._name("parquet") + ".tmp", self._name("parquet"))
+
+    def close(self):
+        self.finish_shard()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", help="Folder containing the audio files, searched recursively")
+    parser.add_argument("--output", required=True, help="Folder receiving the manifests")
+    parser.add_argument("--format", default="jsonl", help=f"Comma-separated list of {', '.join(FORMATS)}")
+    parser.add_argument("--config", default="config_app.json", help="Configuration of the GUI")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--shard-size", type=int, default=100000, help="Entries per shard")
+    parser.add_argument("--validate-tags", action="store_true",
+                        help="Leave out transcriptions whose tags are not balanced, and report them")
+    parser.add_argument("--include-empty", action="store_true", help="Also export empty transcriptions")
+    parser.add_argument("--progress-every", type=float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument("--errors", help="Write the entries left out, with the reason, to this file")
+    args = parser.parse_args(argv)
+
+    formats = [name.strip() for name in args.format.split(",") if name.strip()]
+    unknown = [name for name in formats if name not in FORMATS]
+    if unknown or not formats:
+        parser.error(f"unknown format {', '.join(unknown) or '(none)'}; choose from {', '.join(FORMATS)}")
+    if "parquet" in formats and importlib.util.find_spec("pyarrow") is None:
+        parser.error("the parquet format needs pyarrow (pip install pyarrow)")
+
+    with open(args.config, "r") as jsonfile_obj:
+        datajson_obj = json.load(jsonfile_obj)
+    transcriptions = TranscriptionJournal(datajson_obj["TranscriptionFile"]["TranscriptionFile"]).load()
+    recordings = {parse_segment_key(key)[0] for key in transcriptions}
+
+    print(f"Exporting {args.corpus} with {args.workers} workers ...", file=sys.stderr)
+    root = os.path.abspath(args.corpus)  # the GUI stores absolute paths
+    scanner = CorpusScanner(root, datajson_obj.get("Corpus", {}).get("ManifestDirectory", ".corpus_manifests"))
+    # 'imap' pulls its input as fast as it can; the semaphore keeps the scan a bounded number of
+    # files ahead of the results
+    chunksize = 64
+    ahead = threading.BoundedSemaphore(args.workers * chunksize * 4)
+
+    def paths():
+        for corpus_file in scanner.scan():
+            ahead.acquire()
+            yield corpus_file.path
+
+    writer = ShardWriter(args.output, formats, root, args.shard_size)
+    errors = []
+    keys = exported = 0
+    audio_seconds = 0.0
+    start = last_report = time.monotonic()
+    initargs = (transcriptions, recordings, datajson_obj.get("Segments", {}), args.include_empty, args.validate_tags)
+    with multiprocessing.Pool(args.workers, _init_worker, initargs) as pool:
+        # Ordered, so the manifests follow the corpus order whatever the number of workers
+        for done, (entries, file_errors, file_keys) in enumerate(
+            pool.imap(_export_file, paths(), chunksize=chunksize), start=1
+        ):
+            ahead.release()
+            keys += file_keys
+            errors.extend(file_errors)
+            for entry in entries:
+                writer.add(entry)
+                exported += 1
+                audio_seconds += entry["duration"]
+            now = time.monotonic()
+            if now - last_report >= args.progress_every:
+                print(
+                    f"{done} files | {done / max(now - start, 1e-9):.0f} files/s | {exported} entries"
+                    f" | {audio_seconds / 3600:.1f} audio-hours",
+                    file=sys.stderr,
+                )
+                last_report = now
+    writer.close()
+
+    if errors and args.errors:
+        with open(args.errors, "w", encoding="utf-8") as errors_file:
+            errors_file.write("\n".join(errors) + "\n")
+    print(
+        f"Exported {exported} entries of {keys} files and segments ({audio_seconds / 3600:.1f} h)"
+        f" in {writer.shards} shards to {args.output}; {len(errors)} left out",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Index of the duration and format of the audio files of a corpus, read from their headers.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .decoders import probe_audio
+from .segments import parse_segment_key
+
+# duration is None when it is unknown: a compressed file whose decoder cannot read headers
+AudioMetadata = namedtuple(
+    "AudioMetadata", ["duration", "sample_rate", "num_channels", "bits_per_sample", "corrupt"]
+)
+
+_CORRUPT = AudioMetadata(0.0, 0, 0, 0, True)
+
+
+def read_metadata(path):
+    """
+    Reads the metadata of one file from its header, never decoding its samples.
+
+    Returns:
+    - AudioMetadata: With 'corrupt' set when the header cannot be parsed or the file is empty.
+    """
+    try:
+        info = probe_audio(path, decode=False)
+    except (OSError, ValueError):
+        return _CORRUPT
+    if info is None:
+        return AudioMetadata(None, 0, 0, 0, False)
+    if not info.num_frames or not info.sample_rate:
+        return _CORRUPT
+    return AudioMetadata(
+        info.num_frames / info.sample_rate, info.sample_rate, info.num_channels, info.bits_per_sample, False
+    )
+
+
+class MetadataIndex:
+    """
+    Metadata of the audio files below a corpus root, kept next to the corpus manifest.
+
+    Entries are stored with the size and mtime of their file and read again when either changes,
+    so reopening a corpus only parses the headers of new or modified files. Headers are parsed
+    by a thread pool, since the time goes into waiting for the disk or the network share.
+    Segment keys are answered from the entry of their file.
+
+    'update' is meant to run in the scan thread while the Tk thread calls 'get'; single dictionary
+    reads and writes need no lock.
+
+    Parameters:
+    - root (str): Root folder of the corpus.
+    - directory (str or None): Where the index is kept (the manifest directory); None keeps it in
+      memory only.
+    - workers (int): Threads parsing headers.
+    """
+
+    def __init__(self, root, directory=None, workers=16):
+        self.root = os.path.abspath(root)
+        self.directory = directory
+        self.workers = workers
+        self._entries = {}  # path -> [size, mtime_ns, duration, sample_rate, channels, bits, corrupt]
+        self._save_lock = threading.Lock()
+        self._load()
+
+    def index_path(self):
+        """Returns the file of the index of this root, or None without a directory."""
+        if self.directory is None:
+            return None
+        digest = hashlib.sha1(self.root.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".metadata.json")
+
+    def _load(self):
+        index_path = self.index_path()
+        if index_path is None or not os.path.exists(index_path):
+            return
+        try:
+            with open(index_path, "r", encoding="utf-8") as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return
+        if index.get("root") == self.root:
+            self._entries = index["files"]
+
+    def save(self):
+        """Writes the index next to the corpus manifest."""
+        index_path = self.index_path()
+        if index_path is None:
+            return
+        with self._save_lock:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as index_file:
+                json.dump({"root": self.root, "files": dict(self._entries)}, index_file)
+            os.replace(tmp_path, index_path)
+
+    def update(self, corpus_files):
+        """
+        Parses the headers of the files that are not indexed yet or changed since.
+
+        Parameters:
+        - corpus_files (list): 'CorpusFile's, as yielded by 'CorpusScanner.scan'.
+        """
+        stale = []
+        for corpus_file in corpus_files:
+            entry = self._entries.get(corpus_file.path)
+            if entry is None or entry[0] != corpus_file.size or entry[1] != corpus_file.mtime_ns:
+                stale.append(corpus_file)
+        if not stale:
+            return
+        if len(stale) == 1 or self.workers <= 1:
+            results = map(read_metadata, (corpus_file.path for corpus_file in stale))
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="metadata") as executor:
+                results = list(executor.map(read_metadata, (corpus_file.path for corpus_file in stale)))
+        for corpus_file, metadata in zip(stale, results):
+            self._entries[corpus_file.path] = [corpus_file.size, corpus_file.mtime_ns, *metadata]
+
+    def get(self, path):
+        """
+        Returns:
+        - AudioMetadata or None: Metadata of a file or segment key, or None if it is not indexed.
+        """
+        source, start, end = parse_segment_key(path)
+        entry = self._entries.get(source)
+        if entry is None:
+            return None
+        metadata = AudioMetadata(*entry[2:])
+        if start is not None:
+            duration = end - start if metadata.duration is None else min(end, metadata.duration) - start
+            metadata = metadata._replace(duration=duration)
+        return metadata
+
+    def duration(self, path):
+        """Returns the duration of a file or segment in seconds, 0 when unknown."""
+        metadata = self.get(path)
+        return (metadata.duration or 0.0) if metadata is not None else 0.0
+
+    def is_corrupt(self, path):
+        """Returns True if the file (or the file of a segment) could not be parsed."""
+        metadata = self.get(path)
+        return metadata is not None and metadata.corrupt
@@ -0,0 +1,218 @@
+"""
+Lightweight latency instrumentation of the annotation hot paths.
+
+Each operation gets a histogram with fixed buckets (cumulative, for Prometheus) and a rolling
+window of its most recent durations (for percentiles that follow the current session). Snapshots
+can be appended to a JSONL log or written as a Prometheus text file, e.g. for node_exporter's
+textfile collector.
+"""
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+
+# Upper bounds of the histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_METRIC = "transcription_tool_latency_seconds"
+
+
+class LatencyHistogram:
+    """
+    Latency distribution of one operation.
+
+    Parameters:
+    - buckets (tuple): Increasing upper bounds of the buckets in seconds; an implicit +Inf bucket
+      follows.
+    - window (int): Number of recent durations kept for the percentiles.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=1024):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        index = 0
+        while index < len(self.buckets) and seconds > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+    def snapshot(self):
+        """
+        Returns:
+        - dict: Total count and sum, percentiles and maximum of the recent durations, and the
+          cumulative bucket counts keyed by upper bound.
+        """
+        recent = sorted(self.recent)
+
+        def percentile(q):
+            return recent[min(len(recent) - 1, int(q * len(recent)))] if recent else None
+
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": recent[-1] if recent else None,
+            "buckets": buckets,
+        }
+
+
+class _Timer:
+    """Context manager recording the duration of its block."""
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+class Stopwatch:
+    """
+    Times an operation made of successive phases.
+
+    'lap(phase)' records the time since the previous lap as '<name>.<phase>', and 'stop()' records
+    the whole duration as '<name>'.
+    """
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.metrics.observe(f"{self.name}.{phase}", now - self.last)
+        self.last = now
+
+    def stop(self):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    """Stands in for '_Timer' and 'Stopwatch' when the instrumentation is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def stop(self):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Registry of the latency histograms, safe to use from any thread.
+
+    Parameters:
+    - enabled (bool): When False, timers do nothing and no histogram is kept.
+    - window (int): Number of recent durations per operation used for the percentiles.
+    - buckets (tuple): Upper bounds of the histogram buckets in seconds.
+    """
+
+    def __init__(self, enabled=True, window=1024, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.window = window
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        """Records one duration, in seconds, of the operation 'name'."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram(self.buckets, self.window)
+            histogram.observe(seconds)
+
+    def timer(self, name):
+        """Returns a context manager recording the duration of its block as 'name'."""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def stopwatch(self, name):
+        """Returns a 'Stopwatch' for an operation timed phase by phase."""
+        return Stopwatch(self, name) if self.enabled else _NULL_TIMER
+
+    def snapshot(self):
+        """
+        Returns:
+        - dict: Snapshot of each histogram, by operation name.
+        """
+        with self._lock:
+            return {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+
+    def summary(self, names):
+        """
+        Formats the median and 95th percentile of some operations on one line, for display.
+
+        Returns:
+        - str: e.g. 'plot_wav_file p50 85 ms p95 140 ms | ...'; operations never timed are skipped.
+        """
+        snapshot = self.snapshot()
+        parts = []
+        for name in names:
+            stats = snapshot.get(name)
+            if stats and stats["p50"] is not None:
+                parts.append(f"{name} p50 {stats['p50'] * 1000:.0f} ms p95 {stats['p95'] * 1000:.0f} ms")
+        return " | ".join(parts)
+
+    def write_jsonl(self, path):
+        """Appends the current snapshot, with a timestamp and the host name, as one line of 'path'."""
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "host": socket.gethostname(),
+            "operations": self.snapshot(),
+        }
+        with open(path, "a", encoding="utf-8") as log_file:
+            log_file.write(json.dumps(record) + "\n")
+
+    def write_prometheus(self, path):
+        """
+        Writes the histograms in the Prometheus text format, replacing 'path' atomically so a
+        collector never reads a partial file.
+        """
+        host = socket.gethostname()
+        lines = [
+            f"# HELP {PROMETHEUS_METRIC} Latency of the annotation operations.",
+            f"# TYPE {PROMETHEUS_METRIC} histogram",
+        ]
+        for name, stats in self.snapshot().items():
+            labels = f'operation="{name}",host="{host}"'
+            for bound, count in stats["buckets"].items():
+                lines.append(f'{PROMETHEUS_METRIC}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{PROMETHEUS_METRIC}_sum{{{labels}}} {stats['sum']}")
+            lines.append(f"{PROMETHEUS_METRIC}_count{{{labels}}} {stats['count']}")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as prometheus_file:
+            prometheus_file.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
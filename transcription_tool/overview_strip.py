@@ -0,0 +1,116 @@
+"""
+Waveform overview of the whole file, drawn above the spectrogram.
+"""
+import tkinter as tk
+
+import numpy as np
+
+from .peaks import peak_columns
+
+
+class OverviewStrip:
+    """
+    Thin Tk canvas showing the peak envelope of the whole file, the range visible in the
+    spectrogram and the playback cursor.
+
+    The envelope is drawn once per file as a single polygon from the precomputed peak summary,
+    and again by 'align' when the spectrogram plotting area moves or resizes; moving the viewport
+    or the cursor only moves two canvas items. Clicking or dragging on the strip calls 'on_jump'
+    with the time under the mouse.
+
+    Parameters:
+    - master (tk.Widget): Parent widget.
+    - on_jump (callable): Called with a time in seconds when the strip is clicked or dragged.
+    - height (int): Height of the strip in pixels.
+    """
+
+    def __init__(self, master, on_jump, height=48, bg="white", color="#4C72B0"):
+        self.widget = tk.Canvas(master, height=height, bg=bg, highlightthickness=0)
+        self.height = height
+        self.color = color
+        self.on_jump = on_jump
+        self.peaks = None
+        self._viewport = (0.0, 0.0)
+        self._cursor = None
+        self.duration = 0.0
+        self.left = 0
+        self.width = 1
+        self.widget.bind("<Button-1>", self._on_mouse)
+        self.widget.bind("<B1-Motion>", self._on_mouse)
+
+    def show(self, peaks, left, width):
+        """
+        Draws the envelope of a file.
+
+        Parameters:
+        - peaks (Peaks): Peak summary of the file.
+        - left (int): Offset of the spectrogram plotting area in pixels, so both time axes line up.
+        - width (int): Width of the spectrogram plotting area in pixels.
+        """
+        self.widget.delete("all")
+        self.peaks = peaks
+        self.duration = peaks.duration
+        self.left, self.width = left, max(int(width), 1)
+        self._viewport = (0.0, 0.0)
+        self._cursor = None
+        self._draw_envelope()
+        self.widget.create_rectangle(0, 1, 0, self.height - 1, outline="#0078D7", width=2, tags="viewport")
+        self.widget.create_line(0, 0, 0, self.height, fill="lime", width=2, state="hidden", tags="cursor")
+
+    def align(self, left, width):
+        """
+        Follows the spectrogram plotting area to 'left' and 'width' pixels, e.g. after the window
+        was resized; the envelope, viewport and cursor are redrawn only if it moved.
+        """
+        width = max(int(width), 1)
+        if (left, width) == (self.left, self.width) or self.peaks is None:
+            return
+        self.left, self.width = left, width
+        self._draw_envelope()
+        self.widget.tag_lower("envelope")
+        self.set_viewport(*self._viewport)
+        if self._cursor is not None:
+            self.set_cursor(self._cursor)
+
+    def _draw_envelope(self):
+        self.widget.delete("envelope")
+        peaks, left = self.peaks, self.left
+        middle = self.height / 2
+        columns = peak_columns(peaks, self.width)
+        if columns.shape[1]:
+            x = left + np.arange(columns.shape[1]) * (self.width / columns.shape[1])
+            # Top edge from left to right, then bottom edge back; each column at least 1 px thick
+            top = middle - np.maximum(columns[1], 0) * (middle - 1) - 0.5
+            bottom = middle - np.minimum(columns[0], 0) * (middle - 1) + 0.5
+            points = np.concatenate([np.column_stack([x, top]), np.column_stack([x, bottom])[::-1]])
+            self.widget.create_polygon(
+                *points.ravel().tolist(), fill=self.color, outline=self.color, tags="envelope"
+            )
+
+    def _x(self, seconds):
+        if self.duration <= 0:
+            return self.left
+        return self.left + seconds / self.duration * self.width
+
+    def set_viewport(self, start, end):
+        """Outlines the range [start, end] seconds visible in the spectrogram."""
+        self._viewport = (start, end)
+        self.widget.coords("viewport", self._x(start), 1, self._x(end), self.height - 1)
+
+    def set_cursor(self, seconds):
+        """Shows the playback cursor at 'seconds'."""
+        self._cursor = seconds
+        x = self._x(seconds)
+        self.widget.coords("cursor", x, 0, x, self.height)
+        self.widget.itemconfigure("cursor", state="normal")
+
+    def hide_cursor(self):
+        """Hides the playback cursor."""
+        self._cursor = None
+        self.widget.itemconfigure("cursor", state="hidden")
+
+    def _on_mouse(self, event):
+        if self.duration <= 0:
+            return
+        seconds = (event.x - self.left) / self.width * self.duration
+        self.on_jump(min(max(seconds, 0.0), self.duration))
@@ -0,0 +1,140 @@
+"""
+Min/max peak summaries of audio files, as audio editors keep them for drawing waveforms.
+
+A summary holds the lowest and highest sample of every block of 'samples_per_bin' frames (all
+channels together), normalized to [-1, 1]. It is computed in one vectorized pass over the
+memory-mapped samples and kept on disk, so the overview of a file of any length is drawn
+without reading the audio again.
+"""
+import hashlib
+import json
+import math
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from .segments import parse_segment_key
+
+# data: float32 array of shape (2, bins), lowest then highest sample of each bin.
+Peaks = namedtuple("Peaks", ["data", "samples_per_bin", "sample_rate", "duration"])
+
+
+def compute_peaks(sample_rate, samples, min_samples_per_bin=256, max_bins=65536, block_bins=4096):
+    """
+    Computes the peak summary of a signal.
+
+    Parameters:
+    - sample_rate (int): Sampling rate in Hz.
+    - samples (np.ndarray): (frames,) or (frames, channels), possibly memory-mapped.
+    - min_samples_per_bin (int): Finest resolution of the summary.
+    - max_bins (int): Longest summary; long files get coarser bins.
+    - block_bins (int): Bins computed per step, bounding the memory read at once.
+
+    Returns:
+    - Peaks: The summary.
+    """
+    frames = len(samples)
+    samples_per_bin = max(min_samples_per_bin, math.ceil(frames / max_bins))
+    num_bins = math.ceil(frames / samples_per_bin)
+    scale = float(np.iinfo(samples.dtype).max) + 1 if samples.dtype.kind in "iu" else 1.0
+    offset = scale if samples.dtype.kind == "u" else 0.0  # 8-bit WAV is unsigned
+    data = np.zeros((2, num_bins), dtype=np.float32)
+    for first in range(0, num_bins, block_bins):
+        last = min(num_bins, first + block_bins)
+        block = np.asarray(samples[first * samples_per_bin:last * samples_per_bin])
+        padding = (last - first) * samples_per_bin - len(block)
+        if padding:  # the last bin is partial: repeat its last frame
+            block = np.concatenate([block, np.repeat(block[-1:], padding, axis=0)])
+        block = block.reshape(last - first, -1)
+        data[0, first:last] = (block.min(axis=1) - offset) / scale
+        data[1, first:last] = (block.max(axis=1) - offset) / scale
+    return Peaks(data, samples_per_bin, sample_rate, frames / sample_rate)
+
+
+def peak_columns(peaks, columns):
+    """
+    Reduces a summary to 'columns' (min, max) pairs, e.g. one per pixel of the overview.
+
+    Returns:
+    - np.ndarray: float32 array of shape (2, columns) or fewer if the summary is shorter.
+    """
+    num_bins = peaks.data.shape[1]
+    if num_bins <= columns:
+        return peaks.data
+    edges = np.linspace(0, num_bins, columns + 1).astype(int)
+    return np.stack([
+        np.minimum.reduceat(peaks.data[0], edges[:-1]),
+        np.maximum.reduceat(peaks.data[1], edges[:-1]),
+    ])
+
+
+class PeakCache:
+    """
+    On-disk store of peak summaries, one '.npy' file (memory-mapped when read) and one '.json'
+    file per audio file or segment, keyed like the spectrogram cache by path, mtime and size.
+
+    Parameters:
+    - directory (str): Folder of the summaries. Created if missing.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, path):
+        source, start, end = parse_segment_key(path)
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(source)}|{st.st_mtime_ns}|{st.st_size}|{start}|{end}"
+        base = os.path.join(self.directory, hashlib.sha1(raw.encode("utf-8")).hexdigest())
+        return base + ".npy", base + ".json"
+
+    def get(self, path):
+        """
+        Returns:
+        - Peaks or None: The stored summary of a file or segment, or None if there is none.
+        """
+        paths = self._paths(path)
+        if paths is None:
+            return None
+        try:
+            with open(paths[1], "r") as meta_file:
+                meta = json.load(meta_file)
+            data = np.load(paths[0], mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return Peaks(data, meta["samples_per_bin"], meta["sample_rate"], meta["duration"])
+
+    def put(self, path, peaks):
+        """Stores a summary, writing under temporary names first."""
+        paths = self._paths(path)
+        if paths is None:
+            return
+        suffix = f".{os.getpid()}.tmp"
+        meta = {"samples_per_bin": peaks.samples_per_bin, "sample_rate": peaks.sample_rate, "duration": peaks.duration}
+        try:
+            with open(paths[0] + suffix, "wb") as npy_file:
+                np.save(npy_file, peaks.data)
+            with open(paths[1] + suffix, "w") as meta_file:
+                json.dump(meta, meta_file)
+            os.replace(paths[0] + suffix, paths[0])
+            os.replace(paths[1] + suffix, paths[1])
+        except OSError:
+            pass
+
+    def get_or_compute(self, path, audio_cache):
+        """
+        Returns the summary of a file or segment, computing and storing it if needed.
+
+        Parameters:
+        - path (str): File path or segment key.
+        - audio_cache (DecodedAudioCache): Where the samples are read from.
+        """
+        peaks = self.get(path)
+        if peaks is None:
+            peaks = compute_peaks(*audio_cache.read(path, mmap=True))
+            self.put(path, peaks)
+        return peaks
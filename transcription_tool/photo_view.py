@@ -0,0 +1,261 @@
+"""
+Lightweight spectrogram view drawing straight into a Tk PhotoImage, without matplotlib.
+"""
+import tkinter as tk
+from collections import namedtuple
+
+import numpy as np
+
+from .spectrogram import data_range
+
+# matplotlib's 'viridis' colormap (256 colors), as RGB bytes
+VIRIDIS = np.frombuffer(bytes.fromhex(
+    "44015444025645045745055946075a46085c460a5d460b5e470d60470e61471063471164471365481467481668481769"
+    "48186a481a6c481b6d481c6e481d6f481f70482071482173482374482475482576482677482878482979472a7a472c7a"
+    "472d7b472e7c472f7d46307e46327e46337f463480453581453781453882443983443a83443b84433d84433e85423f85"
+    "4240864241864142874144874045884046883f47883f48893e49893e4a893e4c8a3d4d8a3d4e8a3c4f8a3c508b3b518b"
+    "3b528b3a538b3a548c39558c39568c38588c38598c375a8c375b8d365c8d365d8d355e8d355f8d34608d34618d33628d"
+    "33638d32648e32658e31668e31678e31688e30698e306a8e2f6b8e2f6c8e2e6d8e2e6e8e2e6f8e2d708e2d718e2c718e"
+    "2c728e2c738e2b748e2b758e2a768e2a778e2a788e29798e297a8e297b8e287c8e287d8e277e8e277f8e27808e26818e"
+    "26828e26828e25838e25848e25858e24868e24878e23888e23898e238a8d228b8d228c8d228d8d218e8d218f8d21908d"
+    "21918c20928c20928c20938c1f948c1f958b1f968b1f978b1f988b1f998a1f9a8a1e9b8a1e9c891e9d891f9e891f9f88"
+    "1fa0881fa1881fa1871fa28720a38620a48621a58521a68522a78522a88423a98324aa8325ab8225ac8226ad8127ad81"
+    "28ae8029af7f2ab07f2cb17e2db27d2eb37c2fb47c31b57b32b67a34b67935b77937b87838b9773aba763bbb753dbc74"
+    "3fbc7340bd7242be7144bf7046c06f48c16e4ac16d4cc26c4ec36b50c46a52c56954c56856c66758c7655ac8645cc863"
+    "5ec96260ca6063cb5f65cb5e67cc5c69cd5b6ccd5a6ece5870cf5773d05675d05477d1537ad1517cd2507fd34e81d34d"
+    "84d44b86d54989d5488bd6468ed64590d74393d74195d84098d83e9bd93c9dd93ba0da39a2da37a5db36a8db34aadc32"
+    "addc30b0dd2fb2dd2db5de2bb8de29bade28bddf26c0df25c2df23c5e021c8e020cae11fcde11dd0e11cd2e21bd5e21a"
+    "d8e219dae319dde318dfe318e2e418e5e419e7e419eae51aece51befe51cf1e51df4e61ef6e620f8e621fbe723fde725"
+), dtype=np.uint8).reshape(256, 3)
+
+# What 'on_click' reads from a matplotlib mouse event
+ClickEvent = namedtuple("ClickEvent", ["inaxes", "xdata", "ydata"])
+Bbox = namedtuple("Bbox", ["x0", "y0", "width", "height"])
+
+
+def render_rgb(data, extent, xlim, ylim, clim, width, height, lut=VIRIDIS, background=(240, 240, 240)):
+    """
+    Renders a spectrogram matrix as an RGB image the way 'imshow(origin="lower")' with nearest
+    interpolation would: each pixel takes the value of the cell under its center, mapped through
+    'lut'. The matrix is only indexed at the pixels, so the cost depends on the image size, not on
+    the length of the file.
+
+    Parameters:
+    - data (np.ndarray): Frequency x time matrix, lowest frequency first.
+    - extent (tuple): (tmin, tmax, fmin, fmax) spanned by 'data'.
+    - xlim (tuple): Time range shown, in seconds.
+    - ylim (tuple): Frequency range shown, in Hz.
+    - clim (tuple or None): Values mapped to the first and last colors.
+    - width (int): Width of the image in pixels.
+    - height (int): Height of the image in pixels.
+
+    Returns:
+    - np.ndarray: (height, width, 3) uint8 image, top row first.
+    """
+    num_rows, num_columns = data.shape
+    tmin, tmax, fmin, fmax = extent
+    times = xlim[0] + (np.arange(width) + 0.5) * ((xlim[1] - xlim[0]) / width)
+    columns = np.floor((times - tmin) * (num_columns / (tmax - tmin))).astype(np.intp)
+    freqs = ylim[1] - (np.arange(height) + 0.5) * ((ylim[1] - ylim[0]) / height)
+    rows = np.floor((freqs - fmin) * (num_rows / (fmax - fmin))).astype(np.intp)
+    outside_columns = (columns < 0) | (columns >= num_columns)
+    outside_rows = (rows < 0) | (rows >= num_rows)
+
+    values = data[np.clip(rows, 0, num_rows - 1)[:, None], np.clip(columns, 0, num_columns - 1)]
+    low, high = clim if clim is not None else (0.0, 1.0)
+    scale = len(lut) / (high - low) if high > low else 0.0
+    indices = np.nan_to_num((values - low) * scale, nan=0.0, posinf=len(lut) - 1, neginf=0.0)
+    rgb = lut[np.clip(indices, 0, len(lut) - 1).astype(np.intp)]
+    rgb[outside_rows] = background
+    rgb[:, outside_columns] = background
+    return rgb
+
+
+def nice_ticks(low, high, count=8):
+    """Returns round values between 'low' and 'high', about 'count' of them, for a ruler."""
+    if high <= low:
+        return []
+    raw_step = (high - low) / count
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step)
+    return [round(float(t), 9) for t in np.arange(np.ceil(low / step) * step, high + step * 1e-9, step)]
+
+
+class PlotArea:
+    """
+    The part of the matplotlib 'Axes' interface the window uses: the plotting area in pixels and
+    the time range shown, so 'PhotoSpectrogramView' can replace 'SpectrogramView'.
+    """
+
+    def __init__(self, bbox, xlim=(0.0, 1.0)):
+        self.bbox = bbox
+        self.xlim = xlim
+
+    def get_xlim(self):
+        return self.xlim
+
+
+class PhotoSpectrogramView:
+    """
+    Drop-in replacement for 'SpectrogramView' that skips matplotlib: the matrix is mapped through
+    the viridis lookup table in one vectorized pass at the size of the widget, and the RGB buffer
+    is handed to a Tk 'PhotoImage' as a PPM. Time and frequency rulers are plain canvas items, and
+    the playback cursor is a canvas line moved without redrawing the image.
+
+    Clicks on the image call 'on_click' with a 'ClickEvent' carrying the time and frequency under
+    the mouse, like the matplotlib events 'on_click' receives from 'SpectrogramView'.
+
+    The canvas follows the size its geometry manager gives it: on '<Configure>' the PhotoImage is
+    rebuilt at the new size and redrawn at the next idle time.
+
+    Parameters:
+    - master (tk.Widget): Parent widget of the canvas.
+    - on_click (callable): Called with a 'ClickEvent' when the canvas is clicked.
+    - figsize (tuple): Requested size in inches, as for 'SpectrogramView'.
+    - dpi (int): Pixels per inch.
+    """
+
+    LEFT, RIGHT, TOP, BOTTOM = 60, 10, 8, 36  # margins around the image, for the rulers
+
+    def __init__(self, master, on_click, figsize=(12, 6), dpi=100):
+        width, height = int(figsize[0] * dpi), int(figsize[1] * dpi)
+        self.canvas = tk.Canvas(master, width=width, height=height, bg="white", highlightthickness=0)
+        self.widget = self.canvas
+        self.on_click = on_click
+        self.axes = PlotArea(None)
+        self.photo = None
+        self.canvas.create_image(self.LEFT, self.TOP, anchor="nw", tags="image")
+        self.canvas.create_text(0, 0, text="Time [sec]", anchor="s", tags="xlabel")
+        self.canvas.create_text(0, 0, text="Frequency [Hz]", angle=90, tags="ylabel")
+        self.canvas.create_line(0, 0, 0, 0, fill="lime", width=2, dash=(6, 4), state="hidden", tags="cursor")
+        self.canvas.bind("<Button-1>", self._on_button)
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.spectrogram = None
+        self.max_freq = 1.0
+        self.clim = None
+        self._render_job = None
+        self._cursor = None
+        self._resize(width, height)
+
+    def _resize(self, width, height):
+        """Lays the plotting area out in a canvas of 'width' x 'height' pixels."""
+        self.size = (width, height)
+        self.axes.bbox = Bbox(
+            self.LEFT, self.BOTTOM,
+            max(width - self.LEFT - self.RIGHT, 1), max(height - self.TOP - self.BOTTOM, 1),
+        )
+        self.photo = tk.PhotoImage(width=self.axes.bbox.width, height=self.axes.bbox.height)
+        self.canvas.itemconfigure("image", image=self.photo)
+        self.canvas.coords("xlabel", self.LEFT + self.axes.bbox.width / 2, height - 2)
+        self.canvas.coords("ylabel", 14, self.TOP + self.axes.bbox.height / 2)
+
+    def _on_configure(self, event):
+        size = (self.canvas.winfo_width(), self.canvas.winfo_height())
+        if size != self.size:
+            self._resize(*size)
+            self._schedule_render()
+
+    def show(self, spectrogram, max_freq, clim=None):
+        """
+        Displays a spectrogram over its whole duration.
+
+        Parameters:
+        - spectrogram (Spectrogram): The matrix and extent to display.
+        - max_freq (float): Upper limit of the frequency axis in Hz.
+        - clim (tuple or None): Color limits; defaults to the finite range of the data.
+        """
+        self.spectrogram = spectrogram
+        self.max_freq = max_freq
+        self.clim = clim if clim is not None else data_range(spectrogram.data)
+        self.axes.xlim = (0, spectrogram.duration)
+        self.hide_cursor()  # The cursor belonged to the previous file
+        self._render()
+
+    def set_image(self, spectrogram):
+        """Replaces the displayed matrix, keeping limits and colors."""
+        self.spectrogram = spectrogram
+        self._schedule_render()
+
+    def pixel_width(self):
+        """Returns the width of the image in pixels."""
+        return self.axes.bbox.width
+
+    def set_xlim(self, start, end):
+        """Scrolls or zooms the view to the time range [start, end] in seconds, at the next idle time."""
+        if self.axes.xlim == (start, end):
+            return
+        self.axes.xlim = (start, end)
+        self._schedule_render()
+
+    def cursor_position(self):
+        """
+        Returns:
+        - float or None: Time in seconds of the playback cursor, or None when it is hidden.
+        """
+        return self._cursor
+
+    def set_cursor(self, x_position):
+        """Shows the playback cursor at 'x_position' seconds."""
+        self._cursor = x_position
+        self._place_cursor()
+
+    def hide_cursor(self):
+        """Hides the playback cursor."""
+        self._cursor = None
+        self.canvas.itemconfigure("cursor", state="hidden")
+
+    def _x(self, seconds):
+        start, end = self.axes.xlim
+        return self.LEFT + (seconds - start) / ((end - start) or 1) * self.axes.bbox.width
+
+    def _place_cursor(self):
+        x = self._x(self._cursor)
+        visible = self.LEFT <= x <= self.LEFT + self.axes.bbox.width
+        self.canvas.coords("cursor", x, self.TOP, x, self.TOP + self.axes.bbox.height)
+        self.canvas.itemconfigure("cursor", state="normal" if visible else "hidden")
+
+    def _schedule_render(self):
+        if self._render_job is None:
+            self._render_job = self.canvas.after_idle(self._render)
+
+    def _render(self):
+        self._render_job = None
+        if self.spectrogram is None:
+            return
+        width, height = self.axes.bbox.width, self.axes.bbox.height
+        rgb = render_rgb(
+            self.spectrogram.data, self.spectrogram.extent, self.axes.xlim, (0, self.max_freq),
+            self.clim, width, height,
+        )
+        self.photo.configure(data=b"P6 %d %d 255\n" % (width, height) + rgb.tobytes(), format="PPM")
+        self._draw_rulers()
+        if self._cursor is not None:
+            self._place_cursor()
+
+    def _draw_rulers(self):
+        self.canvas.delete("ruler")
+        left, top = self.LEFT, self.TOP
+        width, height = self.axes.bbox.width, self.axes.bbox.height
+        start, end = self.axes.xlim
+        for seconds in nice_ticks(start, end):
+            x = self._x(seconds)
+            self.canvas.create_line(x, top + height, x, top + height + 4, tags="ruler")
+            self.canvas.create_text(x, top + height + 6, text=f"{seconds:g}", anchor="n", tags="ruler")
+        for freq in nice_ticks(0, self.max_freq, 6):
+            y = top + height - freq / self.max_freq * height
+            self.canvas.create_line(left - 4, y, left, y, tags="ruler")
+            self.canvas.create_text(left - 6, y, text=f"{freq:g}", anchor="e", tags="ruler")
+        self.canvas.create_rectangle(left, top, left + width, top + height, tags="ruler")
+
+    def _on_button(self, event):
+        bbox = self.axes.bbox
+        x, y = event.x - self.LEFT, event.y - self.TOP
+        if not (0 <= x < bbox.width and 0 <= y < bbox.height):
+            self.on_click(ClickEvent(None, None, None))
+            return
+        start, end = self.axes.xlim
+        self.on_click(ClickEvent(
+            self.axes,
+            start + (x + 0.5) / bbox.width * (end - start),
+            (1 - (y + 0.5) / bbox.height) * self.max_freq,
+        ))
@@ -0,0 +1,155 @@
+"""
+Audio playback that seeks directly into the PCM data of a file.
+"""
+import threading
+
+from .audio_cache import DecodedAudioCache
+from .audio_io import pcm_tail
+
+try:
+    import simpleaudio as sa
+except ImportError:  # only the 'sounddevice' and 'null' backends are available then
+    sa = None
+
+try:
+    import sounddevice
+except ImportError:  # optional: without it playback goes through simpleaudio
+    sounddevice = None
+
+# sounddevice sample formats by sample width in bytes
+_STREAM_DTYPES = {1: "uint8", 2: "int16", 3: "int24", 4: "int32"}
+
+
+class StreamingPlayback:
+    """
+    Plays a PCM buffer by feeding it to the output device in fixed-size blocks.
+
+    Only the block being played is copied, so starting playback costs the same whatever the
+    position and the length of the file. Offers the 'is_playing'/'stop' interface of
+    simpleaudio's PlayObject.
+
+    The stream is closed when it ends, whether it was stopped or played to the end: nobody calls
+    'stop' on a file that finished playing, and an unclosed stream keeps its device handle.
+
+    Parameters:
+    - pcm (PcmBuffer): Buffer to play, typically memory-mapped.
+    - start_ms (int): Position to start from, in milliseconds.
+    - block_frames (int): Number of frames handed to the device per callback.
+    """
+
+    def __init__(self, pcm, start_ms, block_frames=2048):
+        self._data = pcm_tail(pcm, start_ms)
+        self._position = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stream = sounddevice.RawOutputStream(
+            samplerate=pcm.sample_rate,
+            channels=pcm.num_channels,
+            dtype=_STREAM_DTYPES[pcm.bytes_per_sample],
+            blocksize=block_frames,
+            callback=self._callback,
+            finished_callback=self._on_finished,
+        )
+        self._stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        block = self._data[self._position:self._position + len(outdata)]
+        self._position += len(block)
+        outdata[:len(block)] = block
+        if len(block) < len(outdata):
+            outdata[len(block):] = b"\x00" * (len(outdata) - len(block))
+            raise sounddevice.CallbackStop
+
+    def _on_finished(self):
+        # Runs in the audio thread once the stream is inactive, e.g. after 'CallbackStop'; closing
+        # waits for that thread, so it happens in another one
+        threading.Thread(target=self._close, name="playback-close", daemon=True).start()
+
+    def _close(self, abort=False):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if abort:
+                self._stream.abort()
+            self._stream.close()
+
+    def is_playing(self):
+        with self._lock:
+            return not self._closed and self._stream.active
+
+    def stop(self):
+        self._close(abort=True)
+
+
+class NullPlayback:
+    """
+    Playback handle that seeks into the buffer like the real backends but outputs nothing; used
+    to run and time the tool on machines without an audio device.
+    """
+
+    def __init__(self, pcm, start_ms):
+        self.data = pcm_tail(pcm, start_ms)
+
+    def is_playing(self):
+        return False
+
+    def stop(self):
+        pass
+
+
+class PlaybackEngine:
+    """
+    Starts playback of a file at any position without decoding it.
+
+    Integer PCM WAV files are memory-mapped once and playback starts at the byte offset of the
+    requested frame. The output goes through 'StreamingPlayback' when sounddevice is installed;
+    otherwise the tail of the mapped buffer is handed to simpleaudio, which copies but does not
+    decode it. A buffer already decoded by the caller (e.g. prefetched) is used as is, and other
+    encodings come from the shared decoded-audio cache, so playing a file again never decodes it.
+
+    Parameters:
+    - block_frames (int): Block size used by the streaming backend.
+    - backend (str): 'auto', 'sounddevice', 'simpleaudio' or 'null' (no output).
+    - audio_cache (DecodedAudioCache or None): Cache of decoded samples shared with the display.
+    """
+
+    def __init__(self, block_frames=2048, backend="auto", audio_cache=None):
+        self.block_frames = block_frames
+        self.audio_cache = audio_cache if audio_cache is not None else DecodedAudioCache(0)
+        self.null = backend == "null"
+        self.streaming = sounddevice is not None and backend in ("auto", "sounddevice")
+        self._source = None  # (path, PcmBuffer) of the last file played
+
+    def pcm_for(self, path):
+        """Returns the PCM buffer of a file, mapping or decoding it unless it was the last one played."""
+        if self._source is None or self._source[0] != path:
+            self._source = (path, self.audio_cache.pcm(path))
+        return self._source[1]
+
+    def play(self, path, start_ms, pcm=None):
+        """
+        Starts playing a file from 'start_ms'.
+
+        Parameters:
+        - path (str): Path to the audio file.
+        - start_ms (int): Start point of playback in milliseconds.
+        - pcm (PcmBuffer or None): Already decoded samples of the file, if any.
+
+        Returns:
+        - object: Playback handle with 'is_playing()' and 'stop()'.
+        """
+        if pcm is None:
+            pcm = self.pcm_for(path)
+        if self.null:
+            return NullPlayback(pcm, start_ms)
+        if self.streaming:
+            return StreamingPlayback(pcm, start_ms, self.block_frames)
+        if sa is None:
+            raise RuntimeError("No audio output: install simpleaudio or sounddevice")
+        return sa.play_buffer(
+            pcm_tail(pcm, start_ms),
+            num_channels=pcm.num_channels,
+            bytes_per_sample=pcm.bytes_per_sample,
+            sample_rate=pcm.sample_rate,
+        )
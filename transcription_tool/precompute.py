@@ -0,0 +1,198 @@
+"""
+Headless precomputation of the spectrogram cache for a whole corpus.
+
+Usage:
+    python -m transcription_tool.precompute /path/to/corpus [--workers 16] [--thumbnails DIR]
+
+Computes, on all cores, the spectrograms 'plot_wav_file' would display and stores them in the
+cache configured in config_app.json, with the peak summaries of the overview strip, so annotators
+never wait for an FFT. Files already cached
+are skipped, which makes an interrupted run resumable by simply starting it again.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from .audio_cache import DecodedAudioCache
+from .audio_io import first_channel
+from .corpus import list_audio_files
+from .peaks import PeakCache
+from .segments import Segmenter
+from .spectrogram import NFFT, NOVERLAP, compute_spectrogram
+from .spectrogram_cache import SpectrogramCache
+
+# Set in each worker process by '_init_worker'
+_worker = {}
+
+
+def _init_worker(cache_directory, type_spec, max_seconds, thumbnails, corpus, max_freq, peak_directory):
+    # Workers never evict: the parent trims the cache once at the end of the run
+    _worker["cache"] = SpectrogramCache(cache_directory, float("inf"))
+    _worker["peaks"] = PeakCache(peak_directory) if peak_directory else None
+    _worker["audio"] = DecodedAudioCache(0)  # each file (or segment) is read once
+    _worker["type_spec"] = type_spec
+    _worker["max_seconds"] = max_seconds
+    _worker["thumbnails"] = thumbnails
+    _worker["corpus"] = corpus
+    _worker["max_freq"] = max_freq
+
+
+def thumbnail_path(thumbnails, corpus, path):
+    """Returns where the PNG thumbnail of 'path' goes, mirroring its place in the corpus."""
+    return os.path.join(thumbnails, os.path.relpath(path, corpus) + ".png")
+
+
+def save_thumbnail(spectrogram, destination, max_freq, max_columns=1024):
+    """
+    Writes a spectrogram as a PNG image, with the colors and frequency range of the GUI.
+
+    Parameters:
+    - spectrogram (Spectrogram): The spectrogram to draw.
+    - destination (str): Path of the PNG file.
+    - max_freq (float): Highest frequency shown.
+    - max_columns (int): Width limit of the image; longer spectrograms are subsampled.
+    """
+    from matplotlib import image
+
+    data = np.asarray(spectrogram.data)
+    fmin, fmax = spectrogram.extent[2], spectrogram.extent[3]
+    rows = int((max_freq - fmin) / (fmax - fmin) * (data.shape[0] - 1)) + 1
+    data = data[:rows, ::max(1, -(-data.shape[1] // max_columns))]
+    finite = np.ma.masked_invalid(data)
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    image.imsave(
+        destination, finite.filled(finite.min() if finite.count() else 0),
+        cmap="viridis", origin="lower",
+    )
+
+
+def _process(path):
+    """
+    Computes and caches the spectrogram of one file or segment.
+
+    Returns:
+    - tuple: (path, status, duration in seconds, error message) with status one of
+      'computed', 'cached', 'long' or 'error'.
+    """
+    cache = _worker["cache"]
+    type_spec = _worker["type_spec"]
+    thumbnails = _worker["thumbnails"]
+    try:
+        if _worker["peaks"] is not None:
+            _worker["peaks"].get_or_compute(path, _worker["audio"])  # long files included
+        thumbnail = thumbnails and thumbnail_path(thumbnails, _worker["corpus"], path)
+        spectrogram = cache.get(path, NFFT, NOVERLAP, type_spec)  # only maps the matrix
+        if spectrogram is not None and not (thumbnail and not os.path.exists(thumbnail)):
+            return path, "cached", spectrogram.duration, None
+
+        if spectrogram is None:
+            sample_rate, samples = _worker["audio"].read(path, mmap=True)
+            duration = len(samples) / sample_rate
+            if duration >= _worker["max_seconds"]:
+                return path, "long", duration, None  # displayed from tiles, never cached whole
+            spectrogram = compute_spectrogram(
+                first_channel(samples), sample_rate, NFFT, NOVERLAP, type_spec
+            )
+            cache.put(path, NFFT, NOVERLAP, type_spec, spectrogram)
+        if thumbnail:
+            save_thumbnail(spectrogram, thumbnail, _worker["max_freq"])
+        return path, "computed", spectrogram.duration, None
+    except Exception as e:
+        return path, "error", 0.0, str(e)
+
+
+def format_progress(done, total, counts, audio_seconds, elapsed):
+    """Formats one progress line with throughput figures."""
+    elapsed = max(elapsed, 1e-9)
+    return (
+        f"{done}/{total} files"
+        f" | {done / elapsed:.1f} files/s"
+        f" | {audio_seconds / 3600 / elapsed:.3f} audio-hours/s"
+        f" | computed {counts['computed']}, cached {counts['cached']},"
+        f" long {counts['long']}, errors {counts['error']}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", help="Folder containing the audio files, searched recursively")
+    parser.add_argument("--config", default="config_app.json", help="Configuration of the GUI")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--type-spec", default="psd", help="Spectrogram mode, as in plot_wav_file")
+    parser.add_argument("--max-freq", type=float, default=4000, help="Top of the thumbnails in Hz")
+    parser.add_argument("--thumbnails", help="Also write PNG thumbnails below this folder")
+    parser.add_argument("--progress-every", type=float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument("--errors", help="Write the files that failed, with the reason, to this file")
+    args = parser.parse_args(argv)
+
+    with open(args.config, "r") as jsonfile_obj:
+        datajson_obj = json.load(jsonfile_obj)
+    cache_params = datajson_obj.get("SpectrogramCache", {})
+    cache_directory = cache_params.get("Directory", ".spectrogram_cache")
+    max_bytes = int(cache_params.get("MaxMegabytes", 2048)) * 1024 * 1024
+    max_seconds = float(datajson_obj.get("LongRecordings", {}).get("MinSeconds", 600))
+    segment_params = datajson_obj.get("Segments", {})
+    overview_params = datajson_obj.get("Overview", {})
+    peak_directory = overview_params.get("Directory", ".peak_cache") if overview_params.get("Enabled", True) else None
+
+    print(f"Scanning {args.corpus} ...", file=sys.stderr)
+    files = list_audio_files(args.corpus)
+    if segment_params.get("Mode", "off") != "off":
+        # Same segments as the GUI, so it finds their spectrograms in the cache
+        seconds = float(segment_params.get("Seconds", 30))
+        segmenter = Segmenter(
+            segment_params["Mode"],
+            seconds,
+            min_seconds=float(segment_params.get("MinSeconds", seconds / 2)),
+            max_seconds=float(segment_params.get("MaxSeconds", seconds * 1.5)),
+            cache_directory=segment_params.get("CacheDirectory", ".segment_cache"),
+        )
+        files = [key for path in files for key in segmenter.split(path)]
+    total = len(files)
+    print(f"{total} files, {args.workers} workers, cache in {cache_directory}", file=sys.stderr)
+
+    counts = {"computed": 0, "cached": 0, "long": 0, "error": 0}
+    audio_seconds = 0.0
+    errors = []
+    start = last_report = time.monotonic()
+    initargs = (
+        cache_directory, args.type_spec, max_seconds, args.thumbnails, args.corpus, args.max_freq, peak_directory
+    )
+    with multiprocessing.Pool(args.workers, _init_worker, initargs) as pool:
+        for done, (path, status, duration, error) in enumerate(
+            pool.imap_unordered(_process, files, chunksize=8), start=1
+        ):
+            counts[status] += 1
+            audio_seconds += duration
+            if error:
+                errors.append((path, error))
+            now = time.monotonic()
+            if now - last_report >= args.progress_every or done == total:
+                print(format_progress(done, total, counts, audio_seconds, now - start), file=sys.stderr)
+                last_report = now
+
+    if errors and args.errors:
+        with open(args.errors, "w", encoding="utf-8") as errors_file:
+            for path, error in errors:
+                errors_file.write(f"{path}\t{error}\n")
+
+    cache = SpectrogramCache(cache_directory, max_bytes)
+    cache.trim()
+    size = cache.size_bytes()
+    print(f"Cache size: {size / 1024 / 1024:.0f} MB of {max_bytes / 1024 / 1024:.0f} MB", file=sys.stderr)
+    if counts["computed"] and size >= max_bytes * 0.95:
+        print(
+            "Warning: the cache is full and older entries were evicted; "
+            "raise SpectrogramCache.MaxMegabytes to keep the whole corpus.",
+            file=sys.stderr,
+        )
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
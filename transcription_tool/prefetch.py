@@ -0,0 +1,109 @@
+"""
+Background prefetching of the files ahead of the one being annotated.
+"""
+import queue
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .audio_cache import DecodedAudioCache
+from .audio_io import first_channel, pcm_from_samples
+from .peaks import compute_peaks
+from .spectrogram import NFFT, NOVERLAP, compute_spectrogram
+
+PrefetchResult = namedtuple("PrefetchResult", ["spectrogram", "pcm"])
+
+
+class Prefetcher:
+    """
+    Keeps the spectrogram and decoded PCM of the next few files ready in memory.
+
+    Work runs in a thread pool (numpy's FFT and file reads release the GIL); finished results are
+    handed back through a queue that is only drained from the Tk thread, in 'take'.
+
+    Parameters:
+    - cache (SpectrogramCache): Cache consulted before computing and filled after computing.
+    - depth (int): How many files ahead of the current one are kept ready.
+    - workers (int): Number of worker threads.
+    - type_spec (str): Spectrogram mode, as passed to 'plot_wav_file'.
+    - max_seconds (float or None): Files longer than this are not prefetched; they are displayed
+      from tiles instead of a whole-file spectrogram.
+    - audio_cache (DecodedAudioCache or None): Where compressed files are decoded, so the file is
+      not decoded again when it is displayed or played.
+    - peak_cache (PeakCache or None): Filled with the peak summary of each file, long ones
+      included, for the overview strip.
+    """
+
+    def __init__(self, cache, depth=3, workers=2, type_spec="psd", max_seconds=None, audio_cache=None,
+                 peak_cache=None):
+        self.cache = cache
+        self.peak_cache = peak_cache
+        self.audio_cache = audio_cache if audio_cache is not None else DecodedAudioCache(0)
+        self.depth = depth
+        self.type_spec = type_spec
+        self.max_seconds = max_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._results = queue.Queue()
+        self._pending = {}  # path -> Future
+        self._ready = {}  # path -> PrefetchResult
+
+    def _load(self, path):
+        try:
+            sample_rate, samples = self.audio_cache.read(path, mmap=True)
+            if self.peak_cache is not None and self.peak_cache.get(path) is None:
+                self.peak_cache.put(path, compute_peaks(sample_rate, samples))
+            if self.max_seconds is not None and len(samples) / sample_rate > self.max_seconds:
+                self._results.put((path, None))
+                return
+            spectrogram = self.cache.get(path, NFFT, NOVERLAP, self.type_spec)
+            if spectrogram is None:
+                spectrogram = compute_spectrogram(
+                    first_channel(samples), sample_rate, NFFT, NOVERLAP, self.type_spec
+                )
+                self.cache.put(path, NFFT, NOVERLAP, self.type_spec, spectrogram)
+            result = PrefetchResult(spectrogram, pcm_from_samples(sample_rate, samples))
+        except Exception:
+            result = None  # the UI thread loads the file itself and reports the error
+        self._results.put((path, result))
+
+    def _drain(self):
+        while True:
+            try:
+                path, result = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if self._pending.pop(path, None) is not None and result is not None:
+                self._ready[path] = result
+
+    def schedule(self, files, current_index):
+        """
+        Starts loading the 'depth' files following 'current_index' and forgets the others.
+
+        Parameters:
+        - files (list): The navigation list, i.e. 'FILES_LEFT_TO_ANNOTATE'.
+        - current_index (int): Index of the file currently displayed.
+        """
+        self._drain()
+        wanted = files[current_index + 1:current_index + 1 + self.depth]
+        for path in list(self._pending):
+            if path not in wanted and self._pending[path].cancel():
+                del self._pending[path]
+        for path in list(self._ready):
+            if path not in wanted:
+                del self._ready[path]
+        for path in wanted:
+            if path not in self._pending and path not in self._ready:
+                self._pending[path] = self._executor.submit(self._load, path)
+
+    def take(self, path):
+        """
+        Hands over the prefetched data of a file, if it is ready.
+
+        Returns:
+        - PrefetchResult or None: The spectrogram and PCM, or None if not prefetched (yet).
+        """
+        self._drain()
+        return self._ready.pop(path, None)
+
+    def shutdown(self):
+        """Stops the workers without waiting for files still being loaded."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
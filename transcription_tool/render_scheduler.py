@@ -0,0 +1,155 @@
+"""
+Coalescing and cancellation of the file loads triggered by navigation.
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_PROGRESS = object()  # marks the values passed to 'report' in the results queue
+
+
+class RenderScheduler:
+    """
+    Loads the files navigated to in a worker thread and shows them on the Tk thread, dropping
+    the loads that later navigation made stale.
+
+    Every request gets a new generation id. A request arriving after a quiet period starts
+    loading at once, so a single step is shown as soon as possible. Requests arriving within
+    'settle_ms' of the previous one only replace the target, which is loaded once no request came
+    for 'settle_ms': a burst of Next presses costs one load of the file landed on, plus at most
+    the one already running when it started. Loads of a generation that is no longer current are
+    skipped if they have not started, and their results are discarded otherwise. 'on_settled'
+    runs once the current target is shown and no request came for 'settle_ms', e.g. to start
+    playback only where the user stops.
+
+    Parameters:
+    - root (tk.Tk): Window whose 'after' schedules the loads and the result polling.
+    - prepare (callable): Called on the Tk thread with the target when its load starts; returns
+      the argument of 'load'.
+    - load (callable): Called in the worker thread; returns what 'show' needs. With
+      'on_progress', it also receives a 'report' function as second argument.
+    - show (callable): Called on the Tk thread with the target and the result of 'load'.
+    - on_progress (callable or None): Called on the Tk thread with the target and each value
+      'load' passed to 'report', e.g. to show part of the file before the rest is loaded;
+      dropped like the results once the load is stale.
+    - on_settled (callable or None): Called on the Tk thread with the target once settled.
+    - on_error (callable or None): Called on the Tk thread with the target and the exception
+      raised by 'load'; without it the exception is raised there.
+    - settle_ms (int): Quiet time that ends a burst of requests.
+    """
+
+    POLL_MS = 10
+
+    def __init__(self, root, prepare, load, show, on_settled=None, on_error=None, settle_ms=150,
+                 on_progress=None):
+        self.root = root
+        self.prepare = prepare
+        self.load = load
+        self.show = show
+        self.on_progress = on_progress
+        self.on_settled = on_settled
+        self.on_error = on_error
+        self.settle_ms = settle_ms
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        self._results = queue.Queue()
+        self._generation = 0
+        self._target = None
+        self._last_request = None
+        self._start_job = None
+        self._settle_job = None
+        self._poll_job = None
+        self._pending = 0
+
+    def request(self, target):
+        """
+        Asks for 'target' to be loaded and shown, superseding the previous requests.
+
+        Parameters:
+        - target: Passed to 'prepare', 'show' and 'on_settled'.
+        """
+        now = time.monotonic()
+        quiet = self._last_request is None or (now - self._last_request) * 1000 >= self.settle_ms
+        self._generation += 1
+        self._target = target
+        self._last_request = now
+        self._cancel_jobs()
+        if quiet:
+            self._start()
+        else:
+            self._start_job = self.root.after(self.settle_ms, self._start)
+
+    def cancel(self):
+        """Forgets the pending request and discards the load in progress, e.g. when a file is shown directly."""
+        self._generation += 1
+        self._target = None
+        self._cancel_jobs()
+
+    def _cancel_jobs(self):
+        for job in (self._start_job, self._settle_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self._start_job = self._settle_job = None
+
+    def _start(self):
+        self._start_job = None
+        if self._target is None:
+            return
+        argument = self.prepare(self._target)
+        self._pending += 1
+        self._executor.submit(self._run, self._generation, self._target, argument)
+        if self._poll_job is None:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def _run(self, generation, target, argument):
+        result = error = None
+        if generation == self._generation:  # skip loads superseded while queued
+            def report(value):
+                self._results.put((generation, target, value, _PROGRESS))
+
+            try:
+                result = self.load(argument) if self.on_progress is None else self.load(argument, report)
+            except Exception as e:
+                error = e
+        self._results.put((generation, target, result, error))
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                generation, target, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if error is _PROGRESS:
+                if generation == self._generation:
+                    self.on_progress(target, result)
+                continue
+            self._pending -= 1
+            if generation != self._generation:
+                continue
+            if error is not None:
+                self._target = None
+                if self.on_error is None:
+                    raise error
+                self.on_error(target, error)
+                continue
+            self.show(target, result)
+            if self.on_settled is not None:
+                quiet_ms = (time.monotonic() - self._last_request) * 1000
+                self._settle_job = self.root.after(
+                    max(int(self.settle_ms - quiet_ms), 0), self._settle, generation, target
+                )
+            else:
+                self._target = None
+        if self._pending:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def _settle(self, generation, target):
+        self._settle_job = None
+        if generation == self._generation:
+            self._target = None
+            self.on_settled(target)
+
+    def shutdown(self):
+        """Stops the worker without waiting for a load in progress."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,291 @@
+"""
+Inverted index over the saved transcriptions, for finding the files to review.
+
+Usage:
+    python -m transcription_tool.search [--config config_app.json] 'tag:UNK_SPK OR "thank you"'
+    python -m transcription_tool.search -- -hello world
+
+The query may be one argument or several, joined with spaces. A query starting with '-' is taken
+as such ('-noise' is not an option), except where argparse reads it as one, e.g. '-h...': put
+'--' before the query to be sure.
+
+Words are matched case-insensitively, and each tag inserted by the GUI is a term of its own,
+so '[Foreign_Language_Start]' or 'tag:Foreign_Language' finds the files where it was inserted.
+
+Query syntax:
+- word: files containing the word.
+- "some words": files containing the words next to each other.
+- tag:NAME: files containing '[NAME_Start]'.
+- a b, a AND b: both; a OR b: either; NOT a, -a: without; parentheses group.
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+
+# Matched on lowercased text. The tags of 'tags.TAG_PATTERN' come first, so '[HESITATION_Start]'
+# is one term rather than the word 'hesitation_start'
+TOKEN_PATTERN = re.compile(r"\[\w+?_(?:start|end)\]|\w+(?:'\w+)*")
+QUERY_PATTERN = re.compile(r'"([^"]*)"?|[()]|[^\s()"]+')
+
+
+def tokenize(text):
+    """
+    Returns:
+    - list: The lowercased words and tags of 'text', in order.
+    """
+    return list(map(sys.intern, TOKEN_PATTERN.findall(text.lower())))
+
+
+def parse_query(query):
+    """
+    Parses a query into a tree of tuples: ('terms', [term, ...]) for a word or phrase,
+    ('and', [node, ...]), ('or', [node, ...]) and ('not', node).
+
+    Raises:
+    - ValueError: If the query is empty or malformed.
+    """
+    tokens = []
+    for match in QUERY_PATTERN.finditer(query):
+        if match.group(1) is not None:
+            tokens.append(("phrase", match.group(1)))
+        elif match.group(0) in ("(", ")", "AND", "OR", "NOT"):
+            tokens.append((match.group(0), None))
+        elif match.group(0).startswith("-") and len(match.group(0)) > 1:
+            tokens.extend([("NOT", None), ("word", match.group(0)[1:])])
+        else:
+            tokens.append(("word", match.group(0)))
+    position = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def parse_or():
+        nonlocal position
+        nodes = [parse_and()]
+        while peek() == "OR":
+            position += 1
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nonlocal position
+        nodes = [parse_not()]
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                position += 1
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_not():
+        nonlocal position
+        if peek() == "NOT":
+            position += 1
+            return ("not", parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        nonlocal position
+        kind = peek()
+        if kind is None:
+            raise ValueError("Incomplete query")
+        value = tokens[position][1]
+        position += 1
+        if kind == "(":
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError("Missing ')' in query")
+            position += 1
+            return node
+        if kind not in ("word", "phrase"):
+            raise ValueError(f"Unexpected '{kind}' in query")
+        if kind == "word" and value.lower().startswith("tag:"):
+            return ("terms", [f"[{value[4:].lower()}_start]"])
+        terms = tokenize(value)
+        if not terms:
+            raise ValueError(f"Nothing to search in '{value}'")
+        return ("terms", terms)
+
+    node = parse_or()
+    if position < len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position][1] or tokens[position][0]}' in query")
+    return node
+
+
+class TranscriptionIndex:
+    """
+    Term -> files index of the transcriptions, kept up to date by 'update' as they are saved.
+
+    Each term maps to the set of ids of the files containing it, so a query costs a few set
+    operations on the postings of its terms whatever the number of transcriptions. Phrases are
+    answered by intersecting the postings of their words and checking word order in the terms
+    kept for each candidate file.
+
+    'start_build' indexes the existing transcriptions in a background thread, a chunk at a time
+    under the lock, so saves and searches made meanwhile do not wait for the whole corpus. Files
+    updated before the build reaches them keep their newer transcription.
+    """
+
+    def __init__(self):
+        self._ids = {}  # filename -> id
+        self._filenames = []  # id -> filename
+        self._terms = []  # id -> tuple of terms, empty once the transcription is emptied
+        self._postings = {}  # term -> set of ids
+        self._live = set()  # ids of the files with a non-empty transcription, for NOT
+        self._lock = threading.Lock()
+        self._built = threading.Event()
+
+    def _set(self, filename, text):
+        doc_id = self._ids.get(filename)
+        if doc_id is None:
+            doc_id = self._ids[filename] = len(self._filenames)
+            self._filenames.append(filename)
+            self._terms.append(())
+        for term in set(self._terms[doc_id]):
+            postings = self._postings[term]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[term]
+        terms = tuple(tokenize(text))
+        self._terms[doc_id] = terms
+        postings = self._postings
+        for term in set(terms):
+            if term in postings:
+                postings[term].add(doc_id)
+            else:
+                postings[term] = {doc_id}
+        if terms:
+            self._live.add(doc_id)
+        else:
+            self._live.discard(doc_id)
+
+    def update(self, filename, text):
+        """Indexes the new transcription of a file in place of its previous one."""
+        with self._lock:
+            self._set(filename, text)
+
+    def build(self, items, chunk=10000):
+        """
+        Indexes (filename, transcription) pairs, skipping files already indexed by 'update'.
+        """
+        items = list(items)
+        for first in range(0, len(items), chunk):
+            with self._lock:
+                for filename, text in items[first:first + chunk]:
+                    if filename not in self._ids:
+                        self._set(filename, text)
+        self._built.set()
+
+    def start_build(self, items):
+        """Runs 'build' in a background thread; see 'ready'."""
+        threading.Thread(target=self.build, args=(list(items),), name="search-index", daemon=True).start()
+
+    def ready(self):
+        """Returns True once the build has indexed every transcription it was given."""
+        return self._built.is_set()
+
+    def _phrase(self, terms):
+        postings = sorted((self._postings.get(term, set()) for term in set(terms)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        if len(terms) == 1:
+            return candidates
+        width = len(terms)
+        terms = tuple(terms)
+        matches = set()
+        for doc_id in candidates:
+            doc_terms = self._terms[doc_id]
+            if any(doc_terms[i:i + width] == terms for i in range(len(doc_terms) - width + 1)):
+                matches.add(doc_id)
+        return matches
+
+    def _evaluate(self, node):
+        kind, value = node
+        if kind == "terms":
+            return self._phrase(value)
+        if kind == "or":
+            return set().union(*(self._evaluate(child) for child in value))
+        if kind == "not":
+            return self._live - self._evaluate(value)
+        # AND: intersect the positive operands, smallest first, then subtract the negated ones
+        positives = sorted((self._evaluate(child) for child in value if child[0] != "not"), key=len)
+        result = set(positives[0]).intersection(*positives[1:]) if positives else set(self._live)
+        for child in value:
+            if child[0] == "not" and result:
+                result -= self._evaluate(child[1])
+        return result
+
+    def search(self, query):
+        """
+        Returns:
+        - list: The filenames matching 'query', sorted.
+
+        Raises:
+        - ValueError: If the query is malformed.
+        """
+        node = parse_query(query)
+        with self._lock:
+            return sorted(self._filenames[doc_id] for doc_id in self._evaluate(node))
+
+    def __len__(self):
+        """Returns the number of indexed files with a non-empty transcription."""
+        return len(self._live)
+
+
+def query_words(argv):
+    """
+    Returns the arguments of the command line that make up the query, in order: all but
+    '--config' and its value, and the first '--'.
+    """
+    words = []
+    arguments = iter(argv)
+    separator_seen = False
+    for argument in arguments:
+        if separator_seen:
+            words.append(argument)
+        elif argument == "--":
+            separator_seen = True
+        elif argument == "--config":
+            next(arguments, None)
+        elif not argument.startswith("--config="):
+            words.append(argument)
+    return words
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = argparse.ArgumentParser(
+        description="Search the saved transcriptions",
+        epilog="Put '--' before a query starting with '-h', e.g. -- -hello",
+        allow_abbrev=False,  # so '--config' is the only spelling 'query_words' has to skip
+    )
+    parser.add_argument("query", nargs="*", help="Words, \"phrases\", tag:NAME, AND, OR, NOT and parentheses")
+    parser.add_argument("--config", default="config_app.json", help="Configuration of the GUI")
+    # A negated word ('-noise') looks like an option to argparse, which then leaves it and the
+    # words after it out of 'query'; they are taken back from 'argv', in order
+    args, unknown = parser.parse_known_args(argv)
+    options = [argument for argument in unknown if argument.startswith("--")]
+    if options:
+        parser.error(f"unrecognized arguments: {' '.join(options)}")
+    query = " ".join(query_words(argv))
+    if not query.strip():
+        parser.error("the following arguments are required: query")
+
+    from .transcription_store import TranscriptionJournal
+
+    with open(args.config, "r") as jsonfile_obj:
+        datajson_obj = json.load(jsonfile_obj)
+    index = TranscriptionIndex()
+    index.build(TranscriptionJournal(datajson_obj["TranscriptionFile"]["TranscriptionFile"]).load().items())
+    try:
+        matches = index.search(query)
+    except ValueError as e:
+        parser.error(str(e))
+    for filename in matches:
+        print(filename)
+    print(f"{len(matches)} of {len(index)} transcriptions match", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
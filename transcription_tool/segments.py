@@ -0,0 +1,198 @@
+"""
+Virtual segmentation of long recordings.
+
+A segment is identified by a key of the form '<path>#t=<start>,<end>' (times in seconds, as in
+media fragment URIs). The key replaces the file path everywhere a file is displayed, played or
+saved, so each segment is handled like a short file of its own while the samples are read
+through offsets into the source, which stays memory-mapped. Nothing is written to disk.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .audio_io import read_wav_header
+from .decoders import is_wav, read_audio
+
+SEGMENT_SEPARATOR = "#t="
+
+# Frame length and smoothing used to find pauses, in seconds
+ENERGY_FRAME_SECONDS = 0.02
+ENERGY_SMOOTHING_SECONDS = 0.2
+
+
+def segment_key(path, start, end):
+    """Returns the key of the segment [start, end] (seconds) of a file."""
+    return f"{path}{SEGMENT_SEPARATOR}{start:.3f},{end:.3f}"
+
+
+def parse_segment_key(key):
+    """
+    Splits a segment key into its parts.
+
+    Returns:
+    - tuple: (path, start, end); start and end are None when 'key' is a plain file path.
+    """
+    path, separator, fragment = key.rpartition(SEGMENT_SEPARATOR)
+    if not separator:
+        return key, None, None
+    try:
+        start, end = (float(value) for value in fragment.split(","))
+    except ValueError:
+        return key, None, None  # a file name that happens to contain the separator
+    return path, start, end
+
+
+def slice_segment(sample_rate, samples, start, end):
+    """Returns the samples of [start, end] seconds as a view (no copy, stays memory-mapped)."""
+    return samples[int(round(start * sample_rate)):int(round(end * sample_rate))]
+
+
+def fixed_boundaries(duration, seconds, min_seconds):
+    """
+    Cuts [0, duration] every 'seconds'; a last piece shorter than 'min_seconds' is merged into the
+    previous segment.
+
+    Returns:
+    - list: (start, end) pairs in seconds.
+    """
+    cuts = list(np.arange(0, duration, seconds)) + [duration]
+    if len(cuts) > 2 and cuts[-1] - cuts[-2] < min_seconds:
+        del cuts[-2]
+    return [(float(start), float(end)) for start, end in zip(cuts[:-1], cuts[1:])]
+
+
+def frame_energy(samples, sample_rate, frame_seconds=ENERGY_FRAME_SECONDS, block_frames=65536):
+    """
+    Computes the mean power of consecutive frames of a mono signal, block by block so a
+    memory-mapped recording of any length is read with bounded memory.
+
+    Returns:
+    - np.ndarray: float64 power of each frame.
+    """
+    frame = max(1, int(frame_seconds * sample_rate))
+    num_frames = len(samples) // frame
+    energy = np.empty(num_frames)
+    for first in range(0, num_frames, block_frames):
+        count = min(block_frames, num_frames - first)
+        block = np.asarray(samples[first * frame:(first + count) * frame], dtype=np.float64)
+        energy[first:first + count] = np.mean(block.reshape(count, frame) ** 2, axis=1)
+    return energy
+
+
+def silence_boundaries(samples, sample_rate, seconds, min_seconds, max_seconds):
+    """
+    Cuts a recording at the quietest moment between 'min_seconds' and 'max_seconds' after the
+    previous cut, preferring moments close to 'seconds', so that segments end in pauses.
+
+    Returns:
+    - list: (start, end) pairs in seconds.
+    """
+    duration = len(samples) / sample_rate
+    energy = frame_energy(samples, sample_rate)
+    smoothing = max(1, int(ENERGY_SMOOTHING_SECONDS / ENERGY_FRAME_SECONDS))
+    level = 10 * np.log10(np.convolve(energy, np.ones(smoothing) / smoothing, mode="same") + 1e-10)
+
+    cuts = [0.0]
+    while duration - cuts[-1] > max_seconds:
+        low = int((cuts[-1] + min_seconds) / ENERGY_FRAME_SECONDS)
+        high = int((cuts[-1] + max_seconds) / ENERGY_FRAME_SECONDS)
+        candidates = level[low:high]
+        if len(candidates) == 0:
+            break
+        # 1 dB per 10 s away from the target length: a clearly quieter pause wins over the target
+        distance = np.abs(np.arange(low, low + len(candidates)) * ENERGY_FRAME_SECONDS - cuts[-1] - seconds)
+        best = low + int(np.argmin(candidates + distance / 10))
+        cuts.append((best + 0.5) * ENERGY_FRAME_SECONDS)
+    cuts.append(duration)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+class Segmenter:
+    """
+    Splits the files of a corpus into segment keys.
+
+    Files no longer than 'max_seconds' are kept whole. Silence-aligned boundaries need one pass
+    over the samples; they are stored per file in 'cache_directory' (keyed by path, mtime, size
+    and settings) so reopening a corpus does not read it again.
+
+    Parameters:
+    - mode (str): 'fixed' or 'silence'.
+    - seconds (float): Target segment length.
+    - min_seconds (float or None): Shortest segment; defaults to half of 'seconds'.
+    - max_seconds (float or None): Longest segment, and longest file kept whole; defaults to 1.5
+      times 'seconds'.
+    - cache_directory (str or None): Where silence boundaries are kept; None disables it.
+    - audio_cache (DecodedAudioCache or None): Used to decode compressed files, so the decoded
+      samples are reused when the segments are displayed.
+    """
+
+    def __init__(self, mode="fixed", seconds=30.0, min_seconds=None, max_seconds=None,
+                 cache_directory=None, audio_cache=None):
+        if mode not in ("fixed", "silence"):
+            raise ValueError(f"Unknown segmentation mode {mode!r}")
+        self.mode = mode
+        self.seconds = seconds
+        self.min_seconds = seconds / 2 if min_seconds is None else min_seconds
+        self.max_seconds = seconds * 1.5 if max_seconds is None else max_seconds
+        self.cache_directory = cache_directory
+        self.audio_cache = audio_cache
+
+    def _read(self, path):
+        if self.audio_cache is not None:
+            return self.audio_cache.read(path, mmap=True)
+        return read_audio(path, mmap=True)
+
+    def _duration(self, path):
+        if is_wav(path):
+            info = read_wav_header(path)
+            frame_bytes = max(1, info.num_channels * info.bits_per_sample // 8)
+            return info.data_size // frame_bytes / info.sample_rate
+        sample_rate, samples = self._read(path)
+        return len(samples) / sample_rate
+
+    def _cache_path(self, path):
+        st = os.stat(path)
+        raw = (f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{self.mode}"
+               f"|{self.seconds}|{self.min_seconds}|{self.max_seconds}")
+        return os.path.join(self.cache_directory, hashlib.sha1(raw.encode("utf-8")).hexdigest() + ".json")
+
+    def _silence_boundaries(self, path):
+        cache_path = self._cache_path(path) if self.cache_directory else None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r") as cache_file:
+                    return [tuple(boundary) for boundary in json.load(cache_file)]
+            except (OSError, ValueError):
+                pass
+        sample_rate, samples = self._read(path)
+        samples = samples[:, 0] if samples.ndim > 1 else samples
+        boundaries = silence_boundaries(samples, sample_rate, self.seconds, self.min_seconds, self.max_seconds)
+        if cache_path:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as cache_file:
+                json.dump(boundaries, cache_file)
+            os.replace(tmp_path, cache_path)
+        return boundaries
+
+    def split(self, path):
+        """
+        Returns the keys of the segments of a file, in order.
+
+        Returns:
+        - list: Segment keys, or [path] for files short enough to be kept whole or that cannot be
+          read (the error is then reported when the file is displayed).
+        """
+        try:
+            duration = self._duration(path)
+            if duration <= self.max_seconds:
+                return [path]
+            if self.mode == "fixed":
+                boundaries = fixed_boundaries(duration, self.seconds, self.min_seconds)
+            else:
+                boundaries = self._silence_boundaries(path)
+        except (OSError, ValueError):
+            return [path]
+        return [segment_key(path, start, end) for start, end in boundaries]
@@ -0,0 +1,81 @@
+"""
+Spectrogram computation decoupled from the matplotlib plotting call, so the
+resulting matrix can be cached, shared between threads and redrawn cheaply.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .stft import stft, stft_columns
+
+# Define the NFFT and noverlap for higher resolution
+NFFT = 4096
+NOVERLAP = int(NFFT * 0.75)
+
+# data: 2-D float32 matrix (frequency x time), lowest frequency first.
+# extent: (xmin, xmax, fmin, fmax) as expected by imshow(origin="lower").
+Spectrogram = namedtuple("Spectrogram", ["data", "extent", "duration", "sample_rate"])
+
+
+def compute_spectrogram(samples, sample_rate, NFFT=NFFT, noverlap=NOVERLAP, mode="psd"):
+    """
+    Computes the same image 'Axes.specgram' would draw, without touching any axes.
+
+    Parameters:
+    - samples (np.ndarray): Mono signal.
+    - sample_rate (int): Sampling rate of the signal in Hz.
+    - NFFT (int): Number of data points used in each block for the FFT.
+    - noverlap (int): Number of points of overlap between blocks.
+    - mode (str): 'psd', 'magnitude', 'angle' or 'phase'.
+
+    Returns:
+    - Spectrogram: The scaled matrix and the extent it spans.
+    """
+    data, freqs, t = stft(samples, sample_rate, NFFT, noverlap, mode)
+    return _make_spectrogram(data, freqs, t, len(samples), sample_rate, NFFT, noverlap)
+
+
+def _make_spectrogram(data, freqs, t, num_samples, sample_rate, NFFT, noverlap):
+    # padding is needed for first and last segment, as in Axes.specgram
+    pad_xextent = (NFFT - noverlap) / sample_rate / 2
+    extent = (
+        float(t[0] - pad_xextent),
+        float(t[-1] + pad_xextent),
+        float(freqs[0]),
+        float(freqs[-1]),
+    )
+    return Spectrogram(data, extent, num_samples / sample_rate, sample_rate)
+
+
+def data_range(data):
+    """
+    Returns the color scaling a freshly created image would get: the finite range of the data.
+
+    Returns:
+    - tuple or None: (min, max), or None if the data has no finite value.
+    """
+    finite = np.ma.masked_invalid(data)
+    if not finite.count():
+        return None
+    return float(finite.min()), float(finite.max())
+
+
+def spectrogram_columns(samples, sample_rate, frame_starts, NFFT=NFFT, mode="psd", num_rows=None):
+    """
+    Computes the spectrogram columns of arbitrary, possibly sparse, frames of a signal.
+
+    Only the samples of the requested frames are read, so this works on memory-mapped signals of
+    any length. The scaling is the one of 'compute_spectrogram'.
+
+    Parameters:
+    - samples (np.ndarray): Mono signal, possibly memory-mapped.
+    - sample_rate (int): Sampling rate of the signal in Hz.
+    - frame_starts (np.ndarray): Index of the first sample of each frame.
+    - NFFT (int): Frame length.
+    - mode (str): 'psd', 'magnitude', 'angle' or 'phase'.
+    - num_rows (int or None): Keep only the lowest 'num_rows' frequency bins.
+
+    Returns:
+    - np.ndarray: float32 matrix of shape (frequency bins, len(frame_starts)).
+    """
+    return stft_columns(samples, sample_rate, np.asarray(frame_starts), NFFT, mode, num_rows)
@@ -0,0 +1,193 @@
+"""
+Persistent on-disk cache of spectrogram matrices.
+
+Each entry is a pair of files named after a hash of the cache key:
+'<key>.npy' holds the float32 matrix and is opened memory-mapped, and
+'<key>.json' holds the extent, duration and sample rate needed to draw it.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .segments import parse_segment_key
+from .spectrogram import Spectrogram
+
+
+class SpectrogramCache:
+    """
+    Size-bounded, least-recently-used cache of spectrograms on disk.
+
+    Entries are keyed by the absolute path, mtime and size of the audio file together with
+    NFFT, noverlap and the spectrogram mode, so editing a file or changing the spectrogram
+    settings never serves a stale image. Recency is tracked through the mtime of the '.npy'
+    file, which is refreshed on every hit, so the LRU order survives restarts.
+
+    Parameters:
+    - directory (str): Folder where the cache entries are stored. Created if missing.
+    - max_bytes (int): Upper bound for the total size of the cache; the least recently used
+      entries are evicted once it is exceeded.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = None  # OrderedDict key -> bytes, oldest first; built on first write
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(path, NFFT, noverlap, mode):
+        """
+        Builds the cache key of an audio file or segment for the given spectrogram settings.
+
+        Returns:
+        - str: Hex digest identifying the entry, or None if the file cannot be stat'ed.
+        """
+        source, start, end = parse_segment_key(path)
+        source = os.path.abspath(source)
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        raw = f"{source}|{st.st_mtime_ns}|{st.st_size}|{NFFT}|{noverlap}|{mode}"
+        if start is not None:
+            raw += f"|{start}|{end}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".npy", base + ".json"
+
+    def get(self, path, NFFT, noverlap, mode):
+        """
+        Looks up a spectrogram, memory-mapping the matrix on a hit.
+
+        Returns:
+        - Spectrogram or None: The cached spectrogram, or None on a miss.
+        """
+        key = self.make_key(path, NFFT, noverlap, mode)
+        if key is not None:
+            npy_path, meta_path = self._paths(key)
+            try:
+                with open(meta_path, "r") as meta_file:
+                    meta = json.load(meta_file)
+                data = np.load(npy_path, mmap_mode="r")
+                os.utime(npy_path)  # mark as most recently used
+            except (OSError, ValueError):
+                pass
+            else:
+                with self._lock:
+                    self.hits += 1
+                    if self._index is not None and key in self._index:
+                        self._index.move_to_end(key)
+                return Spectrogram(
+                    data, tuple(meta["extent"]), meta["duration"], meta["sample_rate"]
+                )
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, path, NFFT, noverlap, mode, spectrogram):
+        """
+        Stores a spectrogram and evicts the least recently used entries if the cache is full.
+
+        Files are written under a temporary name and renamed into place, so concurrent readers
+        never see a partially written entry.
+        """
+        key = self.make_key(path, NFFT, noverlap, mode)
+        if key is None:
+            return
+        npy_path, meta_path = self._paths(key)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        meta = {
+            "path": os.path.abspath(path),
+            "extent": list(spectrogram.extent),
+            "duration": spectrogram.duration,
+            "sample_rate": spectrogram.sample_rate,
+        }
+        try:
+            with open(npy_path + suffix, "wb") as npy_file:
+                np.save(npy_file, np.asarray(spectrogram.data, dtype=np.float32))
+            with open(meta_path + suffix, "w") as meta_file:
+                json.dump(meta, meta_file)
+            os.replace(npy_path + suffix, npy_path)
+            os.replace(meta_path + suffix, meta_path)
+            size = os.path.getsize(npy_path) + os.path.getsize(meta_path)
+        except OSError:
+            for leftover in (npy_path + suffix, meta_path + suffix):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            return
+
+        with self._lock:
+            self._load_index()
+            self._index[key] = size
+            self._index.move_to_end(key)
+            self._evict()
+
+    def _load_index(self):
+        """Scans the cache folder once, ordering existing entries from least to most recently used."""
+        if self._index is not None:
+            return
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".npy"):
+                    continue
+                key = entry.name[:-4]
+                try:
+                    st = entry.stat()
+                    size = st.st_size + os.path.getsize(self._paths(key)[1])
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, key, size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+
+    def _evict(self):
+        total = sum(self._index.values())
+        while total > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            for entry_path in self._paths(key):
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    pass
+            total -= size
+
+    def trim(self):
+        """Evicts the least recently used entries until the cache fits in 'max_bytes' again."""
+        with self._lock:
+            self._index = None  # other processes may have added entries
+            self._load_index()
+            self._evict()
+
+    def size_bytes(self):
+        """Returns the total size of the cache entries in bytes."""
+        with self._lock:
+            self._load_index()
+            return sum(self._index.values())
+
+    def stats(self):
+        """
+        Summarizes the cache usage.
+
+        Returns:
+        - dict: Hit and miss counts, hit ratio, number of entries and size in bytes.
+        """
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._index),
+                "bytes": sum(self._index.values()),
+            }
@@ -0,0 +1,117 @@
+"""
+Loading of what the window displays for a file, shared with the benchmarks so they time the
+same code.
+"""
+from collections import namedtuple
+
+from .audio_io import first_channel, pcm_from_samples
+from .spectrogram import NFFT, NOVERLAP, compute_spectrogram, data_range
+from .spectrogram_pyramid import SpectrogramPyramid
+
+# What 'SpectrogramLoader.load' returns for a file:
+# - spectrogram (Spectrogram): The whole-file image.
+# - pyramid (SpectrogramPyramid or None): Tiles of a long recording, None for other files.
+# - clim (tuple or None): Color limits fixed by the overview of a long recording.
+# - pcm (tuple or None): (path, PcmBuffer) when the samples were read in full, for playback.
+# - peaks (Peaks or None): Envelope for the overview strip, when a peak cache is given.
+LoadedSpectrogram = namedtuple("LoadedSpectrogram", ["spectrogram", "pyramid", "clim", "pcm", "peaks"])
+
+
+class SpectrogramLoader:
+    """
+    Reads an audio file and computes the spectrogram displayed for it; touches no widget, so it
+    runs in worker threads too.
+
+    Files shorter than 'long_seconds' are transformed whole and kept in the spectrogram cache.
+    Longer ones are memory-mapped and displayed from a pyramid of tiles: its whole-file window is
+    shown first and fixes the colors used when zooming in; it is not cached.
+
+    Parameters:
+    - spectrogram_cache (SpectrogramCache): On-disk cache of whole-file spectrograms.
+    - audio_cache (DecodedAudioCache): Reads WAV files and caches decoded compressed ones.
+    - long_seconds (float): Shortest file displayed from a pyramid.
+    - peak_cache (PeakCache or None): Peak summaries for the overview strip.
+    - tile_columns (int): Columns of each pyramid tile.
+    - max_tiles (int): Tiles kept in memory per pyramid.
+    - min_hop (int): Finest frame hop of the pyramid, in samples.
+    - max_pool (int): Most frames pooled into a column of the coarse pyramid levels.
+    """
+
+    def __init__(self, spectrogram_cache, audio_cache, long_seconds, peak_cache=None,
+                 tile_columns=512, max_tiles=64, min_hop=64, max_pool=32):
+        self.spectrogram_cache = spectrogram_cache
+        self.audio_cache = audio_cache
+        self.long_seconds = long_seconds
+        self.peak_cache = peak_cache
+        self.tile_columns = tile_columns
+        self.max_tiles = max_tiles
+        self.min_hop = min_hop
+        self.max_pool = max_pool
+
+    def make_pyramid(self, samples, sample_rate, type_spec, max_freq):
+        """
+        Returns:
+        - SpectrogramPyramid: Lazily computed tiles of 'samples' with the configured settings.
+        """
+        return SpectrogramPyramid(
+            samples, sample_rate, NFFT, NOVERLAP, type_spec,
+            max_freq=max_freq,
+            tile_columns=self.tile_columns,
+            max_tiles=self.max_tiles,
+            min_hop=self.min_hop,
+            max_pool=self.max_pool,
+        )
+
+    def pyramid(self, path, type_spec, max_freq):
+        """Returns the pyramid of a file, e.g. to zoom into a file that was displayed whole."""
+        sample_rate, samples = self.audio_cache.read(path, mmap=True)
+        return self.make_pyramid(first_channel(samples), sample_rate, type_spec, max_freq)
+
+    def load(self, path, type_spec, max_freq, prefetched, stopwatch, on_peaks=None):
+        """
+        Parameters:
+        - path (str): Audio file or segment key.
+        - prefetched (PrefetchResult or None): The data loaded in the background, if any.
+        - stopwatch (Stopwatch): Timer of the whole load and display; its phases are lapped here.
+        - on_peaks (callable or None): Called with the peak summary as soon as it is known, before
+          the spectrogram is computed, so the overview strip can be drawn first.
+
+        Returns:
+        - LoadedSpectrogram: What the window displays for the file.
+        """
+        peaks = None
+        if self.peak_cache is not None:
+            # Stored on disk by the prefetcher, or computed here in one pass over the samples,
+            # which is much cheaper than the spectrogram
+            peaks = self.peak_cache.get_or_compute(path, self.audio_cache)
+            stopwatch.lap("peaks")
+            if on_peaks is not None:
+                on_peaks(peaks)
+
+        # Use the data loaded in the background when available, then the on-disk cache
+        if prefetched:
+            spectrogram = prefetched.spectrogram
+            pcm = (path, prefetched.pcm)
+        else:
+            pcm = None
+            spectrogram = self.spectrogram_cache.get(path, NFFT, NOVERLAP, type_spec)
+
+        pyramid = None
+        clim = None
+        if spectrogram is None:
+            # The samples are memory-mapped: only the parts that get transformed are read
+            sample_rate, samples = self.audio_cache.read(path, mmap=True)
+            stopwatch.lap("read")
+            if len(samples) / sample_rate >= self.long_seconds:
+                pyramid = self.make_pyramid(first_channel(samples), sample_rate, type_spec, max_freq)
+                # The whole-file overview also fixes the colors used when zooming into finer tiles
+                spectrogram = pyramid.window(0, pyramid.duration, pyramid.tile_columns)
+                clim = data_range(spectrogram.data)
+            else:
+                spectrogram = compute_spectrogram(first_channel(samples), sample_rate, NFFT, NOVERLAP, type_spec)
+                self.spectrogram_cache.put(path, NFFT, NOVERLAP, type_spec, spectrogram)
+                pcm = (path, pcm_from_samples(sample_rate, samples))
+            stopwatch.lap("compute")
+        else:
+            stopwatch.lap("read")
+        return LoadedSpectrogram(spectrogram, pyramid, clim, pcm, peaks)
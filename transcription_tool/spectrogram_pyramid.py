@@ -0,0 +1,184 @@
+"""
+Level-of-detail spectrogram tiles: coarse levels for recordings too long to transform at once,
+fine levels for zoomed-in views.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .spectrogram import NFFT, NOVERLAP, Spectrogram, spectrogram_columns
+
+
+class SpectrogramPyramid:
+    """
+    Spectrogram of a memory-mapped signal computed lazily in tiles at several resolutions.
+
+    Level 0 has the regular hop of 'NFFT - noverlap' samples; every level above doubles the hop,
+    so it spans twice the time with the same number of columns, and every level below halves it,
+    down to 'min_hop', giving a sharper time axis when zoomed in. A tile is 'tile_columns' columns
+    of one level. Zooming in computes the finer tiles of the visible range only, and computed tiles
+    are kept in a bounded LRU.
+
+    Once the hop of a level exceeds half a frame, one frame per column would leave most of the
+    signal out, and a short event between two frames would vanish from the zoomed-out view. In
+    'psd' and 'magnitude' modes each column of those levels is therefore the maximum of frames
+    spread over its hop at half-frame steps, at most 'max_pool' of them, so a column is as loud as
+    the loudest moment it covers. A zoomed-out view of an hour-long file transforms about as many
+    frames as the file holds at half-frame steps (capped by 'max_pool' per column), instead of
+    one per column.
+
+    Parameters:
+    - samples (np.ndarray): Mono signal, typically a memory-mapped view of the WAV data.
+    - sample_rate (int): Sampling rate of the signal in Hz.
+    - NFFT (int): Frame length.
+    - noverlap (int): Overlap of the frames at the finest level.
+    - mode (str): Spectrogram mode, as passed to 'plot_wav_file'.
+    - max_freq (float): Highest frequency kept in the tiles; the view never shows more.
+    - tile_columns (int): Number of columns per tile.
+    - max_tiles (int): Number of tiles kept in memory.
+    - min_hop (int or None): Smallest hop of the levels below 0; None disables them.
+    - max_pool (int): Most frames pooled into one column of a coarse level.
+    """
+
+    # Columns pooled at a time, to bound the memory of the frames transformed for a tile
+    POOL_BLOCK_COLUMNS = 64
+
+    def __init__(self, samples, sample_rate, NFFT=NFFT, noverlap=NOVERLAP, mode="psd",
+                 max_freq=None, tile_columns=512, max_tiles=64, min_hop=None, max_pool=32):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.NFFT = NFFT
+        self.hop = NFFT - noverlap
+        self.mode = mode
+        self.tile_columns = tile_columns
+        self.max_tiles = max_tiles
+        self.max_pool = max_pool
+        self.duration = len(samples) / sample_rate
+        self.num_rows = NFFT // 2 + 1
+        if max_freq is not None:
+            self.num_rows = min(self.num_rows, int(max_freq * NFFT / sample_rate) + 2)
+        self.fmax = (self.num_rows - 1) * sample_rate / NFFT
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Coarsest level: the whole file fits in a single tile
+        self.top_level = 0
+        while self.num_frames(self.top_level) > tile_columns:
+            self.top_level += 1
+        self.min_level = 0
+        while min_hop is not None and self.hop_of(self.min_level - 1) >= min_hop:
+            self.min_level -= 1
+
+    def hop_of(self, level):
+        """Returns the hop, in samples, between the frames of a level."""
+        return self.hop << level if level >= 0 else max(self.hop >> -level, 1)
+
+    def num_frames(self, level):
+        """Returns the number of frames of a level."""
+        return max(1, 1 + (len(self.samples) - self.NFFT) // self.hop_of(level))
+
+    def pool_of(self, level):
+        """Returns the number of frames pooled into each column of a level."""
+        if self.mode not in ("psd", "magnitude"):
+            return 1  # the maximum of phases means nothing
+        return min(max(1, math.ceil(2 * self.hop_of(level) / self.NFFT)), self.max_pool)
+
+    def level_for(self, start, end, max_columns):
+        """
+        Picks the finest level showing the time range [start, end] in at most 'max_columns' columns.
+
+        Returns:
+        - int: The level.
+        """
+        span = max(end - start, 1.0 / self.sample_rate) * self.sample_rate
+        level = math.ceil(math.log2(span / (self.hop * max_columns)))
+        return min(max(level, self.min_level), self.top_level)
+
+    def tile(self, level, index):
+        """
+        Returns the tile 'index' of 'level', computing it on first use.
+
+        Returns:
+        - np.ndarray: float32 matrix of shape (frequency bins, columns).
+        """
+        key = (level, index)
+        with self._lock:
+            if key in self._tiles:
+                self._tiles.move_to_end(key)
+                return self._tiles[key]
+
+        hop = self.hop_of(level)
+        first = index * self.tile_columns
+        last = min(first + self.tile_columns, self.num_frames(level))
+        frame_starts = np.arange(first, last) * hop
+        pool = self.pool_of(level)
+        if pool == 1:
+            data = spectrogram_columns(
+                self.samples, self.sample_rate, frame_starts, self.NFFT, self.mode, self.num_rows
+            )
+        else:
+            data = self._pooled_columns(frame_starts, hop, pool)
+
+        with self._lock:
+            self._tiles[key] = data
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        return data
+
+    def _pooled_columns(self, frame_starts, hop, pool):
+        """
+        Returns the element-wise maximum, per column, of 'pool' frames whose centers are spread
+        evenly over the 'hop' samples the column stands for.
+        """
+        stride = hop / pool
+        # Start of the k-th frame of a column: its center sits at (k + 0.5) * stride past the start
+        # of the range centered on the column's own frame
+        offsets = np.round((np.arange(pool) + 0.5) * stride - hop / 2).astype(np.int64)
+        last_start = max(len(self.samples) - self.NFFT, 0)
+        data = np.empty((self.num_rows, len(frame_starts)), dtype=np.float32)
+        for first in range(0, len(frame_starts), self.POOL_BLOCK_COLUMNS):
+            block = frame_starts[first:first + self.POOL_BLOCK_COLUMNS]
+            starts = np.clip(block[:, None] + offsets, 0, last_start).ravel()
+            columns = spectrogram_columns(
+                self.samples, self.sample_rate, starts, self.NFFT, self.mode, self.num_rows
+            )
+            np.max(columns.reshape(self.num_rows, len(block), pool), axis=2, out=data[:, first:first + len(block)])
+        return data
+
+    def window(self, start, end, max_columns):
+        """
+        Assembles the spectrogram of the time range [start, end] from tiles of a suitable level.
+
+        Parameters:
+        - start (float): Start of the range in seconds.
+        - end (float): End of the range in seconds.
+        - max_columns (int): Roughly the width of the view in pixels.
+
+        Returns:
+        - Spectrogram: The matrix covering at least [start, end] and its extent.
+        """
+        level = self.level_for(start, end, max_columns)
+        hop = self.hop_of(level)
+        center = self.NFFT / 2
+        num_frames = self.num_frames(level)
+        first = int(max(0, math.floor((start * self.sample_rate - center) / hop)))
+        last = int(min(num_frames - 1, math.ceil((end * self.sample_rate - center) / hop)))
+        last = max(first, last)
+
+        first_tile = first // self.tile_columns
+        last_tile = last // self.tile_columns
+        tiles = [self.tile(level, index) for index in range(first_tile, last_tile + 1)]
+        data = tiles[0] if len(tiles) == 1 else np.concatenate(tiles, axis=1)
+        offset = first_tile * self.tile_columns
+        data = data[:, first - offset:last - offset + 1]
+
+        pad = hop / self.sample_rate / 2
+        extent = (
+            (first * hop + center) / self.sample_rate - pad,
+            (last * hop + center) / self.sample_rate + pad,
+            0.0,
+            self.fmax,
+        )
+        return Spectrogram(data, extent, self.duration, self.sample_rate)
@@ -0,0 +1,141 @@
+"""
+Persistent matplotlib view of the spectrogram embedded in the Tkinter window.
+"""
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .spectrogram import data_range
+
+
+class SpectrogramView:
+    """
+    Owns the single figure, axes, image and Tk canvas used to display spectrograms.
+
+    The widgets and the click handler are created once; switching to another file only swaps the
+    pixel data, extent and limits of the existing image, followed by one draw.
+
+    The playback cursor is an animated artist drawn by blitting: the rendered figure is cached
+    after every full draw, and moving the cursor only restores that background and redraws the
+    line. A full draw, and thus a new background, only happens when the viewport changes.
+
+    Parameters:
+    - master (tk.Widget or None): Parent widget of the canvas; None renders off-screen with Agg,
+      without Tk, e.g. for benchmarks.
+    - on_click (callable): Handler for matplotlib 'button_press_event's on the canvas.
+    - figsize (tuple): Size of the figure in inches.
+    """
+
+    def __init__(self, master, on_click, figsize=(12, 6)):
+        self.figure = Figure(figsize=figsize)
+        self.axes = self.figure.add_subplot(111)
+        self.axes.set_ylabel("Frequency [Hz]")
+        self.axes.set_xlabel("Time [sec]")
+        self.image = None
+        if master is None:
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.widget = None
+        else:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # imports tkinter
+
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+            self.widget = self.canvas.get_tk_widget()
+        self.canvas.mpl_connect("button_press_event", on_click)
+
+        self.cursor = self.axes.axvline(
+            x=0, color="lime", linewidth=2, linestyle="--", animated=True, visible=False
+        )
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def show(self, spectrogram, max_freq, clim=None):
+        """
+        Displays a spectrogram, reusing the existing image artist.
+
+        Parameters:
+        - spectrogram (Spectrogram): The matrix and extent to display.
+        - max_freq (float): Upper limit of the frequency axis in Hz.
+        - clim (tuple or None): Color limits; defaults to the finite range of the data.
+        """
+        data = spectrogram.data
+        if self.image is None:
+            self.image = self.axes.imshow(
+                data,
+                extent=spectrogram.extent,
+                origin="lower",
+                aspect="auto",
+                cmap=colormaps["viridis"],
+            )
+        else:
+            self.image.set_data(data)
+            self.image.set_extent(spectrogram.extent)
+        if clim is None:
+            clim = data_range(data)
+        if clim is not None:
+            self.image.set_clim(*clim)
+
+        self.axes.set_ylim(0, max_freq)  # Adjusted to show full frequency range
+        self.axes.set_xlim(0, spectrogram.duration)
+        self.cursor.set_visible(False)  # The cursor belonged to the previous file
+        self.canvas.draw()
+
+    def set_image(self, spectrogram):
+        """
+        Replaces the displayed matrix, keeping limits and colors; used when only part of a long
+        file is displayed and the viewport moved.
+        """
+        self.image.set_data(spectrogram.data)
+        self.image.set_extent(spectrogram.extent)
+        self._background = None
+        self.canvas.draw_idle()
+
+    def pixel_width(self):
+        """Returns the width of the plotting area in pixels."""
+        return max(int(self.axes.bbox.width), 1)
+
+    def set_xlim(self, start, end):
+        """
+        Scrolls or zooms the view to the time range [start, end] in seconds.
+
+        The cached background is dropped; it is captured again once the pending redraw happens.
+        """
+        if tuple(self.axes.get_xlim()) == (start, end):
+            return
+        self.axes.set_xlim(start, end)
+        self._background = None
+        self.canvas.draw_idle()
+
+    def cursor_position(self):
+        """
+        Returns:
+        - float or None: Time in seconds of the playback cursor, or None when it is hidden.
+        """
+        if not self.cursor.get_visible():
+            return None
+        return self.cursor.get_xdata()[0]
+
+    def set_cursor(self, x_position):
+        """Shows the playback cursor at 'x_position' seconds, redrawing only the cursor."""
+        self.cursor.set_xdata([x_position, x_position])
+        self.cursor.set_visible(True)
+        self._blit()
+
+    def hide_cursor(self):
+        """Hides the playback cursor."""
+        if self.cursor.get_visible():
+            self.cursor.set_visible(False)
+            self._blit()
+
+    def _on_draw(self, event):
+        # Runs after every full draw: cache the figure without the cursor, then add the cursor
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        if self.cursor.get_visible():
+            self.axes.draw_artist(self.cursor)
+
+    def _blit(self):
+        if self._background is None:
+            return  # a full redraw is pending and will draw the cursor in '_on_draw'
+        self.canvas.restore_region(self._background)
+        if self.cursor.get_visible():
+            self.axes.draw_artist(self.cursor)
+        self.canvas.blit(self.figure.bbox)
@@ -0,0 +1,38 @@
+"""
+Annotation tags inserted in transcriptions, such as '[HESITATION_Start] ... [HESITATION_End]'.
+"""
+import re
+
+# Tags offered by the buttons of the GUI; any '[<Name>_Start]' / '[<Name>_End]' pair is accepted
+TAGS = ["Foreign_Language", "Cutoff", "UNK_SPK", "HESITATION"]
+
+TAG_PATTERN = re.compile(r"\[(\w+?)_(Start|End)\]")
+
+
+def find_tags(text):
+    """
+    Returns:
+    - list: (name, 'Start' or 'End', character offset) of each tag of 'text', in order.
+    """
+    return [(match.group(1), match.group(2), match.start()) for match in TAG_PATTERN.finditer(text)]
+
+
+def tag_errors(text):
+    """
+    Checks that every '_Start' tag is closed by an '_End' tag of the same name, and that no
+    '_End' tag comes without an open '_Start'. Different tags may overlap.
+
+    Returns:
+    - list: Descriptions of the problems; empty when the tags are balanced.
+    """
+    errors = []
+    open_tags = {}
+    for name, kind, offset in find_tags(text):
+        if kind == "Start":
+            open_tags[name] = open_tags.get(name, 0) + 1
+        elif open_tags.get(name):
+            open_tags[name] -= 1
+        else:
+            errors.append(f"[{name}_End] at character {offset} without [{name}_Start]")
+    errors.extend(f"[{name}_Start] not closed" for name, count in open_tags.items() for _ in range(count))
+    return errors
@@ -0,0 +1,269 @@
+"""
+Storage of the transcriptions.
+
+The pipe-delimited transcription CSV stays the canonical, human readable export. Saves do not
+rewrite it: each one is appended to a journal next to it ('<csv>.journal', one JSON record per
+line) and the journal is folded back into the CSV periodically and on exit.
+"""
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+CSV_COLUMNS = ["Filename", "Transcription"]
+
+
+def read_transcription_csv(path):
+    """
+    Reads a pipe-delimited transcription CSV.
+
+    Returns:
+    - dict: Filename -> transcription. Empty if the file does not exist.
+    """
+    rows = {}
+    if not os.path.exists(path):
+        return rows
+    with open(path, "r", newline="", encoding="utf-8") as csv_file:
+        reader = csv.reader(csv_file, delimiter="|")
+        header = next(reader, None)
+        if header is None:
+            return rows
+        filename_col = header.index("Filename")
+        transcription_col = header.index("Transcription")
+        for row in reader:
+            if len(row) > max(filename_col, transcription_col):
+                rows[row[filename_col]] = row[transcription_col]
+    return rows
+
+
+def write_transcription_csv(path, rows):
+    """
+    Writes transcriptions as a pipe-delimited CSV sorted by filename, atomically.
+
+    The layout is the one 'DataFrame.to_csv(path, sep="|", index=False)' produced before, so
+    existing consumers of the file keep working.
+
+    Parameters:
+    - path (str): Destination CSV file.
+    - rows (dict): Filename -> transcription.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file, delimiter="|", lineterminator=os.linesep)
+        writer.writerow(CSV_COLUMNS)
+        for filename in sorted(rows):
+            writer.writerow([filename, rows[filename]])
+        csv_file.flush()
+        os.fsync(csv_file.fileno())
+    os.replace(tmp_path, path)
+
+
+class TranscriptionJournal:
+    """
+    Append-only journal of saved transcriptions in front of the transcription CSV.
+
+    Every save appends one '{"Filename", "Transcription", "Timestamp"}' record and fsyncs it, so
+    a save costs the same whatever the size of the corpus and survives a crash once 'append'
+    returns. Replaying the journal over the CSV gives the current state; 'compact' writes that
+    state back to the CSV and empties the journal.
+
+    Parameters:
+    - csv_path (str): The transcription CSV the journal belongs to.
+    - compact_every (int): Number of appended records after which the journal is compacted.
+    """
+
+    def __init__(self, csv_path, compact_every=1000):
+        self.csv_path = csv_path
+        self.journal_path = csv_path + ".journal"
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._journal_file = None
+        self._appended = 0
+
+    def _replay(self, rows):
+        if not os.path.exists(self.journal_path):
+            return
+        valid_bytes = 0
+        with open(self.journal_path, "rb") as journal_file:
+            for line in journal_file:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash; everything after it is discarded
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                rows[record["Filename"]] = record["Transcription"]
+                valid_bytes += len(line)
+        if valid_bytes != os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as journal_file:
+                journal_file.truncate(valid_bytes)
+
+    def load(self):
+        """
+        Reads the CSV and replays the journal over it.
+
+        Returns:
+        - dict: Filename -> current transcription.
+        """
+        with self._lock:
+            rows = read_transcription_csv(self.csv_path)
+            self._replay(rows)
+            return rows
+
+    def append(self, filename, transcription):
+        """
+        Durably records a transcription, compacting the journal when it has grown long enough.
+
+        Parameters:
+        - filename (str): Path of the audio file.
+        - transcription (str): Its transcription.
+        """
+        self.append_many([(filename, transcription)])
+
+    def append_many(self, entries):
+        """
+        Durably records several transcriptions with a single fsync.
+
+        Parameters:
+        - entries (list): (filename, transcription) pairs.
+        """
+        if not entries:
+            return
+        now = time.time()
+        lines = "".join(
+            json.dumps({"Filename": filename, "Transcription": transcription, "Timestamp": now},
+                       ensure_ascii=False) + "\n"
+            for filename, transcription in entries
+        )
+        with self._lock:
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_file.write(lines)
+            self._journal_file.flush()
+            os.fsync(self._journal_file.fileno())
+            self._appended += len(entries)
+            compact_now = self._appended >= self.compact_every
+        if compact_now:
+            self.compact()
+
+    def compact(self):
+        """
+        Folds the journal into the CSV and empties it.
+
+        The CSV is replaced atomically before the journal is truncated; if the process dies in
+        between, replaying the journal again over the new CSV gives the same result.
+        """
+        with self._lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+            if not os.path.exists(self.journal_path) or not os.path.getsize(self.journal_path):
+                return
+            rows = read_transcription_csv(self.csv_path)
+            self._replay(rows)
+            write_transcription_csv(self.csv_path, rows)
+            with open(self.journal_path, "w") as journal_file:
+                os.fsync(journal_file.fileno())
+            self._appended = 0
+
+    def export_csv(self, path):
+        """Writes the current state as a pipe-delimited CSV at 'path', leaving the journal untouched."""
+        write_transcription_csv(path, self.load())
+
+    def close(self):
+        """Compacts the journal so the CSV is up to date, and releases the journal file."""
+        self.compact()
+
+
+class TranscriptionStore:
+    """
+    In-memory transcriptions indexed by filename, in front of a 'TranscriptionJournal'.
+
+    Lookups and updates are dictionary operations, so they take constant time whatever the size
+    of the corpus. Filenames are interned, since the same paths are also held by the file lists.
+    Updates are only marked dirty; 'flush' appends the dirty entries to the journal, so saving a
+    transcription that did not change writes nothing.
+
+    Parameters:
+    - journal (TranscriptionJournal or None): Where dirty entries are persisted; None keeps the
+      store purely in memory.
+    """
+
+    def __init__(self, journal=None):
+        self.journal = journal
+        self._rows = {}
+        self._dirty = set()
+
+    def load(self):
+        """Replaces the content of the store with the CSV and journal of 'journal'."""
+        self._rows = {sys.intern(filename): text for filename, text in self.journal.load().items()}
+        self._dirty.clear()
+
+    def load_csv(self, path):
+        """Bulk-loads a pipe-delimited transcription CSV, overriding entries already present."""
+        for filename, text in read_transcription_csv(path).items():
+            self._rows[sys.intern(filename)] = text
+
+    def get(self, filename, default=""):
+        """
+        Returns:
+        - str: The transcription of 'filename', or 'default' if it has none.
+        """
+        return self._rows.get(filename, default)
+
+    def put(self, filename, transcription):
+        """
+        Sets the transcription of a file and marks it dirty if it changed.
+
+        Returns:
+        - bool: True if the stored transcription changed.
+        """
+        if self._rows.get(filename) == transcription:
+            return False
+        filename = sys.intern(filename)
+        self._rows[filename] = transcription
+        self._dirty.add(filename)
+        return True
+
+    def flush(self):
+        """
+        Appends the dirty entries to the journal in one batch.
+
+        Entries are only marked clean once the batch is written, so an error leaves them all
+        dirty for the next attempt.
+        """
+        dirty = sorted(self._dirty)
+        self.journal.append_many([(filename, self._rows[filename]) for filename in dirty])
+        self._dirty.difference_update(dirty)
+
+    def take_dirty(self):
+        """
+        Marks every entry clean and returns the ones that were dirty; the caller becomes
+        responsible for writing them, e.g. through a 'WriteBehindWriter'.
+
+        Returns:
+        - list: (filename, transcription) pairs.
+        """
+        entries = [(filename, self._rows[filename]) for filename in sorted(self._dirty)]
+        self._dirty.clear()
+        return entries
+
+    def dirty_count(self):
+        """Returns the number of entries changed since the last flush."""
+        return len(self._dirty)
+
+    def filenames(self):
+        """Returns a set-like view of the annotated filenames."""
+        return self._rows.keys()
+
+    def items(self):
+        """Returns a view of (filename, transcription) pairs."""
+        return self._rows.items()
+
+    def __contains__(self, filename):
+        return filename in self._rows
+
+    def __len__(self):
+        return len(self._rows)
@@ -0,0 +1,130 @@
+"""
+Off-thread recomputation of the spectrogram of the visible time range.
+"""
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ViewportRenderer:
+    """
+    Computes the spectrogram of the visible range in a worker thread when the viewport changes.
+
+    Requests are coalesced: the first one schedules a render 'debounce_ms' later and the ones
+    arriving meanwhile only update what will be rendered, so a burst of zoom or shift clicks, or
+    continuous scrolling during playback, costs one render per interval. Each render covers the
+    visible range plus half of it on each side, and no new render is requested while the viewport
+    stays inside that margin at a similar zoom. Finished windows are kept in a small LRU, so
+    going back to a recently visited range is immediate. Results are delivered on the Tk thread.
+
+    Parameters:
+    - root (tk.Tk): Window whose 'after' schedules the debounce and result polling.
+    - on_ready (callable): Called with the 'Spectrogram' of the window once it is available.
+    - debounce_ms (int): Delay between the first request of a burst and its render.
+    - max_windows (int): Number of rendered windows kept.
+    """
+
+    POLL_MS = 20
+
+    def __init__(self, root, on_ready, debounce_ms=120, max_windows=16):
+        self.root = root
+        self.on_ready = on_ready
+        self.debounce_ms = debounce_ms
+        self.max_windows = max_windows
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="viewport")
+        self._results = queue.Queue()
+        self._windows = OrderedDict()
+        self._generation = 0
+        self._request = None
+        self._covered = None  # (source key, start, end, span) of the last delivered window
+        self._debounce_job = None
+        self._poll_job = None
+        self._pending = 0
+
+    def request(self, source_key, source, start, end, width):
+        """
+        Asks for the spectrogram of the range [start, end] to be displayed.
+
+        Parameters:
+        - source_key (hashable): Identifies the file and settings 'source' renders.
+        - source (SpectrogramPyramid): Object providing 'window(start, end, max_columns)'.
+        - start (float): Start of the visible range in seconds.
+        - end (float): End of the visible range in seconds.
+        - width (int): Width of the view in pixels.
+        """
+        span = end - start
+        if self._covered is not None:
+            key, covered_start, covered_end, covered_span = self._covered
+            if (key == source_key and covered_start <= start and end <= covered_end
+                    and 0.75 < span / covered_span < 1.5):
+                self._request = None  # already displayed; drop any older pending request
+                return
+        margin = span / 2
+        self._request = (source_key, source, max(start - margin, 0), end + margin, width * 2, span)
+        if self._debounce_job is None:
+            self._debounce_job = self.root.after(self.debounce_ms, self._start)
+
+    def cancel(self):
+        """Forgets pending requests and the covered range, e.g. when another file is displayed."""
+        self._generation += 1
+        self._request = None
+        self._covered = None
+        if self._debounce_job is not None:
+            self.root.after_cancel(self._debounce_job)
+            self._debounce_job = None
+
+    def _start(self):
+        self._debounce_job = None
+        if self._request is None:
+            return
+        source_key, source, start, end, columns, span = self._request
+        self._request = None
+        self._generation += 1
+        window_key = (source_key, round(start, 3), round(end, 3), columns)
+        if window_key in self._windows:
+            self._windows.move_to_end(window_key)
+            self._deliver(window_key, self._windows[window_key], span)
+            return
+        self._pending += 1
+        self._executor.submit(
+            self._compute, self._generation, window_key, source, start, end, columns, span
+        )
+        if self._poll_job is None:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def _compute(self, generation, window_key, source, start, end, columns, span):
+        spectrogram = None
+        if generation == self._generation:  # skip renders superseded while queued
+            try:
+                spectrogram = source.window(start, end, columns)
+            except Exception:
+                spectrogram = None  # the coarser image stays displayed
+        self._results.put((generation, window_key, spectrogram, span))
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                generation, window_key, spectrogram, span = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if spectrogram is None:
+                continue
+            self._windows[window_key] = spectrogram
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+            if generation == self._generation:
+                self._deliver(window_key, spectrogram, span)
+        if self._pending:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def _deliver(self, window_key, spectrogram, span):
+        source_key, start, end = window_key[0], window_key[1], window_key[2]
+        self._covered = (source_key, start, min(end, spectrogram.extent[1]), span)
+        self.on_ready(spectrogram)
+
+    def shutdown(self):
+        """Stops the worker without waiting for a render in progress."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
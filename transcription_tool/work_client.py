@@ -0,0 +1,286 @@
+"""
+Client side of the work-queue server (see 'work_server').
+"""
+import concurrent.futures
+import http.client
+import json
+import os
+import queue
+import sys
+from urllib.parse import urlsplit
+
+from .work_server import key_of, path_of
+
+
+class WorkClient:
+    """
+    Calls the work server over one persistent HTTP/1.1 connection, reconnecting once if the
+    server closed it. Not thread-safe: use it from a single thread.
+
+    Parameters:
+    - url (str): Address of the server, e.g. 'http://annotation-server:8765'.
+    - annotator (str): Name the leases are held under; must be unique per running client.
+    - corpus_root (str): Where this machine mounts the corpus the server scanned.
+    - timeout (float): Seconds to wait for the server.
+    """
+
+    def __init__(self, url, annotator, corpus_root, timeout=10.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.annotator = annotator
+        self.corpus_root = corpus_root
+        self.timeout = timeout
+        self.lease_seconds = None  # known after the first lease
+        self._connection = None
+
+    def _request(self, method, route, payload=None):
+        body = None if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in range(2):
+            if self._connection is None:
+                self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._connection.request(method, route, body, headers)
+                response = self._connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                self._connection.close()
+                self._connection = None
+                if attempt:
+                    raise ConnectionError(f"Work server {self.host}:{self.port} unreachable: {e}") from e
+                continue  # the kept-alive connection was closed by the server: reconnect
+            # Server-side failures (its disk, a proxy in front of it) are transient like a lost
+            # connection: raise them as 'OSError' so the writer keeps the saves and retries them.
+            # Only a refusal of the request itself is final.
+            try:
+                reply = json.loads(data or b"{}")
+            except ValueError as e:
+                raise ConnectionError(f"Work server error {response.status}: reply is not JSON") from e
+            if not isinstance(reply, dict):
+                raise ConnectionError(f"Work server error {response.status}: reply is not a JSON object")
+            if response.status >= 500:
+                raise ConnectionError(f"Work server error {response.status}: {reply.get('error', '')}")
+            if response.status != 200:
+                raise RuntimeError(f"Work server error {response.status}: {reply.get('error', '')}")
+            return reply
+
+    def local_path(self, key):
+        """Returns where a key is found on this machine."""
+        return path_of(self.corpus_root, key)
+
+    def key(self, path):
+        """Returns the key of a local path; the inverse of 'local_path'."""
+        return key_of(self.corpus_root, path)
+
+    def lease(self, count):
+        """
+        Asks for up to 'count' more files to annotate.
+
+        Returns:
+        - list: (local path, transcription) pairs; empty when the corpus is done.
+        """
+        reply = self._request("POST", "/lease", {"annotator": self.annotator, "count": count})
+        self.lease_seconds = reply["lease_seconds"]
+        return [(self.local_path(item["key"]), item["transcription"]) for item in reply["assignments"]]
+
+    def renew(self, paths):
+        """
+        Extends the leases of files still being worked on.
+
+        Returns:
+        - list: Local paths whose lease was extended.
+        """
+        reply = self._request("POST", "/renew", {"annotator": self.annotator, "keys": [self.key(p) for p in paths]})
+        return [self.local_path(key) for key in reply["renewed"]]
+
+    def release(self, paths):
+        """Gives files back to the queue without saving them."""
+        if paths:
+            self._request("POST", "/release", {"annotator": self.annotator, "keys": [self.key(p) for p in paths]})
+
+    def save(self, items):
+        """
+        Saves several transcriptions in one request.
+
+        Parameters:
+        - items (list): (local path, transcription) pairs.
+
+        Returns:
+        - list: Local paths the server refused because this annotator does not hold their lease.
+        """
+        reply = self._request("POST", "/save", {
+            "annotator": self.annotator,
+            "items": [{"key": self.key(path), "transcription": text} for path, text in items],
+        })
+        return [self.local_path(key) for key in reply["rejected"]]
+
+    def write(self, items):
+        """
+        Saves several transcriptions in one request, like 'save', but fails if any is refused.
+
+        Raises:
+        - ConnectionError: If the server cannot be reached or failed to save (e.g. its disk is
+          full); nothing may have been saved, and writing again is safe.
+        - RuntimeError: If the server refused some entries because their lease expired or is held
+          by another annotator; the others are saved.
+        """
+        rejected = self.save(items)
+        if rejected:
+            names = ", ".join(os.path.basename(path) for path in rejected)
+            raise RuntimeError(f"Not saved, not leased to this annotator (expired or reassigned): {names}")
+
+    def status(self):
+        """Returns the progress counters of the server."""
+        return self._request("GET", "/status")
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class BackgroundLeases:
+    """
+    Runs the lease, renew and release calls of a 'WorkClient' in a worker thread, so a slow or
+    unreachable work server never blocks the Tk thread. Calls run one at a time, in the order
+    they were made; their outcomes are queued for 'poll', which the Tk thread calls.
+
+    Parameters:
+    - client (WorkClient): Used from the worker thread only.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="leases")
+        self._results = queue.Queue()
+        self._leasing = False
+
+    def _call(self, kind, method, *args):
+        try:
+            self._results.put((kind, method(*args), None))
+        except (ConnectionError, RuntimeError) as e:
+            self._results.put((kind, None, e))
+
+    def leasing(self):
+        """Returns True while a 'lease' call has not been polled yet."""
+        return self._leasing
+
+    def lease(self, count):
+        """Asks for up to 'count' more files, unless a lease is already under way."""
+        if self._leasing:
+            return
+        self._leasing = True
+        self._executor.submit(self._call, "lease", self.client.lease, count)
+
+    def renew(self, paths):
+        """Extends the leases of files still being worked on."""
+        self._executor.submit(self._call, "renew", self.client.renew, list(paths))
+
+    def release(self, paths):
+        """Gives files back to the queue without saving them."""
+        self._executor.submit(self._call, "release", self.client.release, list(paths))
+
+    def poll(self):
+        """
+        Returns:
+        - list: (kind, result, error) of the calls finished since the last poll, where kind is
+          'lease', 'renew' or 'release', and error the 'ConnectionError' or 'RuntimeError' raised.
+        """
+        outcomes = []
+        while True:
+            try:
+                outcome = self._results.get_nowait()
+            except queue.Empty:
+                return outcomes
+            if outcome[0] == "lease":
+                self._leasing = False
+            outcomes.append(outcome)
+
+    def close(self, timeout=None):
+        """
+        Waits up to 'timeout' seconds for the calls already made, e.g. the release of the files
+        not annotated when quitting, then stops the worker.
+
+        Returns:
+        - bool: True if every call finished.
+        """
+        done = concurrent.futures.wait([self._executor.submit(lambda: None)], timeout).not_done == set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        return done
+
+
+class RemoteTranscriptionStore:
+    """
+    Stand-in for 'TranscriptionStore' when the transcriptions live on a work server.
+
+    Only the files leased in this session are known locally. Updates are marked dirty as in
+    'TranscriptionStore', and 'flush' sends all dirty entries in a single request; entries stay
+    dirty if the server cannot be reached, so the next flush retries them.
+
+    Parameters:
+    - client (WorkClient): Connection to the server.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._rows = {}
+        self._dirty = set()
+
+    def load(self):
+        """Nothing to load: the server holds the transcriptions."""
+
+    def remember(self, filename, transcription):
+        """Records the transcription a leased file already has on the server."""
+        if transcription:
+            self._rows[sys.intern(filename)] = transcription
+
+    def get(self, filename, default=""):
+        return self._rows.get(filename, default)
+
+    def put(self, filename, transcription):
+        if self._rows.get(filename) == transcription:
+            return False
+        filename = sys.intern(filename)
+        self._rows[filename] = transcription
+        self._dirty.add(filename)
+        return True
+
+    def flush(self):
+        """
+        Sends the dirty entries to the server.
+
+        Raises:
+        - ConnectionError: If the server cannot be reached or failed to save; the entries stay dirty.
+        - RuntimeError: If the server refused some entries because this annotator does not hold
+          their lease; those entries are dropped.
+        """
+        dirty = sorted(self._dirty)
+        if not dirty:
+            return
+        try:
+            self.client.write([(filename, self._rows[filename]) for filename in dirty])
+        except RuntimeError:
+            self._dirty.difference_update(dirty)
+            raise
+        self._dirty.difference_update(dirty)
+
+    def take_dirty(self):
+        entries = [(filename, self._rows[filename]) for filename in sorted(self._dirty)]
+        self._dirty.clear()
+        return entries
+
+    def dirty_count(self):
+        return len(self._dirty)
+
+    def filenames(self):
+        return self._rows.keys()
+
+    def items(self):
+        return self._rows.items()
+
+    def __contains__(self, filename):
+        return filename in self._rows
+
+    def __len__(self):
+        return len(self._rows)
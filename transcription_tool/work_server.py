@@ -0,0 +1,348 @@
+"""
+Work-queue server shared by a team of annotators.
+
+Usage:
+    python -m transcription_tool.work_server /path/to/corpus [--host 0.0.0.0] [--port 8765]
+
+The server owns the transcription store (the CSV and journal of config_app.json) and hands out
+the files left to annotate under time-limited leases, so two annotators never get the same file
+and the CSV has a single writer. A file whose lease runs out without a save goes back to the
+front of the queue. The GUI talks to it with 'WorkClient' when 'Server.Url' is set.
+
+API (JSON over HTTP/1.1, connections are kept alive):
+    POST /lease    {"annotator", "count"}  -> {"assignments": [{"key", "transcription"}],
+                                               "lease_seconds", "pending"}
+    POST /renew    {"annotator", "keys"}   -> {"renewed": [keys still held]}
+    POST /release  {"annotator", "keys"}   -> {"released": [keys put back in the queue]}
+    POST /save     {"annotator", "items": [{"key", "transcription"}]}
+                                           -> {"saved": [keys], "rejected": [keys]}
+    GET  /status                           -> {"total", "pending", "leased", "done", "annotators"}
+
+Keys are paths relative to the corpus root with '/' separators (segment keys included), so each
+annotator can mount the corpus wherever they like.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .corpus import CorpusScanner
+from .transcription_store import TranscriptionJournal, TranscriptionStore
+
+
+def key_of(root, path):
+    """Returns the key of a file (or segment key) below 'root'."""
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def path_of(root, key):
+    """Returns the path below 'root' of a key; the inverse of 'key_of'."""
+    return os.path.join(root, *key.split("/"))
+
+
+class LeaseQueue:
+    """
+    Files left to annotate, handed out in corpus order under leases.
+
+    Not thread-safe: 'WorkServer' serializes the calls.
+
+    Parameters:
+    - keys (iterable): Keys of the files left to annotate, in the order they are handed out.
+    - lease_seconds (float): How long a file stays assigned without being renewed or saved.
+    - clock (callable): Source of the current time in seconds.
+    """
+
+    def __init__(self, keys, lease_seconds=900, clock=time.monotonic):
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self._queue = deque(keys)
+        self._leases = {}  # key -> (annotator, expiry)
+        self._done = {}  # key -> annotator who saved it
+
+    def _expire(self):
+        now = self.clock()
+        expired = [key for key, (_, expiry) in self._leases.items() if expiry <= now]
+        for key in expired:
+            del self._leases[key]
+        self._queue.extendleft(reversed(expired))  # first in line again, in their former order
+
+    def lease(self, annotator, count):
+        """
+        Assigns up to 'count' files to an annotator.
+
+        Returns:
+        - list: Keys of the newly assigned files.
+        """
+        self._expire()
+        expiry = self.clock() + self.lease_seconds
+        keys = []
+        while self._queue and len(keys) < count:
+            key = self._queue.popleft()
+            if key not in self._done:
+                self._leases[key] = (annotator, expiry)
+                keys.append(key)
+        return keys
+
+    def renew(self, annotator, keys):
+        """
+        Extends the leases an annotator still holds.
+
+        Returns:
+        - list: The keys whose lease was extended; the others were saved or have expired.
+        """
+        self._expire()
+        expiry = self.clock() + self.lease_seconds
+        renewed = [key for key in keys if self._leases.get(key, (None,))[0] == annotator]
+        for key in renewed:
+            self._leases[key] = (annotator, expiry)
+        return renewed
+
+    def release(self, annotator, keys):
+        """
+        Gives files back without saving them.
+
+        Returns:
+        - list: The keys put back at the front of the queue.
+        """
+        released = [key for key in keys if self._leases.get(key, (None,))[0] == annotator]
+        for key in released:
+            del self._leases[key]
+        self._queue.extendleft(reversed(released))
+        return released
+
+    def complete(self, annotator, key):
+        """
+        Marks a file as annotated by the annotator holding its lease. The annotator who saved a
+        file can save it again, e.g. to fix a typo.
+
+        Returns:
+        - bool: False if the annotator neither holds the lease of the file nor saved it before,
+          e.g. because the lease expired or the file was never leased to them.
+        """
+        self._expire()
+        if key in self._leases:
+            allowed = self._leases[key][0] == annotator
+        else:
+            allowed = self._done.get(key) == annotator
+        if not allowed:
+            return False
+        self._leases.pop(key, None)
+        self._done[key] = annotator
+        return True
+
+    def status(self):
+        """
+        Returns:
+        - dict: Number of pending and leased files, of files done since the queue was created, and
+          of annotators holding leases.
+        """
+        self._expire()
+        return {
+            "pending": len(self._queue),
+            "leased": len(self._leases),
+            "done": len(self._done),
+            "annotators": len({annotator for annotator, _ in self._leases.values()}),
+        }
+
+
+class WorkServer:
+    """
+    HTTP server in front of a transcription store and a lease queue.
+
+    Each connection is served by its own thread; a single lock serializes the store and the
+    queue. A save request may carry several transcriptions, which are journaled with one fsync.
+
+    Parameters:
+    - store (TranscriptionStore): The transcriptions; only this server writes them.
+    - root (str): Corpus root the keys are relative to.
+    - keys (list): Keys of all the files of the corpus, in order.
+    - lease_seconds (float): Lease duration.
+    - host (str): Interface to listen on; '0.0.0.0' for the local network.
+    - port (int): Port to listen on; 0 picks a free one (see 'address').
+    """
+
+    def __init__(self, store, root, keys, lease_seconds=900, host="127.0.0.1", port=8765):
+        self.store = store
+        self.root = root
+        self.keys = set(keys)
+        annotated = store.filenames()
+        self.queue = LeaseQueue(
+            (key for key in keys if path_of(root, key) not in annotated), lease_seconds
+        )
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.work_server = self
+
+    @property
+    def address(self):
+        """Returns the (host, port) the server listens on."""
+        return self.httpd.server_address[:2]
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def shutdown(self):
+        """Stops serving; call from another thread than 'serve_forever'."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(self, route, request):
+        """
+        Runs one API call.
+
+        Returns:
+        - dict: The JSON response.
+
+        Raises:
+        - KeyError: For an unknown route.
+        - ValueError: For a malformed request.
+        """
+        with self.lock:
+            if route == "/status":
+                status = self.queue.status()
+                # Files annotated before the server started count as done too
+                status["done"] = len(self.keys) - status["pending"] - status["leased"]
+                return dict(status, total=len(self.keys))
+            annotator = str(request["annotator"])
+            if route == "/lease":
+                keys = self.queue.lease(annotator, int(request.get("count", 1)))
+                return {
+                    "assignments": [
+                        {"key": key, "transcription": self.store.get(path_of(self.root, key))}
+                        for key in keys
+                    ],
+                    "lease_seconds": self.queue.lease_seconds,
+                    "pending": self.queue.status()["pending"],
+                }
+            if route == "/renew":
+                return {"renewed": self.queue.renew(annotator, list(request["keys"]))}
+            if route == "/release":
+                return {"released": self.queue.release(annotator, list(request["keys"]))}
+            if route == "/save":
+                saved, rejected = [], []
+                for item in request["items"]:
+                    key = item["key"]
+                    if key in self.keys and self.queue.complete(annotator, key):
+                        self.store.put(path_of(self.root, key), str(item["transcription"]))
+                        saved.append(key)
+                    else:
+                        rejected.append(key)
+                self.store.flush()
+                return {"saved": saved, "rejected": rejected}
+        raise KeyError(route)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections open between requests
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, request):
+        try:
+            self._reply(200, self.server.work_server.handle(self.path, request))
+        except KeyError as e:
+            if self.path in ("/status", "/lease", "/renew", "/release", "/save"):
+                self._reply(400, {"error": f"Missing field {e}"})
+            else:
+                self._reply(404, {"error": f"Unknown path {self.path}"})
+        except (TypeError, ValueError) as e:
+            self._reply(400, {"error": str(e)})
+        except OSError as e:
+            self._reply(500, {"error": f"Could not save: {e}"})
+
+    def do_GET(self):
+        if self.path != "/status":
+            self._reply(405, {"error": f"Use POST for {self.path}"})
+            return
+        self._dispatch({})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._reply(400, {"error": "Body is not valid JSON"})
+            return
+        if not isinstance(request, dict):
+            self._reply(400, {"error": "Body must be a JSON object"})
+            return
+        self._dispatch(request)
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown the status lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", help="Folder containing the audio files, searched recursively")
+    parser.add_argument("--config", default="config_app.json", help="Configuration of the GUI")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on, 0.0.0.0 for the network")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--lease-seconds", type=float, help="Defaults to Server.LeaseSeconds")
+    parser.add_argument("--status-every", type=float, default=60.0, help="Seconds between status lines")
+    args = parser.parse_args(argv)
+
+    with open(args.config, "r") as jsonfile_obj:
+        datajson_obj = json.load(jsonfile_obj)
+    csv_params = datajson_obj["TranscriptionFile"]
+    journal = TranscriptionJournal(
+        csv_params["TranscriptionFile"], compact_every=int(csv_params.get("JournalCompactEvery", 1000))
+    )
+    store = TranscriptionStore(journal)
+    store.load()
+    lease_seconds = args.lease_seconds or float(datajson_obj.get("Server", {}).get("LeaseSeconds", 900))
+
+    print(f"Scanning {args.corpus} ...", file=sys.stderr)
+    root = os.path.abspath(args.corpus)
+    scanner = CorpusScanner(root, datajson_obj.get("Corpus", {}).get("ManifestDirectory", ".corpus_manifests"))
+    paths = [corpus_file.path for corpus_file in scanner.scan()]
+    segment_params = datajson_obj.get("Segments", {})
+    if segment_params.get("Mode", "off") != "off":
+        from .segments import Segmenter  # numpy is only needed to segment
+
+        seconds = float(segment_params.get("Seconds", 30))
+        segmenter = Segmenter(
+            segment_params["Mode"],
+            seconds,
+            min_seconds=float(segment_params.get("MinSeconds", seconds / 2)),
+            max_seconds=float(segment_params.get("MaxSeconds", seconds * 1.5)),
+            cache_directory=segment_params.get("CacheDirectory", ".segment_cache"),
+        )
+        paths = [key for path in paths for key in segmenter.split(path)]
+
+    server = WorkServer(store, root, [key_of(root, path) for path in paths], lease_seconds, args.host, args.port)
+    host, port = server.address
+    print(f"{len(paths)} files, serving on http://{host}:{port}/ with {lease_seconds:.0f} s leases", file=sys.stderr)
+    thread = threading.Thread(target=server.serve_forever, name="work-server", daemon=True)
+    thread.start()
+    try:
+        while True:
+            time.sleep(args.status_every)
+            status = server.handle("/status", {})
+            print(
+                f"pending {status['pending']}, leased {status['leased']} to {status['annotators']} annotators,"
+                f" done {status['done']}",
+                file=sys.stderr,
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        with server.lock:
+            journal.close()  # Fold the journal into the CSV
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())